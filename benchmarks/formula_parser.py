@@ -0,0 +1,66 @@
+#######################################################################################
+# Micro-benchmark of parse_chemical_formula against the previous implementation that #
+# expanded brackets through re.sub and string multiplication.                         #
+#                                                                                     #
+#                 Run it with: python benchmarks/formula_parser.py                    #
+#######################################################################################
+import re
+import timeit
+from collections import defaultdict
+
+from schema_packages.composition import parse_chemical_formula
+
+FORMULAS = {
+    'PMMA resist': '(C5H8O2)1000',
+    'nested PMMA resist': '((C5H8O2)10)100',
+    'PDMS siloxane SOG': '(CH3)3SiO((CH3)2SiO)500Si(CH3)3',
+    'HSQ resist': '(H8Si8O12)200',
+    'sulfuric acid': 'H2SO4',
+    'copper sulfate hydrate': 'CuSO4·5H2O',
+}
+
+
+def legacy_parse_chemical_formula(formula):
+    formula = formula.replace('·', '.')
+    if '.' in formula:
+        main_part, hydrate_part = formula.split('.')
+    else:
+        main_part, hydrate_part = formula, None
+
+    element_main = defaultdict(int)
+    while '(' in main_part:
+        main_part = re.sub(
+            r'\(([^()]*)\)(\d+)', lambda m: m.group(1) * int(m.group(2)), main_part
+        )
+    for element, count in re.findall(r'([A-Z][a-z]*)(\d*)', main_part):
+        element_main[element] += int(count) if count else 1
+
+    if hydrate_part:
+        hydrate_match = re.match(r'(\d*)H2O', hydrate_part)
+        if hydrate_match:
+            water_molecules = (
+                int(hydrate_match.group(1)) if hydrate_match.group(1) else 1
+            )
+            element_main['H'] += 2 * water_molecules
+            element_main['O'] += water_molecules
+
+    return list(element_main.keys()), list(element_main.values())
+
+
+def best_time(function, formula, number):
+    timings = timeit.repeat(lambda: function(formula), number=number, repeat=5)
+    return min(timings) / number
+
+
+def main(number=200):
+    print(f'{"formula":<26}{"legacy (us)":>14}{"new (us)":>12}{"speedup":>10}')
+    for label, formula in FORMULAS.items():
+        legacy = dict(zip(*legacy_parse_chemical_formula(formula)))
+        assert legacy == dict(zip(*parse_chemical_formula(formula))), label
+        old = best_time(legacy_parse_chemical_formula, formula, number)
+        new = best_time(parse_chemical_formula, formula, number)
+        print(f'{label:<26}{old * 1e6:>14.1f}{new * 1e6:>12.1f}{old / new:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
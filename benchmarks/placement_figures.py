@@ -0,0 +1,83 @@
+#######################################################################################
+# Benchmark of ItemPlacement normalization: the previous figure built with a fresh   #
+#  plotly.graph_objects Figure and the outline computed every time, against the JSON #
+#                 figure built from the cached unit outlines.                         #
+#                                                                                     #
+#               Run it with: python benchmarks/placement_figures.py                   #
+#######################################################################################
+import time
+
+import numpy as np
+import structlog
+from nomad.datamodel import EntryArchive
+from nomad.datamodel.metainfo.plot import PlotlyFigure
+from schema_packages.Items import Circle, ItemPlacement, Rectangle, Square
+
+PLACEMENTS = 1_000
+
+
+def legacy_normalize(placement):
+    import plotly.graph_objects as go
+
+    placement.figures.clear()
+    chuck = placement.chuck_geometry
+    fig = go.Figure()
+    if isinstance(chuck, Circle):
+        theta = np.linspace(0, 2 * np.pi, 100)
+        x, y = chuck.radius * np.cos(theta), chuck.radius * np.sin(theta)
+    elif isinstance(chuck, Square):
+        half = chuck.side / 2
+        x, y = [-half, half, half, -half, -half], [-half, -half, half, half, -half]
+    else:
+        half_base, half_height = chuck.base / 2, chuck.height / 2
+        x = [-half_base, half_base, half_base, -half_base, -half_base]
+        y = [-half_height, -half_height, half_height, half_height, -half_height]
+    fig.add_trace(go.Scatter(x=x, y=y, mode='lines', fill='toself', name='Chuck'))
+    fig.add_trace(
+        go.Scatter(
+            x=[placement.item_center_x],
+            y=[placement.item_center_y],
+            mode='markers',
+            marker=dict(size=10, color='red'),
+            name='Quadratino 1 centro',
+        )
+    )
+    fig.update_layout(title='Item centering on chuck/chamber', width=800, height=800)
+    figure_json = fig.to_plotly_json()
+    figure_json['config'] = {'staticPlot': True}
+    placement.figures.append(
+        PlotlyFigure(label='Chuck vision', figure=figure_json, index=0)
+    )
+
+
+def placements():
+    chucks = [Circle(radius=15.0), Square(side=20.0), Rectangle(base=20.0, height=10.0)]
+    return [
+        ItemPlacement(
+            item_center_x=float(i % 7),
+            item_center_y=float(i % 5),
+            chuck_geometry=chucks[i % len(chucks)],
+        )
+        for i in range(PLACEMENTS)
+    ]
+
+
+def timed(function, items):
+    start = time.perf_counter()
+    for item in items:
+        function(item)
+    return time.perf_counter() - start
+
+
+def main():
+    archive = EntryArchive()
+    logger = structlog.get_logger()
+    items = placements()
+    old = timed(legacy_normalize, items)
+    new = timed(lambda placement: placement.normalize(archive, logger), items)
+    print(f'{"placements":>12}{"objects (ms)":>16}{"json (ms)":>12}{"speedup":>10}')
+    print(f'{PLACEMENTS:>12}{old * 1e3:>16.1f}{new * 1e3:>12.1f}{old / new:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#######################################################################################
+#  Benchmark of TimeRamp* normalization: the previous figure built by plotly.express  #
+#        against the JSON figure built directly from the arrays of the ramp.          #
+#                                                                                     #
+#                 Run it with: python benchmarks/ramp_figures.py                      #
+#######################################################################################
+import time
+
+import numpy as np
+import structlog
+from nomad.datamodel import EntryArchive
+from nomad.datamodel.metainfo.plot import PlotlyFigure
+from schema_packages.plotting import FIGURE_CACHE
+from schema_packages.utils import TimeRampTemperature
+
+SIZES = [10, 1_000, 10_000, 100_000, 1_000_000]
+
+# Above this size every timing is run only once
+REPEAT_LIMIT = 100_000
+
+
+def legacy_normalize(ramp):
+    import plotly.express as px
+
+    if ramp.figures:
+        ramp.figures.clear()
+    figure = px.line(
+        x=ramp.time,
+        y=ramp.values,
+        height=400,
+        width=800,
+        labels={'x': 'Time (s)', 'y': 'Temperature (°C)'},
+        markers=True,
+    )
+    ramp.figures.append(
+        PlotlyFigure(label='Ramp of temperature', figure=figure.to_plotly_json())
+    )
+
+
+def uncached_normalize(ramp, archive, logger):
+    # Measure the generation of the figure, not the cache
+    ramp.figure_key = None
+    FIGURE_CACHE.clear()
+    ramp.normalize(archive, logger)
+
+
+def best_time(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    archive = EntryArchive()
+    logger = structlog.get_logger()
+    print(f'{"points":>10}{"express (ms)":>16}{"json (ms)":>12}{"speedup":>10}')
+    for size in SIZES:
+        time_axis = np.linspace(0, 36_000, size)
+        ramp = TimeRampTemperature(time=time_axis, values=25 + 0.01 * time_axis)
+        repeat = 5 if size <= REPEAT_LIMIT else 1
+        old = best_time(lambda: legacy_normalize(ramp), repeat)
+        new = best_time(lambda: uncached_normalize(ramp, archive, logger), repeat)
+        print(f'{size:>10}{old * 1e3:>16.1f}{new * 1e3:>12.1f}{old / new:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
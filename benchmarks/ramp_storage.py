@@ -0,0 +1,70 @@
+#######################################################################################
+#  Benchmark of the storage modes of TimeRamp* on a 1M points ramp: size of the       #
+#   archive and time to read it back, to read a slice and to read every value.        #
+#                                                                                     #
+#                  Run it with: python benchmarks/ramp_storage.py                     #
+#######################################################################################
+import tempfile
+import time
+
+import msgpack
+import numpy as np
+import structlog
+from nomad.datamodel import EntryArchive
+from nomad.datamodel.context import ClientContext
+from schema_packages.ramp_storage import RAMP_STORAGE_MODES
+from schema_packages.tool_log import ToolLog
+from schema_packages.utils import TimeRampTemperature
+
+POINTS = 1_000_000
+
+# Points read by the slice benchmark
+SLICE = slice(500_000, 510_000)
+
+
+def best_time(function, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def stored_archive(mode, directory):
+    archive = EntryArchive(m_context=ClientContext(local_dir=directory))
+    time_axis = np.arange(POINTS) * 0.1
+    values = 600 + np.cumsum(np.random.default_rng(0).normal(0, 0.05, POINTS))
+    ramp = TimeRampTemperature(time=time_axis, values=values, storage=mode)
+    archive.data = ToolLog(temperature_ramps=[ramp])
+    ramp.normalize(archive, structlog.get_logger())
+    return archive, values
+
+
+def main():
+    print(
+        f'{"storage":>10}{"size (MB)":>12}{"load (ms)":>12}'
+        f'{"slice (ms)":>12}{"all (ms)":>12}{"max error":>12}'
+    )
+    for mode in RAMP_STORAGE_MODES:
+        with tempfile.TemporaryDirectory() as directory:
+            archive, values = stored_archive(mode, directory)
+            packed = msgpack.packb(archive.m_to_dict(), default=float)
+
+            def load():
+                data = msgpack.unpackb(packed)
+                return EntryArchive.m_from_dict(data, m_context=archive.m_context)
+
+            loaded = load()
+            ramp = loaded.data.temperature_ramps[0]
+            error = np.abs(ramp.read_values().magnitude - values).max()
+            read_slice = best_time(lambda: ramp.read_values(SLICE.start, SLICE.stop))
+            print(
+                f'{mode:>10}{len(packed) / 1e6:>12.2f}{best_time(load) * 1e3:>12.1f}'
+                f'{read_slice * 1e3:>12.2f}{best_time(ramp.read_values) * 1e3:>12.1f}'
+                f'{error:>12.1e}'
+            )
+
+
+if __name__ == '__main__':
+    main()
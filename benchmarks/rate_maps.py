@@ -0,0 +1,47 @@
+#######################################################################################
+#   Benchmark of the statistics and radial fits of wafer maps: time to evaluate lots  #
+#    of 121 site maps in a single call of the engine and one map at a time, as the    #
+#                         calculus sheets of single wafers do.                        #
+#                                                                                     #
+#                   Run it with: python benchmarks/rate_maps.py                       #
+#######################################################################################
+import time
+
+import numpy as np
+from schema_packages.site_maps import map_statistics, radial_fit
+
+LOTS = [25, 250, 2500]
+
+# Sites on a square grid of 11 x 11 points, 15 mm apart
+SITES = 11
+PITCH = 15.0
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    steps = (np.arange(SITES) - SITES // 2) * PITCH
+    x, y = (grid.ravel() for grid in np.meshgrid(steps, steps))
+    rng = np.random.default_rng(0)
+    print(f'{"maps":>8}{"batch (ms)":>12}{"loop (ms)":>12}')
+    for lot in LOTS:
+        rates = 10 + (x**2 + y**2) / 1e4 + rng.normal(0, 0.1, (lot, SITES**2))
+
+        def batch(rates=rates):
+            map_statistics(rates)
+            radial_fit(x, y, rates).profile()
+
+        def loop(rates=rates):
+            for values in rates:
+                map_statistics(values)
+                radial_fit(x, y, values).profile()
+
+        print(f'{lot:>8}{timed(batch) * 1e3:>12.1f}{timed(loop) * 1e3:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+#######################################################################################
+#   Benchmark of the resolution of the steps of a process: time to resolve 200 step   #
+#   references one lazy archive read at a time and in batch, against a context whose  #
+#                         archive reads take a fixed latency.                         #
+#                                                                                     #
+#                Run it with: python benchmarks/step_resolution.py                    #
+#######################################################################################
+import time
+
+from nomad.datamodel import EntryArchive
+from schema_packages.fabrication_utilities import (
+    FabricationProcess,
+    FabricationProcessStep,
+)
+from schema_packages.references import resolve_references, split_reference
+
+STEPS = 200
+
+# Archives the steps are read from, steps repeat as in recipes looping over steps
+ARCHIVES = 50
+
+# Seconds taken by every archive read
+LATENCY = 0.005
+
+
+class SlowContext:
+    def resolve_archive_url(self, url):
+        time.sleep(LATENCY)
+        return EntryArchive(data=FabricationProcessStep(name=url))
+
+
+def process_archive():
+    archive = EntryArchive(m_context=SlowContext())
+    archive.data = FabricationProcess(
+        steps=[
+            f'../upload/archive/mainfile/step_{i % ARCHIVES}.archive.json#data'
+            for i in range(STEPS)
+        ]
+    )
+    return archive
+
+
+def main():
+    archive = process_archive()
+    context = archive.m_context
+    start = time.perf_counter()
+    for reference in archive.data.steps:
+        # What a lazy access does: one archive read per reference
+        url, fragment = split_reference(reference.m_proxy_value)
+        context.resolve_archive_url(url).m_resolve(fragment)
+    lazy = time.perf_counter() - start
+
+    archive = process_archive()
+    start = time.perf_counter()
+    resolve_references(archive, list(archive.data.steps))
+    batch = time.perf_counter() - start
+
+    print(f'{"lazy (ms)":>12}{"batch (ms)":>12}')
+    print(f'{lazy * 1e3:>12.1f}{batch * 1e3:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,315 @@
+#######################################################################################
+#  Benchmark of parsing and normalizing synthetic archives of every step schema. The #
+#   archives are generated from the metainfo: every editable quantity is filled and  #
+#  substeps, fluximeters, ramps and instruments are repeated as set by the knobs. For #
+#  every schema the parse plus normalize_all latency, the peak memory and the size of #
+#   the archive are measured, and compared with a baseline stored by a previous run.  #
+#                                                                                     #
+#   Run it with: python benchmarks/synthetic_archives.py [--substeps 10] [--save]     #
+#######################################################################################
+import argparse
+import importlib
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import msgpack
+import numpy as np
+from nomad.client import normalize_all, parse
+from nomad.metainfo import Datetime, MEnum
+from schema_packages.utils import TimeRamp
+
+STEP_SCHEMAS = [
+    'schema_packages.steps.add.synthesis.CVD.LPCVD',
+    'schema_packages.steps.add.synthesis.CVD.PECVD',
+    'schema_packages.steps.add.synthesis.CVD.ICP_CVD',
+    'schema_packages.steps.add.synthesis.coating.Coating',
+    'schema_packages.steps.add.synthesis.coating.Spin_Coating',
+    'schema_packages.steps.add.synthesis.sputtering.Sputtering',
+    'schema_packages.steps.add.synthesis.electron_gun.ElectronGun',
+    'schema_packages.steps.add.synthesis.sog.SOG',
+    'schema_packages.steps.add.integration.bonding.Bonding',
+    'schema_packages.steps.remove.etching.dry_etching.RIE',
+    'schema_packages.steps.remove.etching.dry_etching.ICP_RIE',
+    'schema_packages.steps.remove.etching.dry_etching.DRIE_BOSCH',
+    'schema_packages.steps.remove.etching.wet_etching.WetEtching',
+    'schema_packages.steps.remove.etching.wet_etching.WetCleaning',
+    'schema_packages.steps.remove.etching.stripping.Stripping',
+    'schema_packages.steps.remove.developing.development.ResistDevelopment',
+    'schema_packages.steps.remove.developing.development.SpinResistDevelopment',
+    'schema_packages.steps.remove.drying.drying.Rinsing_Drying',
+    'schema_packages.steps.transform.lithography.ebl.EBL',
+    'schema_packages.steps.transform.lithography.fib.FIB',
+    'schema_packages.steps.transform.lithography.labeling.LabelingCleaning',
+    'schema_packages.steps.transform.dicing.dicing.Dicing',
+    'schema_packages.steps.transform.thermal_process.annealing.Annealing',
+    'schema_packages.steps.transform.thermal_process.baking.Baking',
+    'schema_packages.steps.transform.thermal_process.oxidation.ThermalOxidation',
+]
+
+EQUIPMENT_SCHEMA = 'schema_packages.fabrication_utilities.Equipment'
+
+# Formulas of the chemicals of the synthetic archives
+FORMULAS = ['SF6', 'O2', 'SiH4', 'N2O', 'Ar', 'C4F8', 'H2SO4', '(C5H8O2)100']
+
+# Length of array quantities other than the time and values of ramps
+ARRAY_LENGTH = 3
+
+# Deepest nesting of subsections generated
+MAX_DEPTH = 8
+
+DEFAULT_BASELINE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'baselines', 'synthetic_archives.json'
+)
+
+
+def load_section(path):
+    module, name = path.rsplit('.', 1)
+    return getattr(importlib.import_module(module), name)
+
+
+def is_type(quantity_type, datatype):
+    return quantity_type is datatype or (
+        isinstance(datatype, type) and isinstance(quantity_type, datatype)
+    )
+
+
+def flag_value(name, index):
+    return index % 2 == 0
+
+
+def int_value(name, index):
+    return index + 1
+
+
+def float_value(name, index):
+    return 1.0 + 0.1 * index
+
+
+def str_value(name, index):
+    return f'{name} {index}'
+
+
+# Synthetic values of the scalar quantities of plain types, from name and index
+SCALAR_VALUES = {
+    bool: flag_value,
+    np.bool_: flag_value,
+    int: int_value,
+    np.int32: int_value,
+    np.int64: int_value,
+    float: float_value,
+    np.float32: float_value,
+    np.float64: float_value,
+    str: str_value,
+}
+
+
+def scalar(quantity, index):
+    """
+    Synthetic value of a scalar quantity, None for the ones that are not generated,
+    references included.
+    """
+    quantity_type = quantity.type
+    if quantity.name == 'chemical_formula':
+        return FORMULAS[index % len(FORMULAS)]
+    if isinstance(quantity_type, MEnum):
+        values = getattr(quantity_type, '_list', None) or list(
+            quantity_type.get_all_values()
+        )
+        return values[index % len(values)]
+    if is_type(quantity_type, Datetime):
+        return f'2026-01-{index % 28 + 1:02d}T08:00:00+00:00'
+    generate = (
+        SCALAR_VALUES.get(quantity_type) if isinstance(quantity_type, type) else None
+    )
+    return None if generate is None else generate(quantity.name, index)
+
+
+def ramp(section_cls, points, index):
+    time_axis = np.arange(points, dtype=np.float64)
+    values = 20 + 5 * index + 10 * np.sin(time_axis / max(points, 1) * np.pi)
+    return {
+        'm_def': f'{section_cls.__module__}.{section_cls.__qualname__}',
+        'name': f'ramp {index}',
+        'time': time_axis.tolist(),
+        'values': values.tolist(),
+    }
+
+
+def repeats(name, knobs):
+    if name.endswith('_steps'):
+        return knobs.substeps
+    if name == 'fluximeters':
+        return knobs.fluximeters
+    if name == 'instruments':
+        return knobs.instruments
+    return 1
+
+
+def synthetic_section(section_cls, knobs, index=0, path=()):
+    """
+    Archive dictionary of a section with every editable quantity and subsection.
+    """
+    section_def = section_cls.m_def
+    data = {'m_def': f'{section_cls.__module__}.{section_cls.__qualname__}'}
+    for name, quantity in section_def.all_quantities.items():
+        if 'eln' not in quantity.m_annotations:
+            continue
+        value = scalar(quantity, index)
+        if value is not None and quantity.shape:
+            value = [scalar(quantity, index + i) for i in range(ARRAY_LENGTH)]
+        if value is not None:
+            data[name] = value
+
+    if len(path) >= MAX_DEPTH:
+        return data
+    for name, sub_section in section_def.all_sub_sections.items():
+        sub_def = sub_section.section_def
+        if name == 'figures' or sub_def in path or name == 'instruments':
+            continue
+        sub_cls = sub_def.section_cls
+        count = repeats(name, knobs) if sub_section.repeats else 1
+        if issubclass(sub_cls, TimeRamp):
+            items = [ramp(sub_cls, knobs.ramp_points, i) for i in range(count)]
+        else:
+            items = [
+                synthetic_section(sub_cls, knobs, i, (*path, section_def))
+                for i in range(count)
+            ]
+        data[name] = items if sub_section.repeats else items[0]
+    if 'instruments' in section_def.all_sub_sections:
+        data['instruments'] = [
+            {
+                'name': f'equipment {i}',
+                'section': f'../upload/raw/equipment_{i}.archive.json#/data',
+            }
+            for i in range(knobs.instruments)
+        ]
+    return data
+
+
+def write_archives(schema, knobs, directory):
+    """
+    Writes the synthetic archive of a step schema, and the equipments it refers
+    to, in the directory. Returns the path of the step archive. Equipments are
+    referred to by raw file, which `nomad.client.parse` resolves in the directory
+    without an upload.
+    """
+    for i in range(knobs.instruments):
+        equipment = {
+            'm_def': EQUIPMENT_SCHEMA,
+            'name': f'equipment {i}',
+            'lab_id': f'EQ{i:03d}',
+        }
+        with open(os.path.join(directory, f'equipment_{i}.archive.json'), 'w') as file:
+            json.dump({'data': equipment}, file)
+    data = synthetic_section(load_section(schema), knobs)
+    path = os.path.join(directory, f'{schema.rsplit(".", 1)[1]}.archive.json')
+    with open(path, 'w') as file:
+        json.dump({'data': data}, file)
+    return path
+
+
+def process(path):
+    entry = parse(path)[0]
+    normalize_all(entry)
+    return entry
+
+
+def measure(path, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        entry = process(path)
+        timings.append(time.perf_counter() - start)
+    # Memory is traced in a separate run, tracing slows the normalization down
+    tracemalloc.start()
+    process(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    size = len(msgpack.packb(entry.m_to_dict(), default=str))
+    return {'time': min(timings), 'peak': peak, 'size': size}
+
+
+def compare(results, baseline, tolerance):
+    """
+    Prints the ratios to the baseline, returns the schemas slower or larger than
+    the tolerance allows.
+    """
+    regressions = []
+    print(f'\n{"schema":>24}{"time":>10}{"peak":>10}{"size":>10}')
+    for schema, result in results.items():
+        reference = baseline.get('results', {}).get(schema)
+        if reference is None:
+            continue
+        ratios = {key: result[key] / reference[key] for key in result if reference[key]}
+        flag = ' <-' if max(ratios.values(), default=0) > tolerance else ''
+        if flag:
+            regressions.append(schema)
+        print(
+            f'{schema.rsplit(".", 1)[1]:>24}'
+            + ''.join(f'{ratios.get(key, np.nan):>9.2f}x' for key in result)
+            + flag
+        )
+    return regressions
+
+
+def arguments():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--substeps', type=int, default=5)
+    parser.add_argument('--fluximeters', type=int, default=3)
+    parser.add_argument('--ramp-points', type=int, default=1_000)
+    parser.add_argument('--instruments', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--schema', action='append', help='Part of schema names')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save', action='store_true', help='Store as baseline')
+    parser.add_argument('--tolerance', type=float, default=1.25)
+    return parser.parse_args()
+
+
+def main():
+    knobs = arguments()
+    schemas = [
+        schema
+        for schema in STEP_SCHEMAS
+        if not knobs.schema or any(part in schema for part in knobs.schema)
+    ]
+    results = {}
+    print(f'{"schema":>24}{"time (ms)":>12}{"peak (MB)":>12}{"size (kB)":>12}')
+    for schema in schemas:
+        with tempfile.TemporaryDirectory() as directory:
+            path = write_archives(schema, knobs, directory)
+            result = measure(path, knobs.repeat)
+        results[schema] = result
+        print(
+            f'{schema.rsplit(".", 1)[1]:>24}{result["time"] * 1e3:>12.1f}'
+            f'{result["peak"] / 1e6:>12.2f}{result["size"] / 1e3:>12.1f}'
+        )
+
+    settings = {
+        key: getattr(knobs, key)
+        for key in ('substeps', 'fluximeters', 'ramp_points', 'instruments')
+    }
+    if knobs.save:
+        os.makedirs(os.path.dirname(knobs.baseline), exist_ok=True)
+        with open(knobs.baseline, 'w') as file:
+            json.dump({'settings': settings, 'results': results}, file, indent=2)
+        return 0
+    # Without a comparable baseline a regression cannot be detected, so it fails
+    if not os.path.exists(knobs.baseline):
+        print(f'\nNO BASELINE at {knobs.baseline}, store one with --save')
+        return 1
+    with open(knobs.baseline) as file:
+        baseline = json.load(file)
+    if baseline.get('settings') != settings:
+        print(f'\nNO COMPARABLE BASELINE, it was taken with {baseline.get("settings")}')
+        return 1
+    return 1 if compare(results, baseline, knobs.tolerance) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
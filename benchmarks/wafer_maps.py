@@ -0,0 +1,66 @@
+#######################################################################################
+#  Benchmark of the die map engine: time to generate maps of 150, 200 and 300 mm     #
+#   wafers with dies from 5 mm down to 0.5 mm and to read them from the cache, and    #
+#         time to plan the cuts and the saw time of a lot of mixed wafers.            #
+#                                                                                     #
+#                   Run it with: python benchmarks/wafer_maps.py                      #
+#######################################################################################
+import time
+
+import numpy as np
+from schema_packages.wafer_map import _cut_plan, _die_map, cut_plan, die_map, saw_times
+
+WAFERS = [150.0, 200.0, 300.0]
+PITCHES = [5.0, 1.0, 0.5]
+
+# Wafers of the lot of the saw time benchmark
+LOT_SIZE = 500
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def main():
+    print(
+        f'{"wafer (mm)":>12}{"pitch (mm)":>12}{"dies":>10}{"new (ms)":>10}'
+        f'{"cached (us)":>13}'
+    )
+    for wafer in WAFERS:
+        for pitch in PITCHES:
+            _die_map.cache_clear()
+
+            def generate(wafer=wafer, pitch=pitch):
+                return die_map(wafer, pitch, street=0.05, edge_exclusion=3.0)
+
+            new, dies = timed(generate)
+            cached, _ = timed(generate)
+            print(
+                f'{wafer:>12.0f}{pitch:>12.1f}{len(dies.x):>10}{new * 1e3:>10.1f}'
+                f'{cached * 1e6:>13.1f}'
+            )
+
+    _die_map.cache_clear()
+    _cut_plan.cache_clear()
+    rng = np.random.default_rng(0)
+    diameters = rng.choice(WAFERS, LOT_SIZE)
+    pitches = rng.choice(PITCHES, LOT_SIZE)
+
+    def schedule():
+        lengths = [
+            cut_plan(diameter, pitch, street=0.05).total_length
+            for diameter, pitch in zip(diameters, pitches)
+        ]
+        return saw_times(lengths, 2, 5.0).sum()
+
+    elapsed, total = timed(schedule)
+    print(
+        f'\nLot of {LOT_SIZE} wafers: {total / 3600:.1f} h of sawing planned in '
+        f'{elapsed * 1e3:.1f} ms'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+from nomad.config.models.plugins import ParserEntryPoint
+from pydantic import Field
+
+# Header of the datalogs: a time column first, then a column of a ramp quantity with
+# its unit in brackets, e.g. 'Time [s],Zone 1 Temp [°C]'
+TOOL_LOG_HEADER_RE = (
+    r'^\ufeff?"?(?:[Tt]ime|TIME|[Dd]ate|DATE|[Ee]lapsed|ELAPSED)[^,;\t\n]*[,;\t]'
+    r'[^\n]*?(?:[Tt]emp|TEMP|TC|[Hh]eater|[Pp]ress|PRESS|[Vv]acuum|[Gg]auge|[Ff]low|'
+    r'FLOW|MFC|RPM|[Rr]pm|[Ss]pin|[Rr]otation)[^,;\t\n]*[\[(][^\])\n]+[\])]'
+)
+
+
+class ToolLogParserEntryPoint(ParserEntryPoint):
+    chunk_rows: int = Field(
+        100_000, description='Rows of the log parsed at once while streaming it.'
+    )
+    ramp_storage: str = Field(
+        'full',
+        description='Storage of the ramps read from the logs: full, uniform, delta or '
+        'sidecar.',
+    )
+
+    def load(self):
+        from parsers.tool_log import ToolLogParser
+
+        return ToolLogParser(**self.model_dump())
+
+
+tool_log_parser_entry_point = ToolLogParserEntryPoint(
+    name='ToolLogParser',
+    description='Parser of the CSV/TSV datalogs written by equipment controllers.',
+    mainfile_name_re=r'.*\.(csv|tsv|txt|log|out)$',
+    mainfile_contents_re=TOOL_LOG_HEADER_RE,
+)
@@ -0,0 +1,252 @@
+#######################################################################################
+#  Streaming reader of the CSV/TSV datalogs written by equipment controllers. Files   #
+# are memory mapped and read in chunks of rows, so that only the columns of interest  #
+# are kept in memory while logs of hundreds of MB are parsed.                         #
+#######################################################################################
+import mmap
+import os
+import re
+from typing import (
+    TYPE_CHECKING,
+)
+
+import numpy as np
+from nomad.parsing.parser import MatchingParser
+from nomad.units import ureg
+from schema_packages.tool_log import ToolLog
+from schema_packages.utils import (
+    TimeRampMassflow,
+    TimeRampPressure,
+    TimeRampRotation,
+    TimeRampTemperature,
+)
+
+if TYPE_CHECKING:
+    from nomad.datamodel.datamodel import (
+        EntryArchive,
+    )
+    from structlog.stdlib import (
+        BoundLogger,
+    )
+
+# Rows parsed at once, memory used while reading is proportional to it
+DEFAULT_CHUNK_ROWS = 100_000
+
+LOG_DELIMITERS = ('\t', ';', ',')
+
+# Units written by controllers and not known, or known differently, by the registry
+LOG_UNIT_ALIASES = {
+    'c': 'degC',
+    '°c': 'degC',
+    'degc': 'degC',
+    'k': 'kelvin',
+    's': 'second',
+    'sec': 'second',
+    'min': 'minute',
+    'h': 'hour',
+    'ms': 'millisecond',
+    'torr': 'torr',
+    'mtorr': 'millitorr',
+    'sccm': 'centimeter^3/minute',
+    'slm': 'liter/minute',
+    'rpm': 'rpm',
+}
+
+# Name of the column, if any, followed by a unit in square or round brackets
+_COLUMN = re.compile(r'^\s*(?P<label>.*?)\s*(?:[\[(](?P<unit>[^\])]*)[\])])?\s*$')
+
+_TIME_LABEL = re.compile(r'time|date|elapsed|^t$', re.IGNORECASE)
+
+# Ramp section, dimensionality of its values and keywords of the column names
+RAMP_COLUMNS = [
+    (TimeRampTemperature, '[temperature]', ('temp', 'tc', 'heater')),
+    (TimeRampPressure, '[pressure]', ('press', 'vacuum', 'gauge')),
+    (TimeRampMassflow, '[volume] / [time]', ('flow', 'mfc')),
+    (TimeRampRotation, '1 / [time]', ('rpm', 'spin', 'rotation')),
+]
+
+# Subsection of ToolLog where ramps of each kind are stored
+RAMP_SUBSECTIONS = {
+    TimeRampTemperature: 'temperature_ramps',
+    TimeRampPressure: 'pressure_ramps',
+    TimeRampMassflow: 'massflow_ramps',
+    TimeRampRotation: 'rotation_ramps',
+}
+
+
+def split_column(column):
+    """
+    Label and unit (None if not given) of a column header like 'Pressure [mbar]'.
+    """
+    match = _COLUMN.match(column)
+    unit = match.group('unit')
+    return match.group('label'), unit.strip() if unit else None
+
+
+def log_unit(unit):
+    """
+    Pint unit of a unit written in a log, None if it is not recognized.
+    """
+    if not unit:
+        return None
+    try:
+        return ureg.Unit(LOG_UNIT_ALIASES.get(unit.lower(), unit))
+    except Exception:
+        return None
+
+
+def ramp_of_column(column):
+    """
+    Ramp section matching a column by the dimensionality of its unit or, if the
+    column has no unit, by its name. None if there is no matching ramp.
+    """
+    label, unit = split_column(column)
+    pint_unit = log_unit(unit)
+    for ramp_class, dimensionality, keywords in RAMP_COLUMNS:
+        if pint_unit is not None:
+            if pint_unit.dimensionality == ureg.get_dimensionality(dimensionality):
+                return ramp_class
+        elif any(keyword in label.lower() for keyword in keywords):
+            return ramp_class
+    return None
+
+
+def sniff_header(path):
+    """
+    Header line, delimiter and column names of a log, read through a memory map
+    without loading the file.
+    """
+    with (
+        open(path, 'rb') as file,
+        mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data,
+    ):
+        end = data.find(b'\n')
+        header = data[: end if end >= 0 else len(data)].decode('utf-8-sig').strip()
+    delimiter = max(LOG_DELIMITERS, key=header.count)
+    columns = [column.strip().strip('"') for column in header.split(delimiter)]
+    return delimiter, columns
+
+
+def time_column(columns):
+    """
+    Index of the column with the time of each record.
+    """
+    for index, column in enumerate(columns):
+        label, unit = split_column(column)
+        pint_unit = log_unit(unit)
+        if _TIME_LABEL.search(label) or (
+            pint_unit is not None and pint_unit.dimensionality == {'[time]': 1}
+        ):
+            return index
+    raise ValueError(f'No time column among {columns}')
+
+
+def _elapsed_seconds(values, origin):
+    """
+    Seconds since `origin` of a chunk of the time column, numeric or timestamps.
+    """
+    import pandas as pd
+
+    if values.dtype.kind in 'iuf':
+        return values.to_numpy(dtype=np.float64), origin
+    stamps = pd.to_datetime(values).to_numpy(dtype='datetime64[ns]')
+    if origin is None:
+        origin = stamps[0]
+    return (stamps - origin) / np.timedelta64(1, 's'), origin
+
+
+def read_log_columns(path, columns, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Time (seconds, or in the unit of the time column if numeric) and values of the
+    selected `columns` of a log, read in chunks of `chunk_rows` rows.
+    """
+    import pandas as pd
+
+    delimiter, header = sniff_header(path)
+    time_name = header[time_column(header)]
+    names = [time_name, *columns]
+    time, values, origin = [], {column: [] for column in columns}, None
+    chunks = pd.read_csv(
+        path,
+        sep=delimiter,
+        usecols=names,
+        chunksize=chunk_rows,
+        memory_map=True,
+        skipinitialspace=True,
+        encoding='utf-8-sig',
+    )
+    for chunk in chunks:
+        chunk_time, origin = _elapsed_seconds(chunk[time_name], origin)
+        time.append(chunk_time)
+        for column in columns:
+            values[column].append(
+                pd.to_numeric(chunk[column], errors='coerce').to_numpy(np.float64)
+            )
+
+    def join(arrays):
+        return np.concatenate(arrays) if arrays else np.empty(0)
+
+    # Chunks of a column are released as soon as they are joined
+    return join(time), {column: join(values.pop(column)) for column in columns}
+
+
+def time_unit(column):
+    """
+    Unit of the time column, seconds if not given or not a time.
+    """
+    unit = log_unit(split_column(column)[1])
+    if unit is None or unit.dimensionality != {'[time]': 1}:
+        return ureg.second
+    return unit
+
+
+class ToolLogParser(MatchingParser):
+    def __init__(
+        self, *args, chunk_rows=DEFAULT_CHUNK_ROWS, ramp_storage='full', **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.chunk_rows = chunk_rows
+        self.ramp_storage = ramp_storage
+
+    def parse(
+        self,
+        mainfile: str,
+        archive: 'EntryArchive',
+        logger: 'BoundLogger' = None,
+        child_archives=None,
+    ) -> None:
+        _, header = sniff_header(mainfile)
+        time_name = header[time_column(header)]
+        mapped = {
+            column: ramp_of_column(column) for column in header if column != time_name
+        }
+        columns = [column for column, ramp in mapped.items() if ramp is not None]
+        time, values = read_log_columns(mainfile, columns, self.chunk_rows)
+        time = ureg.Quantity(time, time_unit(time_name))
+
+        log = ToolLog(
+            name=os.path.basename(mainfile),
+            log_file=os.path.basename(mainfile),
+            number_of_rows=len(time),
+            unmapped_columns=[c for c, ramp in mapped.items() if ramp is None],
+        )
+        for column in columns:
+            label, unit = split_column(column)
+            ramp = mapped[column](name=label, time=time, storage=self.ramp_storage)
+            pint_unit = log_unit(unit)
+            ramp.values = (
+                values[column]
+                if pint_unit is None
+                else ureg.Quantity(values[column], pint_unit)
+            )
+            log.m_add_sub_section(
+                getattr(ToolLog, RAMP_SUBSECTIONS[mapped[column]]), ramp
+            )
+        archive.data = log
+        if logger is not None:
+            logger.info(
+                'tool log parsed',
+                rows=len(time),
+                ramps=len(columns),
+                unmapped_columns=log.unmapped_columns,
+            )
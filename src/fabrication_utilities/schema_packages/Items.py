@@ -3,7 +3,6 @@ from typing import (
 )
 
 import numpy as np
-import plotly.graph_objects as go
 from nomad.datamodel.data import (
     ArchiveSection,
     EntryData,
@@ -16,7 +15,12 @@ from nomad.metainfo import (
     Section,
     SubSection,
 )
-from schema_packages.utils import FabricationChemical
+from schema_packages.geometry import outline
+from schema_packages.lineage import index_entry
+from schema_packages.placement import check_placement, pack_items
+from schema_packages.plotting import die_map_figure, outline_figure
+from schema_packages.utils import FabricationChemical, FingerprintSection
+from schema_packages.wafer_map import cut_plan, die_ids, die_map, wafer_cut
 
 if TYPE_CHECKING:
     from nomad.datamodel.datamodel import (
@@ -187,73 +191,134 @@ class Rectangle(Contour):
     )
 
 
-def make_geometric_represent(chuck, x, y, finalist):
-    posizione_centro = [(x, y)]
-    # Chuck creation
-    fig = go.Figure()
-    if chuck is not None:
-        if isinstance(chuck, Circle):
-            theta = np.linspace(0, 2 * np.pi, 100)
-            x_cerchio = chuck.radius * np.cos(theta)
-            y_cerchio = chuck.radius * np.sin(theta)
-            fig.add_trace(
-                go.Scatter(
-                    x=x_cerchio, y=y_cerchio, mode='lines', fill='toself', name='Chuck'
-                )
-            )
-        else:
-            if isinstance(chuck, Square):
-                half = chuck.side / 2
-                x_quad = [-half, half, half, -half, -half]
-                y_quad = [-half, -half, half, half, -half]
-                fig.add_trace(
-                    go.Scatter(
-                        x=x_quad, y=y_quad, mode='lines', fill='toself', name='Chuck'
-                    )
-                )
-            if isinstance(chuck, Rectangle):
-                half_base = chuck.base / 2
-                half_height = chuck.height / 2
-                x_quad = [-half_base, half_base, half_base, -half_base, -half_base]
-                y_quad = [
-                    -half_height,
-                    -half_height,
-                    half_height,
-                    half_height,
-                    -half_height,
-                ]
-                fig.add_trace(
-                    go.Scatter(
-                        x=x_quad, y=y_quad, mode='lines', fill='toself', name='Chuck'
-                    )
-                )
-        for i, (x1, y1) in enumerate(posizione_centro):
-            fig.add_trace(
-                go.Scatter(
-                    x=[x1],
-                    y=[y1],
-                    mode='markers',
-                    marker=dict(size=10, color='red'),
-                    name=f'Quadratino {i + 1} centro',
-                )
-            )
-        fig.update_layout(
-            title='Item centering on chuck/chamber',
-            width=800,
-            height=800,
+class WaferWithFlat(Circle):
+    m_def = Section(
+        description="""
+        Class to describe wafers with a flat, the flat is placed at the bottom
+        """
+    )
+
+    flat_length = Quantity(
+        type=np.float64,
+        a_eln={'component': 'NumberEditQuantity', 'defaultDisplayUnit': 'mm'},
+        unit='mm',
+    )
+
+
+class WaferWithNotch(Circle):
+    m_def = Section(
+        description="""
+        Class to describe wafers with a notch, the notch is placed at the bottom
+        """
+    )
+
+    notch_depth = Quantity(
+        type=np.float64,
+        a_eln={'component': 'NumberEditQuantity', 'defaultDisplayUnit': 'mm'},
+        unit='mm',
+    )
+
+
+def length_in_cm(length):
+    if length is None:
+        return None
+    if hasattr(length, 'to'):
+        length = length.to('cm').magnitude
+    return np.asarray(length, dtype=np.float64) if np.ndim(length) else float(length)
+
+
+def length_in_mm(length):
+    return None if length is None else length_in_cm(length) * 10
+
+
+def contour_outline(contour):
+    """
+    x and y of the outline of a contour in cm, None if its size is not given.
+    """
+    radius = length_in_cm(getattr(contour, 'radius', None))
+    if isinstance(contour, WaferWithFlat) and radius:
+        flat = length_in_cm(contour.flat_length)
+        if flat:
+            return outline('flat', radius, ratio=flat / radius)
+    if isinstance(contour, WaferWithNotch) and radius:
+        depth = length_in_cm(contour.notch_depth)
+        if depth:
+            return outline('notch', radius, ratio=depth / radius)
+    if isinstance(contour, Circle) and radius:
+        return outline('circle', radius)
+    if isinstance(contour, Square) and contour.side is not None:
+        return outline('square', length_in_cm(contour.side))
+    if isinstance(contour, Rectangle) and None not in (contour.base, contour.height):
+        return outline(
+            'rectangle', length_in_cm(contour.base), length_in_cm(contour.height)
         )
-        figure_json = fig.to_plotly_json()
-        figure_json['config'] = {'staticPlot': True}
-        finalist.append(
-            PlotlyFigure(
-                label='Chuck vision',
-                figure=figure_json,
-                index=0,
-            )
+    return None, None
+
+
+def contour_bounds(contour):
+    """
+    Kind, width, height and cut of a chuck contour in cm, as used by the placement
+    engine, None if its size is not given.
+    """
+    radius = length_in_cm(getattr(contour, 'radius', None))
+    if isinstance(contour, Circle) and radius:
+        cut = None
+        if isinstance(contour, WaferWithFlat) and contour.flat_length is not None:
+            half_flat = min(length_in_cm(contour.flat_length) / 2, radius)
+            cut = np.sqrt(radius**2 - half_flat**2)
+        if isinstance(contour, WaferWithNotch) and contour.notch_depth is not None:
+            cut = radius - length_in_cm(contour.notch_depth)
+        return 'circle', radius, radius, cut
+    if isinstance(contour, Square) and contour.side is not None:
+        side = length_in_cm(contour.side)
+        return 'square', side, side, None
+    if isinstance(contour, Rectangle) and None not in (contour.base, contour.height):
+        base, height = length_in_cm(contour.base), length_in_cm(contour.height)
+        return 'rectangle', base, height, None
+    return None
+
+
+def contour_extent(contour):
+    """
+    Half width, half height and rounding radius in cm of an item contour, wafers
+    are taken as full circles. None if its size is not given.
+    """
+    if isinstance(contour, Circle) and contour.radius is not None:
+        return 0.0, 0.0, length_in_cm(contour.radius)
+    if isinstance(contour, Square) and contour.side is not None:
+        half = length_in_cm(contour.side) / 2
+        return half, half, 0.0
+    if isinstance(contour, Rectangle) and None not in (contour.base, contour.height):
+        return length_in_cm(contour.base) / 2, length_in_cm(contour.height) / 2, 0.0
+    return None
+
+
+def make_geometric_represent(chuck, x, y, finalist, item=None):
+    if chuck is None:
+        return
+    x_chuck, y_chuck = contour_outline(chuck)
+    centers = []
+    if x is not None and y is not None:
+        x, y = np.atleast_1d(length_in_cm(x)), np.atleast_1d(length_in_cm(y))
+        centers = list(zip(x.tolist(), y.tolist()))
+    items = None
+    if item is not None and centers:
+        x_item, y_item = contour_outline(item)
+        if x_item is not None:
+            items = (x[:, None] + x_item, y[:, None] + y_item)
+    figure_json = outline_figure(
+        x_chuck, y_chuck, centers, 'Item centering on chuck/chamber', items=items
+    )
+    finalist.append(
+        PlotlyFigure(
+            label='Chuck vision',
+            figure=figure_json,
+            index=0,
         )
+    )
 
 
-class ItemPlacement(PlotSection, EntryData):
+class ItemPlacement(PlotSection, EntryData, FingerprintSection):
     m_def = Section(
         description="""
         Section used to describe, if needed, item placement on chucks. The reference
@@ -261,6 +326,11 @@ class ItemPlacement(PlotSection, EntryData):
         center) so displacemnt of center of items is given with respect the chuck
         center. If no chuck is provided you can use the chuck for describing the
         chamber shape, ideally the role is similar in these cases.
+        When many items are loaded their centers are given in items_center_x and
+        items_center_y, or generated packing number_of_items items with the shape
+        of item_geometry on the chuck. Generated centers are packed again when the
+        chuck, the items or their number change. Items out of the chuck or
+        overlapping are reported as warnings.
         """
     )
 
@@ -276,6 +346,47 @@ class ItemPlacement(PlotSection, EntryData):
         unit='cm',
     )
 
+    items_center_x = Quantity(
+        type=np.float64,
+        shape=['*'],
+        description='x of the centers of the items, when more than one is loaded',
+        a_eln={'component': 'NumberEditQuantity', 'defaultDisplayUnit': 'cm'},
+        unit='cm',
+    )
+
+    items_center_y = Quantity(
+        type=np.float64,
+        shape=['*'],
+        description='y of the centers of the items, when more than one is loaded',
+        a_eln={'component': 'NumberEditQuantity', 'defaultDisplayUnit': 'cm'},
+        unit='cm',
+    )
+
+    number_of_items = Quantity(
+        type=int,
+        description="""
+        Items to place on the chuck when their centers are not given, as many as
+        possible if the chuck cannot hold all of them
+        """,
+        a_eln={'component': 'NumberEditQuantity'},
+    )
+
+    items_auto_placed = Quantity(
+        type=bool,
+        description="""
+        True if the centers of the items were generated from number_of_items, clear
+        it to keep the generated centers and edit them by hand
+        """,
+        a_eln={'component': 'BoolEditQuantity'},
+    )
+
+    item_spacing = Quantity(
+        type=np.float64,
+        description='Minimum distance between the items placed automatically',
+        a_eln={'component': 'NumberEditQuantity', 'defaultDisplayUnit': 'mm'},
+        unit='mm',
+    )
+
     chuck_geometry = SubSection(
         section_def=Contour,
         repeats=False,
@@ -286,13 +397,262 @@ class ItemPlacement(PlotSection, EntryData):
         repeats=False,
     )
 
+    def centers(self):
+        """
+        N x 2 array with the centers of the placed items in cm.
+        """
+        if self.items_center_x is not None and self.items_center_y is not None:
+            x = length_in_cm(self.items_center_x)
+            y = length_in_cm(self.items_center_y)
+            length = min(len(x), len(y))
+            return np.stack([x[:length], y[:length]], axis=1)
+        if self.item_center_x is not None and self.item_center_y is not None:
+            return np.array(
+                [[length_in_cm(self.item_center_x), length_in_cm(self.item_center_y)]]
+            )
+        return np.empty((0, 2))
+
+    def place_items(self, bounds, extent, logger):
+        spacing = length_in_cm(self.item_spacing) or 0.0
+        centers = pack_items(
+            bounds, extent, count=self.number_of_items, spacing=spacing
+        )
+        if len(centers) < self.number_of_items:
+            logger.warning(
+                f'Only {len(centers)} of {self.number_of_items} items fit the chuck'
+            )
+        self.items_center_x = centers[:, 0]
+        self.items_center_y = centers[:, 1]
+        self.items_auto_placed = True
+
+    def check_items(self, bounds, extent, logger):
+        outside, pairs = check_placement(bounds, self.centers(), extent)
+        if len(outside):
+            logger.warning(f'Items {(outside + 1).tolist()} are out of the chuck')
+        if len(pairs):
+            logger.warning(f'Items {(pairs + 1).tolist()} overlap')
+
     def normalize(self, archive, logger):
         super().normalize(archive, logger)
+        if self.fingerprint_matches():
+            return
         if hasattr(self, 'figures') and self.figures:
             self.figures.clear()
+        bounds = contour_bounds(self.chuck_geometry)
+        extent = contour_extent(self.item_geometry)
+        if self.items_auto_placed and not self.number_of_items:
+            self.items_center_x, self.items_center_y = None, None
+            self.items_auto_placed = False
+        if bounds is not None and extent is not None:
+            if self.number_of_items and (
+                self.items_auto_placed or self.items_center_x is None
+            ):
+                self.place_items(bounds, extent, logger)
+            self.check_items(bounds, extent, logger)
+        centers = self.centers()
         make_geometric_represent(
-            self.chuck_geometry, self.item_center_x, self.item_center_y, self.figures
+            self.chuck_geometry,
+            centers[:, 0] if len(centers) else None,
+            centers[:, 1] if len(centers) else None,
+            self.figures,
+            item=self.item_geometry,
         )
+        self.update_fingerprint()
+
+
+WAFER_SHAPES = [
+    'Wafer with flat standard',
+    'Wafer with flat JEIDA',
+    'Wafer with Notch standard',
+    'Round wafer',
+]
+
+
+class WaferMap(PlotSection, FingerprintSection):
+    m_def = Section(
+        description="""
+        Map of the dies of a wafer: the grid of dies with the given pitch, streets
+        included, centered on the wafer (or displaced by the grid offset) is compared
+        with the wafer area left by the edge exclusion and by the flat or the notch.
+        Dies inside this area are full, the ones crossing its border partial.
+        Diameter and shape, if not given, are taken from the item containing the map
+        at every normalization.
+        """
+    )
+
+    wafer_diameter = Quantity(
+        type=np.float64,
+        a_eln={'component': 'NumberEditQuantity', 'defaultDisplayUnit': 'mm'},
+        unit='mm',
+    )
+
+    wafer_shape = Quantity(
+        type=MEnum(WAFER_SHAPES),
+        a_eln={'component': 'EnumEditQuantity'},
+    )
+
+    die_pitch_x = Quantity(
+        type=np.float64,
+        a_eln={'component': 'NumberEditQuantity', 'defaultDisplayUnit': 'mm'},
+        unit='mm',
+    )
+
+    die_pitch_y = Quantity(
+        type=np.float64,
+        description='Equal to die_pitch_x if not given',
+        a_eln={'component': 'NumberEditQuantity', 'defaultDisplayUnit': 'mm'},
+        unit='mm',
+    )
+
+    street_width = Quantity(
+        type=np.float64,
+        a_eln={'component': 'NumberEditQuantity', 'defaultDisplayUnit': 'um'},
+        unit='um',
+    )
+
+    edge_exclusion = Quantity(
+        type=np.float64,
+        a_eln={'component': 'NumberEditQuantity', 'defaultDisplayUnit': 'mm'},
+        unit='mm',
+    )
+
+    grid_offset_x = Quantity(
+        type=np.float64,
+        a_eln={'component': 'NumberEditQuantity', 'defaultDisplayUnit': 'mm'},
+        unit='mm',
+    )
+
+    grid_offset_y = Quantity(
+        type=np.float64,
+        a_eln={'component': 'NumberEditQuantity', 'defaultDisplayUnit': 'mm'},
+        unit='mm',
+    )
+
+    number_of_full_dies = Quantity(
+        type=int,
+    )
+
+    number_of_partial_dies = Quantity(
+        type=int,
+    )
+
+    die_id = Quantity(
+        type=str,
+        shape=['*'],
+        description='Identifiers of the dies as R<row>C<column>, from the top left',
+    )
+
+    die_center_x = Quantity(
+        type=np.float64,
+        shape=['*'],
+        unit='mm',
+    )
+
+    die_center_y = Quantity(
+        type=np.float64,
+        shape=['*'],
+        unit='mm',
+    )
+
+    die_row = Quantity(
+        type=np.int64,
+        shape=['*'],
+    )
+
+    die_column = Quantity(
+        type=np.int64,
+        shape=['*'],
+    )
+
+    die_full = Quantity(
+        type=bool,
+        shape=['*'],
+    )
+
+    def wafer(self):
+        """
+        Diameter in mm and shape of the wafer, the ones of the item containing the
+        map if not given. The diameter is None if it is unknown.
+        """
+        diameter, shape = length_in_mm(self.wafer_diameter), self.wafer_shape
+        parent = self.m_parent
+        geometry = getattr(parent, 'geometric_properties', None)
+        if diameter is None and isinstance(geometry, Circle):
+            if geometry.radius is not None:
+                diameter = 2 * length_in_mm(geometry.radius)
+        parent_shape = getattr(parent, 'shapeType', None)
+        if shape is None and parent_shape in WAFER_SHAPES:
+            shape = parent_shape
+        return diameter, shape
+
+    def fingerprint_inputs(self):
+        return self.wafer()
+
+    def map_parameters(self):
+        # Arguments, in mm, of the die map and cut plan engines
+        diameter, shape = self.wafer()
+        return {
+            'diameter': diameter,
+            'pitch_x': length_in_mm(self.die_pitch_x),
+            'pitch_y': length_in_mm(self.die_pitch_y),
+            'street': length_in_mm(self.street_width) or 0.0,
+            'edge_exclusion': length_in_mm(self.edge_exclusion) or 0.0,
+            'shape': shape,
+            'offset': (
+                length_in_mm(self.grid_offset_x) or 0.0,
+                length_in_mm(self.grid_offset_y) or 0.0,
+            ),
+        }
+
+    def die_map(self):
+        """
+        Cached `DieMap` of the parameters of the section, None if they are missing.
+        """
+        parameters = self.map_parameters()
+        if parameters['diameter'] is None or parameters['pitch_x'] is None:
+            return None
+        return die_map(**parameters)
+
+    def cut_plan(self):
+        """
+        Cached `CutPlan` along the streets of the map, None if parameters are missing.
+        """
+        parameters = self.map_parameters()
+        if parameters['diameter'] is None or parameters['pitch_x'] is None:
+            return None
+        return cut_plan(**parameters)
+
+    def normalize(self, archive, logger):
+        super().normalize(archive, logger)
+        if self.fingerprint_matches():
+            return
+        try:
+            dies = self.die_map()
+        except ValueError as error:
+            logger.warning(str(error))
+            return
+        if dies is None:
+            return
+        self.number_of_full_dies = dies.full_count
+        self.number_of_partial_dies = dies.partial_count
+        self.die_id = die_ids(dies)
+        self.die_center_x, self.die_center_y = dies.x, dies.y
+        self.die_row, self.die_column, self.die_full = dies.row, dies.column, dies.full
+
+        diameter, shape = self.wafer()
+        radius = diameter / 2
+        cut = wafer_cut(diameter, shape)
+        if cut is None:
+            wafer_outline = outline('circle', radius)
+        elif 'Notch' in shape:
+            wafer_outline = outline('notch', radius, ratio=1 - cut / radius)
+        else:
+            wafer_outline = outline(
+                'flat', radius, ratio=2 * np.sqrt(1 - (cut / radius) ** 2)
+            )
+        figure = die_map_figure(wafer_outline, dies, 'Wafer map')
+        self.figures = [PlotlyFigure(label='Wafer map', figure=figure, index=0)]
+        self.update_fingerprint()
 
 
 class ItemsPermitted(ArchiveSection):
@@ -476,9 +836,21 @@ class Item(FabricationChemical):
         description='If your item is assembly describe here each component',
         repeats=True,
     )
+    wafer_map = SubSection(
+        section_def=WaferMap,
+        description='Map of the dies of the wafer, if it is going to be diced',
+        repeats=False,
+    )
+
+    def lineage(self, entry):
+        """
+        Link from the parent wafer to this item, if both are identified.
+        """
+        return [(self.id_wafer_parent, self.lab_id)], []
 
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         super().normalize(archive, logger)
+        index_entry(archive, self, logger)
 
 
 m_package.__init_metainfo__()
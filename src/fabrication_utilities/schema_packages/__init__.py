@@ -4,8 +4,9 @@ from nomad.config.models.plugins import SchemaPackageEntryPoint
 class ItemsEntryPoint(SchemaPackageEntryPoint):
     def load(self):
         from schema_packages.Items import m_package
+        from schema_packages.profiling import profiled
 
-        return m_package
+        return profiled(m_package)
 
 
 Items_entry_point = ItemsEntryPoint(
@@ -19,8 +20,9 @@ class UtilitiesEntryPoint(SchemaPackageEntryPoint):
         from schema_packages.fabrication_utilities import (
             m_package,
         )
+        from schema_packages.profiling import profiled
 
-        return m_package
+        return profiled(m_package)
 
 
 Utilities_entry_point = UtilitiesEntryPoint(
@@ -47,8 +49,9 @@ class EquipmentsEntryPoint(SchemaPackageEntryPoint):
         from schema_packages.equipments.equipments import (
             m_package,
         )
+        from schema_packages.profiling import profiled
 
-        return m_package
+        return profiled(m_package)
 
 
 Equipments_entry_point = EquipmentsEntryPoint(
@@ -62,8 +65,9 @@ class MaterialEntryPoint(SchemaPackageEntryPoint):
         from schema_packages.materials import (
             m_package,
         )
+        from schema_packages.profiling import profiled
 
-        return m_package
+        return profiled(m_package)
 
 
 materials_entry_point = MaterialEntryPoint(
@@ -77,11 +81,28 @@ class AnalysisEntryPoint(SchemaPackageEntryPoint):
         from schema_packages.calculus.calculus import (
             m_package,
         )
+        from schema_packages.profiling import profiled
 
-        return m_package
+        return profiled(m_package)
 
 
 calculus_entry_point = AnalysisEntryPoint(
     name='Analysis sheets',
     description='Schema package for describing various analysis needed in CR.',
 )
+
+
+class ToolLogEntryPoint(SchemaPackageEntryPoint):
+    def load(self):
+        from schema_packages.profiling import profiled
+        from schema_packages.tool_log import (
+            m_package,
+        )
+
+        return profiled(m_package)
+
+
+tool_log_entry_point = ToolLogEntryPoint(
+    name='Tool logs',
+    description='Schema package for describing datalogs written by equipments.',
+)
@@ -21,6 +21,9 @@ from nomad.metainfo import (
 from schema_packages.fabrication_utilities import (
     FabricationProcessStep,
 )
+from schema_packages.site_maps import map_statistics, radial_fit
+from schema_packages.stoney import CURVATURE_WINDOW, local_curvature, stoney_stress
+from schema_packages.utils import FingerprintSection
 
 if TYPE_CHECKING:
     from nomad.datamodel.datamodel import (
@@ -32,8 +35,16 @@ if TYPE_CHECKING:
 
 m_package = Package(name='Definitions for usual operation of analysis')
 
+# Inputs of the stress maps sampled at the positions of the scans
+SCAN_QUANTITIES = (
+    'height_before',
+    'height_after',
+    'curvature_before',
+    'curvature_after',
+)
+
 
-class BaseCalculusSheet(EntryData, ArchiveSection):
+class BaseCalculusSheet(EntryData, FingerprintSection):
     m_def = Section()
 
     name = Quantity(type=str, a_eln={'component': 'StringEditQuantity'})
@@ -50,7 +61,112 @@ class BaseCalculusSheet(EntryData, ArchiveSection):
     location = Quantity(type=str, a_eln={'component': 'StringEditQuantity'})
 
 
-class EtchingRateOutput(ArchiveSection):
+class RateMapInputs(ArchiveSection):
+    m_def = Section(
+        description="""
+        Coordinates of the sites of a wafer map, from the center of the wafer. Filled
+        together with the values measured at every site, the rate is evaluated on the
+        whole map.
+        """
+    )
+
+    site_x = Quantity(
+        type=np.float64,
+        shape=['*'],
+        a_eln={'component': 'NumberEditQuantity', 'defaultDisplayUnit': 'mm'},
+        unit='mm',
+    )
+    site_y = Quantity(
+        type=np.float64,
+        shape=['*'],
+        a_eln={'component': 'NumberEditQuantity', 'defaultDisplayUnit': 'mm'},
+        unit='mm',
+    )
+
+    def site_coordinates(self):
+        """
+        Coordinates of the sites in mm, None if not given.
+        """
+        if self.site_x is None or self.site_y is None:
+            return None
+        return self.site_x.to('mm').magnitude, self.site_y.to('mm').magnitude
+
+
+class RateMapOutput(ArchiveSection):
+    m_def = Section(
+        description="""
+        Rate at every site of a wafer map, its statistics and its radial profile
+        fitted as a polynomial of the square of the distance from the center.
+        """
+    )
+
+    site_rate = Quantity(
+        type=np.float64,
+        shape=['*'],
+        a_eln={'defaultDisplayUnit': 'nm/minute'},
+        unit='nm/minute',
+    )
+    rate_standard_deviation = Quantity(
+        type=np.float64,
+        a_eln={'defaultDisplayUnit': 'nm/minute'},
+        unit='nm/minute',
+    )
+    rate_minimum = Quantity(
+        type=np.float64,
+        a_eln={'defaultDisplayUnit': 'nm/minute'},
+        unit='nm/minute',
+    )
+    rate_maximum = Quantity(
+        type=np.float64,
+        a_eln={'defaultDisplayUnit': 'nm/minute'},
+        unit='nm/minute',
+    )
+    non_uniformity = Quantity(
+        type=np.float64,
+        description='Half of the range of the rates over their mean, in percent',
+    )
+    radial_profile_radius = Quantity(
+        type=np.float64,
+        shape=['*'],
+        a_eln={'defaultDisplayUnit': 'mm'},
+        unit='mm',
+    )
+    radial_profile_rate = Quantity(
+        type=np.float64,
+        shape=['*'],
+        a_eln={'defaultDisplayUnit': 'nm/minute'},
+        unit='nm/minute',
+    )
+
+    def fill_rate_map(self, rates, coordinates=None, logger=None):
+        """
+        Fills the statistics of the rates in nm/minute and, if the coordinates of the
+        sites are given, their radial profile. Returns the mean rate.
+        """
+        statistics = map_statistics(rates)
+        self.site_rate = rates
+        self.rate_standard_deviation = statistics.std
+        self.rate_minimum = statistics.minimum
+        self.rate_maximum = statistics.maximum
+        self.non_uniformity = statistics.non_uniformity
+        if coordinates is None:
+            return statistics.mean
+        if any(len(values) != len(rates) for values in coordinates):
+            if logger is not None:
+                logger.error(
+                    'The coordinates of the sites do not match the values of the map',
+                    site_x=len(coordinates[0]),
+                    site_y=len(coordinates[1]),
+                    rates=len(rates),
+                )
+        else:
+            radius, profile = radial_fit(*coordinates, rates).profile()
+            self.radial_profile_radius = radius
+            self.radial_profile_rate = profile
+        return statistics.mean
+
+
+class EtchingRateOutput(RateMapOutput):
     m_def = Section()
 
     etching_rate_value = Quantity(
@@ -60,7 +176,7 @@ class EtchingRateOutput(ArchiveSection):
     )
 
 
-class EtchingRateInputs(ArchiveSection):
+class EtchingRateInputs(RateMapInputs):
     m_def = Section()
 
     etching_time = Quantity(
@@ -81,6 +197,13 @@ class EtchingRateInputs(ArchiveSection):
         type=FabricationProcessStep,
         a_eln={'component': 'ReferenceEditQuantity'},
     )
+    site_depth = Quantity(
+        type=np.float64,
+        shape=['*'],
+        description='Depth at every site of a wafer map',
+        a_eln={'component': 'NumberEditQuantity', 'defaultDisplayUnit': 'nm'},
+        unit='nm',
+    )
 
 
 class EtchingRate(BaseCalculusSheet):
@@ -91,15 +214,26 @@ class EtchingRate(BaseCalculusSheet):
     output = SubSection(section_def=EtchingRateOutput, repeats=False)
 
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
+        if self.fingerprint_matches():
+            return
         if self.inputs is not None:
-            if self.inputs.depth and self.inputs.etching_time != 0:
+            if self.inputs.site_depth is not None and self.inputs.etching_time:
+                self.output = EtchingRateOutput()
+                rates = self.inputs.site_depth / self.inputs.etching_time
+                self.output.etching_rate_value = self.output.fill_rate_map(
+                    rates.to('nm/minute').magnitude,
+                    self.inputs.site_coordinates(),
+                    logger,
+                )
+            elif self.inputs.depth and self.inputs.etching_time != 0:
                 self.output = EtchingRateOutput()
                 self.output.etching_rate_value = (
                     self.inputs.depth / self.inputs.etching_time
                 )
+        self.update_fingerprint()
 
 
-class DepositionRateOutput(ArchiveSection):
+class DepositionRateOutput(RateMapOutput):
     m_def = Section()
 
     deposition_rate_value = Quantity(
@@ -109,7 +243,7 @@ class DepositionRateOutput(ArchiveSection):
     )
 
 
-class DepositionRateInputs(ArchiveSection):
+class DepositionRateInputs(RateMapInputs):
     m_def = Section()
 
     deposition_time = Quantity(
@@ -130,6 +264,13 @@ class DepositionRateInputs(ArchiveSection):
         type=FabricationProcessStep,
         a_eln={'component': 'ReferenceEditQuantity'},
     )
+    site_thickness = Quantity(
+        type=np.float64,
+        shape=['*'],
+        description='Thickness at every site of a wafer map',
+        a_eln={'component': 'NumberEditQuantity', 'defaultDisplayUnit': 'nm'},
+        unit='nm',
+    )
 
 
 class DepositionRate(BaseCalculusSheet):
@@ -140,12 +281,23 @@ class DepositionRate(BaseCalculusSheet):
     output = SubSection(section_def=DepositionRateOutput, repeats=False)
 
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
+        if self.fingerprint_matches():
+            return
         if self.inputs is not None:
-            if self.inputs.thickness and self.inputs.deposition_time != 0:
+            if self.inputs.site_thickness is not None and self.inputs.deposition_time:
+                self.output = DepositionRateOutput()
+                rates = self.inputs.site_thickness / self.inputs.deposition_time
+                self.output.deposition_rate_value = self.output.fill_rate_map(
+                    rates.to('nm/minute').magnitude,
+                    self.inputs.site_coordinates(),
+                    logger,
+                )
+            elif self.inputs.thickness and self.inputs.deposition_time != 0:
                 self.output = DepositionRateOutput()
                 self.output.deposition_rate_value = (
                     self.inputs.thickness / self.inputs.deposition_time
                 )
+        self.update_fingerprint()
 
 
 class StressPropertiesOutput(ArchiveSection):
@@ -156,6 +308,20 @@ class StressPropertiesOutput(ArchiveSection):
         unit='GPa',
         a_eln={'component': 'NumberEditQuantity', 'defaultDisplayUnit': 'GPa'},
     )
+    stress_position = Quantity(
+        type=np.float64,
+        shape=['*'],
+        description='Positions along the scans of the stress profile',
+        a_eln={'defaultDisplayUnit': 'mm'},
+        unit='mm',
+    )
+    stress_profile = Quantity(
+        type=np.float64,
+        shape=['*'],
+        description='Stress along the scans, its mean is the stress value',
+        a_eln={'defaultDisplayUnit': 'GPa'},
+        unit='GPa',
+    )
 
 
 class StressPropertiesInputs(ArchiveSection):
@@ -191,6 +357,46 @@ class StressPropertiesInputs(ArchiveSection):
         type=FabricationProcessStep, a_eln={'component': 'ReferenceEditQuantity'}
     )
 
+    scan_position = Quantity(
+        type=np.float64,
+        shape=['*'],
+        description='Positions of the points of the bow scans, shared by all of them',
+        a_eln={'component': 'NumberEditQuantity', 'defaultDisplayUnit': 'mm'},
+        unit='mm',
+    )
+
+    height_before = Quantity(
+        type=np.float64,
+        shape=['*'],
+        description='Height of the substrate along the scan before the deposition',
+        a_eln={'component': 'NumberEditQuantity', 'defaultDisplayUnit': 'um'},
+        unit='um',
+    )
+
+    height_after = Quantity(
+        type=np.float64,
+        shape=['*'],
+        description='Height of the substrate along the scan after the deposition',
+        a_eln={'component': 'NumberEditQuantity', 'defaultDisplayUnit': 'um'},
+        unit='um',
+    )
+
+    curvature_before = Quantity(
+        type=np.float64,
+        shape=['*'],
+        description='Curvature along the scan before the deposition, if measured',
+        a_eln={'component': 'NumberEditQuantity', 'defaultDisplayUnit': '1/m'},
+        unit='1/m',
+    )
+
+    curvature_after = Quantity(
+        type=np.float64,
+        shape=['*'],
+        description='Curvature along the scan after the deposition, if measured',
+        a_eln={'component': 'NumberEditQuantity', 'defaultDisplayUnit': '1/m'},
+        unit='1/m',
+    )
+
 
 class StressParametersAdopted(ArchiveSection):
     m_def = Section()
@@ -205,6 +411,16 @@ class StressParametersAdopted(ArchiveSection):
         type=np.float64, a_eln={'component': 'NumberEditQuantity'}
     )
 
+    curvature_fit_points = Quantity(
+        type=int,
+        default=CURVATURE_WINDOW,
+        description="""
+        Points of the windows of the local polynomial fits giving the curvature of
+        height scans
+        """,
+        a_eln={'component': 'NumberEditQuantity'},
+    )
+
 
 class StressProperties(BaseCalculusSheet):
     m_def = Section(
@@ -219,7 +435,98 @@ class StressProperties(BaseCalculusSheet):
 
     output = SubSection(section_def=StressPropertiesOutput, repeats=False)
 
+    def curvature_change(self, logger: 'BoundLogger'):
+        """
+        Positions in m and change of curvature in 1/m along the scans, from the
+        curvatures if given or from the heights otherwise. None without scans after
+        the deposition, if the scans do not have a value at every position or if they
+        are shorter than the window of the curvature fits.
+        """
+        inputs = self.inputs
+        if inputs.scan_position is None or len(inputs.scan_position) == 0:
+            logger.warning('Cannot compute the stress map without scan positions')
+            return None
+        position = inputs.scan_position.to('m').magnitude
+        lengths = {
+            name: len(getattr(inputs, name))
+            for name in SCAN_QUANTITIES
+            if getattr(inputs, name) is not None
+        }
+        if any(length != len(position) for length in lengths.values()):
+            logger.error(
+                'The scans do not have a value at every scan position',
+                scan_position=len(position),
+                **lengths,
+            )
+            return None
+        if inputs.curvature_after is not None:
+            change = inputs.curvature_after.to('1/m').magnitude
+            if inputs.curvature_before is not None:
+                change = change - inputs.curvature_before.to('1/m').magnitude
+            return position, change
+        if inputs.height_after is None:
+            return None
+        window = self.parameters.curvature_fit_points or CURVATURE_WINDOW
+        if len(position) < window:
+            logger.warning(
+                'The scans are shorter than the window of the curvature fits',
+                scan_position=len(position),
+                curvature_fit_points=window,
+            )
+            return None
+        centers, change = local_curvature(
+            position, inputs.height_after.to('m').magnitude, window
+        )
+        if inputs.height_before is not None:
+            _, before = local_curvature(
+                position, inputs.height_before.to('m').magnitude, window
+            )
+            change = change - before
+        return centers, change
+
+    def stress_map(self, logger: 'BoundLogger') -> None:
+        """
+        Stress profile along the bow scans by Stoney formula, from the change of
+        curvature of the substrate after the deposition.
+        """
+        parameters, inputs = self.parameters, self.inputs
+        values = (
+            getattr(parameters, 'assumed_Young_module_of_the_substrate', None),
+            getattr(parameters, 'assumed_Poisson_coefficient', None),
+            inputs.substrate_thickness,
+            inputs.layer_thickness,
+        )
+        if any(value is None for value in values):
+            logger.warning('Missing moduli or thicknesses for the stress map')
+            return
+        try:
+            change = self.curvature_change(logger)
+        except ValueError as error:
+            logger.warning('Cannot compute the curvature of the scans', exc_info=error)
+            return
+        if change is None:
+            return
+        young, poisson, substrate, layer = values
+        stress = stoney_stress(
+            change[1],
+            young.to('Pa').magnitude,
+            poisson,
+            substrate.to('m').magnitude,
+            layer.to('m').magnitude,
+        )
+        self.output = StressPropertiesOutput(
+            stress_position=change[0] * 1e3,
+            stress_profile=stress / 1e9,
+            stress_value=np.nanmean(stress) / 1e9,
+        )
+
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
+        if self.fingerprint_matches():
+            return
+        if self.inputs is not None and self.inputs.scan_position is not None:
+            self.stress_map(logger)
+            self.update_fingerprint()
+            return
         if self.parameters.assumed_Poisson_coefficient is not None:
             pois = self.parameters.assumed_Poisson_coefficient
         if self.parameters.assumed_Young_module_of_the_substrate is not None:
@@ -232,3 +539,4 @@ class StressProperties(BaseCalculusSheet):
                     D = self.inputs.substrate_thickness
                     self.output = StressPropertiesOutput()
                     self.output.stress_value = young * D * D / (6 * (1 - pois) * R * t)
+        self.update_fingerprint()
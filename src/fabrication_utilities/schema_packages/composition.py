@@ -0,0 +1,269 @@
+#######################################################################################
+# Engine used to turn chemical formulas into elemental compositions. It is kept free  #
+# of NOMAD sections so that it can be shared by every schema package and cached: the  #
+# same handful of formulas (SF6, O2, H2O, ...) repeats thousands of times in uploads. #
+#######################################################################################
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+from schema_packages.periodic_table import ATOMIC_MASSES as am
+from schema_packages.periodic_table import ATOMIC_NUMBERS as an
+
+# Maximum number of distinct formulas kept in memory by the composition engine
+COMPOSITION_CACHE_SIZE = 1024
+
+# Number of elements, column j of batch matrices refers to the atomic number j + 1
+NUMBER_OF_ELEMENTS = 118
+ATOMIC_MASSES = np.asarray(am[1 : NUMBER_OF_ELEMENTS + 1], dtype=np.float64)
+
+# Names commonly used in the cleanroom instead of the chemical formula
+CHEMICAL_SYNONYMS = {
+    'water': 'H2O',
+    'di water': 'H2O',
+    'deionized water': 'H2O',
+    'de ionized water': 'H2O',
+    'oxygen': 'O2',
+    'nitrogen': 'N2',
+    'hydrogen': 'H2',
+    'argon': 'Ar',
+    'helium': 'He',
+    'ammonia': 'NH3',
+    'silane': 'SiH4',
+    'dichlorosilane': 'SiH2Cl2',
+    'nitrous oxide': 'N2O',
+    'sulfur hexafluoride': 'SF6',
+    'octafluorocyclobutane': 'C4F8',
+    'tetrafluoromethane': 'CF4',
+    'trifluoromethane': 'CHF3',
+    'hydrofluoric acid': 'HF',
+    'sulfuric acid': 'H2SO4',
+    'hydrogen peroxide': 'H2O2',
+    'hydrochloric acid': 'HCl',
+    'nitric acid': 'HNO3',
+    'phosphoric acid': 'H3PO4',
+    'acetic acid': 'C2H4O2',
+    'acetone': 'C3H6O',
+    'isopropanol': 'C3H8O',
+    'ipa': 'C3H8O',
+    'tmah': 'C4H13NO',
+}
+
+
+class CompositionRecord(NamedTuple):
+    """
+    Immutable composition of a formula, elements are in order of first appearance.
+    """
+
+    formula: str
+    elements: tuple
+    counts: tuple
+    atomic_fractions: tuple
+    mass_fractions: tuple
+
+
+class BatchComposition(NamedTuple):
+    """
+    Compositions of N formulas as dense N x 118 matrices indexed by atomic number.
+    """
+
+    formulas: tuple
+    counts: np.ndarray
+    atomic_fractions: np.ndarray
+    mass_fractions: np.ndarray
+    molar_masses: np.ndarray
+
+
+# A dot between digits is a decimal point (Al0.3, Si1.5N2), so adducts after a count are
+# separated by `·` or `*` (CuSO4·5H2O) and a dot is an adduct separator only when it is
+# not between digits (K4[Fe(CN)6].3H2O, CuSO4.H2O). Other dots are ambiguous
+_FORMULA_TOKEN = re.compile(
+    r"""
+    (?P<element>[A-Z][a-z]*)
+    |(?P<number>\d+(?:\.\d+)?)
+    |(?P<open>[(\[{])
+    |(?P<close>[)\]}])
+    |(?P<separator>[·*]|(?<!\d)\.|\.(?!\d))
+    |(?P<ambiguous>\.)
+    """,
+    re.VERBOSE,
+)
+
+
+def _to_number(text):
+    return float(text) if '.' in text else int(text)
+
+
+def _read_count(tokens, i, formula):
+    """
+    Count after the element or group ending at token i, and the index of the next token.
+
+    A decimal count that also reads as a count and an adduct, e.g. `4.5` in
+    `CuSO4.5H2O`, is rejected. Only counts below 2 followed by more atoms are decimals.
+    """
+    if i >= len(tokens) or tokens[i][0] != 'number':
+        return 1, i
+    text = tokens[i][1]
+    following = tokens[i + 1][0] if i + 1 < len(tokens) else None
+    if (
+        '.' in text
+        and int(text.split('.')[0]) >= 2  # noqa: PLR2004
+        and following in ('element', 'open')
+    ):
+        raise ValueError(f'Ambiguous dot in formula {formula}, use · or *')
+    return _to_number(text), i + 1
+
+
+def _add_counts(target, source, factor):
+    for element, count in source.items():
+        target[element] = target.get(element, 0) + count * factor
+
+
+def parse_chemical_formula(formula):
+    """
+    Splits a formula in two lists, elements in order of appearance and their counts.
+
+    Groups in brackets are multiplied as counts through a stack, so `(C5H8O2)1000`
+    costs as much as `C5H8O2`. Adducts are separated by `·`, `*` or a dot not between
+    digits and can have a leading coefficient, e.g. `CuSO4·5H2O`. Counts can be
+    fractional, e.g. `Al0.3Ga0.7As`, and are returned as int whenever they are whole
+    numbers. A dot that could be both is rejected, e.g. `CaSO4.0.5H2O` or `CuSO4.5H2O`.
+    """
+    tokens = [
+        (match.lastgroup, match.group()) for match in _FORMULA_TOKEN.finditer(formula)
+    ]
+    composition = {}
+    stack = [{}]
+    coefficient = 1
+    adduct_start = True
+    i = 0
+    while i < len(tokens):
+        kind, text = tokens[i]
+        i += 1
+        if kind == 'number':
+            # Numbers not following an element or a group are adduct coefficients
+            if adduct_start:
+                coefficient = _to_number(text)
+                adduct_start = False
+            continue
+        adduct_start = False
+        if kind == 'ambiguous':
+            raise ValueError(f'Ambiguous dot in formula {formula}, use · or *')
+        if kind == 'separator':
+            if len(stack) > 1:
+                raise ValueError(f'Unbalanced brackets in formula {formula}')
+            _add_counts(composition, stack[0], coefficient)
+            stack = [{}]
+            coefficient = 1
+            adduct_start = True
+            continue
+        if kind == 'open':
+            stack.append({})
+            continue
+        count, i = _read_count(tokens, i, formula)
+        if kind == 'element':
+            stack[-1][text] = stack[-1].get(text, 0) + count
+        else:
+            if len(stack) == 1:
+                raise ValueError(f'Unbalanced brackets in formula {formula}')
+            group = stack.pop()
+            _add_counts(stack[-1], group, count)
+    if len(stack) > 1:
+        raise ValueError(f'Unbalanced brackets in formula {formula}')
+    _add_counts(composition, stack[0], coefficient)
+
+    elements = list(composition.keys())
+    counts = [
+        int(count) if isinstance(count, float) and count.is_integer() else count
+        for count in composition.values()
+    ]
+
+    return elements, counts
+
+
+def normalize_formula(formula):
+    """
+    Key used by the cache: whitespace is dropped and the middle dot is unified.
+    """
+    return ''.join(formula.split()).replace('·', '*')
+
+
+@lru_cache(maxsize=COMPOSITION_CACHE_SIZE)
+def _cached_composition(formula):
+    elements, counts = parse_chemical_formula(formula)
+    total = sum(counts)
+    if total == 0:
+        return CompositionRecord(formula, (), (), (), ())
+    masses = [am[an[el]] * cou for el, cou in zip(elements, counts)]
+    mass = sum(masses)
+    return CompositionRecord(
+        formula=formula,
+        elements=tuple(elements),
+        counts=tuple(counts),
+        atomic_fractions=tuple(cou / total for cou in counts),
+        mass_fractions=tuple(m / mass for m in masses),
+    )
+
+
+def composition_of(formula):
+    """
+    Returns the cached `CompositionRecord` of a chemical formula.
+    """
+    return _cached_composition(normalize_formula(formula))
+
+
+def composition_cache_info():
+    """
+    Hits, misses and size of the composition cache (see `functools.lru_cache`).
+    """
+    return _cached_composition.cache_info()
+
+
+def clear_composition_cache():
+    _cached_composition.cache_clear()
+
+
+def batch_elementality(formulas):
+    """
+    Computes the compositions of many formulas in a single vectorized pass.
+
+    Every distinct formula is parsed once (through the cache), then fractions and
+    molar masses (g/mol) are evaluated on the whole count matrix at once.
+    """
+    formulas = tuple(normalize_formula(formula) for formula in formulas)
+    unique, inverse = np.unique(np.asarray(formulas, dtype=str), return_inverse=True)
+    unique_counts = np.zeros((len(unique), NUMBER_OF_ELEMENTS), dtype=np.float64)
+    for row, formula in enumerate(unique):
+        record = _cached_composition(str(formula))
+        columns = [an[element] - 1 for element in record.elements]
+        unique_counts[row, columns] = record.counts
+    counts = unique_counts[inverse.reshape(-1)]
+
+    totals = counts.sum(axis=1, keepdims=True)
+    atomic_fractions = np.divide(
+        counts, totals, out=np.zeros_like(counts), where=totals != 0
+    )
+    masses = counts * ATOMIC_MASSES
+    molar_masses = masses.sum(axis=1)
+    mass_fractions = np.divide(
+        masses,
+        molar_masses[:, None],
+        out=np.zeros_like(masses),
+        where=molar_masses[:, None] != 0,
+    )
+
+    return BatchComposition(
+        formulas=formulas,
+        counts=counts,
+        atomic_fractions=atomic_fractions,
+        mass_fractions=mass_fractions,
+        molar_masses=molar_masses,
+    )
+
+
+def resolve_chemical_name(formula):
+    """
+    Formula of a chemical given by one of its `CHEMICAL_SYNONYMS` names.
+    """
+    return CHEMICAL_SYNONYMS.get(' '.join(formula.lower().split()), formula)
@@ -16,6 +16,7 @@
 # limitations under the License.
 #
 
+from datetime import datetime, timezone
 from typing import (
     TYPE_CHECKING,
 )
@@ -30,6 +31,7 @@ from nomad.datamodel.metainfo.basesections import (
     Entity,
 )
 from nomad.datamodel.metainfo.eln import Chemical, Instrument
+from nomad.datamodel.metainfo.plot import PlotlyFigure, PlotSection
 from nomad.datamodel.metainfo.workflow import Link
 from nomad.metainfo import (
     Datetime,
@@ -39,8 +41,13 @@ from nomad.metainfo import (
     Section,
     SubSection,
 )
+from schema_packages.history import record_history
 from schema_packages.Items import Item, ItemsPermitted
-from schema_packages.utils import parse_chemical_formula
+from schema_packages.lineage import StepVisit, index_entry, split_ids
+from schema_packages.plotting import gantt_figure
+from schema_packages.references import resolve_references
+from schema_packages.timeline import as_seconds, step_timeline, step_times
+from schema_packages.utils import CompositionSection
 
 if TYPE_CHECKING:
     from nomad.datamodel.datamodel import (
@@ -447,6 +454,22 @@ class Equipment(Instrument, EntryData, ArchiveSection):
         repeats=True,
     )
 
+    def history_records(self):
+        """
+        Records (item, step_type, start, equipment) of the items of every job in
+        the log book, indexed by `schema_packages.history`.
+        """
+        equipment = self.lab_id or self.name or ''
+        return [
+            (item, job.name or 'Jobdone', as_seconds(job.starting_date), equipment)
+            for job in self.equipmentLogBook
+            for item in split_ids(job.id_items_processed)
+        ]
+
+    def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
+        super().normalize(archive, logger)
+        record_history(archive, self)
+
 
 class EquipmentReference(Link, ArchiveSection):
     m_def = Section()
@@ -659,7 +682,30 @@ class FabricationProcessStep(FabricationProcessStepBase, EntryData):
         section_def=User, description='List of users involved in the step', repeats=True
     )
 
+    def lineage(self, entry):
+        """
+        Links (parent, child) between items and visits (item, step) of the items
+        processed, indexed by `schema_packages.lineage`.
+        """
+        visit = StepVisit(entry, self.m_def.name, self.name or '')
+        return [], [(item, visit) for item in split_ids(self.id_item_processed)]
+
+    def history_records(self):
+        """
+        Records (item, step_type, start, equipment) of the items processed, indexed
+        by `schema_packages.history`.
+        """
+        names = (instrument.id or instrument.name for instrument in self.instruments)
+        equipment = ', '.join(name for name in names if name)
+        start = as_seconds(self.starting_date)
+        return [
+            (item, self.m_def.name, start, equipment)
+            for item in split_ids(self.id_item_processed)
+        ]
+
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
+        index_entry(archive, self, logger)
+        record_history(archive, self)
         if self.instruments.section is not None:
             super().normalize(archive, logger)
 
@@ -672,7 +718,7 @@ class FabricationOutput(ArchiveSection):
     )
 
 
-class FabricationProcess(EntryData, ArchiveSection):
+class FabricationProcess(PlotSection, EntryData, ArchiveSection):
     m_def = Section(
         description="""
         For fabrication process is intended a series of steps within which an item is
@@ -784,6 +830,55 @@ class FabricationProcess(EntryData, ArchiveSection):
         """,
         a_eln={'component': 'ReferenceEditQuantity'},
     )
+    cycle_time = Quantity(
+        type=np.float64,
+        description='Time from the start of the first step to the end of the last one',
+        a_eln={'defaultDisplayUnit': 'minute'},
+        unit='sec',
+    )
+    touch_time = Quantity(
+        type=np.float64,
+        description='Time spent in the steps, measured durations if available',
+        a_eln={'defaultDisplayUnit': 'minute'},
+        unit='sec',
+    )
+    idle_time = Quantity(
+        type=np.float64,
+        description='Time spent waiting between the steps',
+        a_eln={'defaultDisplayUnit': 'minute'},
+        unit='sec',
+    )
+    step_start_time = Quantity(
+        type=np.float64,
+        shape=['*'],
+        description='Start of every step from the start of the first one',
+        a_eln={'defaultDisplayUnit': 'minute'},
+        unit='sec',
+    )
+    step_end_time = Quantity(
+        type=np.float64,
+        shape=['*'],
+        description='End of every step from the start of the first one',
+        a_eln={'defaultDisplayUnit': 'minute'},
+        unit='sec',
+    )
+    step_wait_time = Quantity(
+        type=np.float64,
+        shape=['*'],
+        description="""
+        Time every step waited after the end of the steps started before it
+        """,
+        a_eln={'defaultDisplayUnit': 'minute'},
+        unit='sec',
+    )
+    derived_starting_date = Quantity(
+        type=Datetime,
+        description='Starting date last derived from the steps',
+    )
+    derived_ending_date = Quantity(
+        type=Datetime,
+        description='Ending date last derived from the steps',
+    )
 
     output = SubSection(
         section_def=FabricationOutput,
@@ -791,8 +886,72 @@ class FabricationProcess(EntryData, ArchiveSection):
         repeat=False,
     )
 
+    def resolved_steps(self, archive, logger=None):
+        """
+        Step sections referenced in `steps`, in order, None for the unresolved ones.
+        The entries of the steps are loaded in batch and cached for the normalization.
+        """
+        return resolve_references(archive, list(self.steps or []), logger)
 
-class StartingMaterial(Chemical, FabricationProcessStep, ArchiveSection):
+    def compute_timeline(self, steps):
+        """
+        Fills the cycle, touch and idle times and the timeline of the steps from their
+        dates and measured durations, and the dates of the process if not given.
+        """
+        if not steps:
+            self.derive_dates(None, None)
+            return
+        timeline = step_timeline(*step_times(steps))
+        origin = float(timeline.origin)
+        if np.isnan(origin):
+            self.derive_dates(None, None)
+            return
+        self.step_start_time = timeline.start
+        self.step_end_time = timeline.end
+        self.step_wait_time = timeline.wait
+        self.cycle_time = timeline.cycle_time
+        self.touch_time = timeline.touch_time
+        self.idle_time = timeline.idle_time
+        end = origin + timeline.cycle_time
+        self.derive_dates(
+            datetime.fromtimestamp(origin, timezone.utc),
+            datetime.fromtimestamp(end, timezone.utc) if np.isfinite(end) else None,
+        )
+
+        names = [
+            f'{index + 1}. {getattr(step, "name", None) or "Unresolved"}'
+            for index, step in enumerate(steps)
+        ]
+        figure = gantt_figure(
+            names,
+            timeline.start / 60,
+            timeline.end / 60,
+            timeline.wait / 60,
+            'Process timeline',
+        )
+        self.figures = [PlotlyFigure(label='Timeline', figure=figure, index=0)]
+
+    def derive_dates(self, start, end):
+        """
+        Sets the dates of the process to the ones derived from the steps, None if
+        unknown, if they are not given or were derived before and not edited since.
+        """
+        for name, value in (('starting_date', start), ('ending_date', end)):
+            current = getattr(self, name)
+            derived = f'derived_{name}'
+            if current is not None and current != getattr(self, derived):
+                # Given or edited by the user
+                setattr(self, derived, None)
+                continue
+            setattr(self, name, value)
+            setattr(self, derived, value)
+
+    def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
+        super().normalize(archive, logger)
+        self.compute_timeline(self.resolved_steps(archive, logger))
+
+
+class StartingMaterial(Chemical, FabricationProcessStep, CompositionSection):
     m_def = Section(
         a_eln={
             'hide': [
@@ -881,24 +1040,7 @@ class StartingMaterial(Chemical, FabricationProcessStep, ArchiveSection):
 
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         super().normalize(archive, logger)
-        if self.chemical_formula:
-            elements, counts = parse_chemical_formula(self.chemical_formula)
-            total = 0
-            for token in counts:
-                total += int(token)
-            if total != 0:
-                elemental_fraction = np.array(counts) / total
-                elementality = []
-                i = 0
-                for entry in elements:
-                    elemental_try = ElementalComposition()
-                    elemental_try.element = entry
-                    elemental_try.atomic_fraction = elemental_fraction[i]
-                    i += 1
-                    elementality.append(elemental_try)
-            else:
-                print('No elements provided')
-            self.elemental_composition = elementality
+        self.update_elemental_composition(self.chemical_formula, logger=logger)
 
 
 class ItemParenting(Entity, EntryData, ArchiveSection):
@@ -928,6 +1070,28 @@ class ItemParenting(Entity, EntryData, ArchiveSection):
         repeats=True,
     )
 
+    def lineage(self, entry):
+        """
+        Every output item is a child of every input, steps visit the items they
+        processed.
+        """
+        parents = [
+            parent
+            for material in self.inputs
+            for parent in split_ids(material.id_item_processed or material.lab_id)
+        ]
+        links, visits = [], []
+        for item in self.outputs:
+            links += item.lineage(entry)[0]
+            links += [(parent, item.lab_id) for parent in parents]
+        for step in self.parenting_steps:
+            visits += step.lineage(entry)[1]
+        return links, visits
+
+    def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
+        super().normalize(archive, logger)
+        index_entry(archive, self, logger)
+
 
 class ItemParentingLink(Link, ArchiveSection):
     m_def = Section()
@@ -0,0 +1,62 @@
+#######################################################################################
+#   Outlines of the shapes of chucks, carriers and items. Every shape is computed once #
+#  on a unit size, cached and only scaled when used, so that normalizing many item    #
+#                  placements never evaluates trigonometric functions again.          #
+#######################################################################################
+from functools import lru_cache
+
+import numpy as np
+
+OUTLINE_KINDS = ('circle', 'square', 'rectangle', 'flat', 'notch')
+
+# Points of the arc of circular outlines
+OUTLINE_SAMPLES = 100
+
+# Ratios of flats and notches to the radius are rounded to this number of digits, so
+# that the cache of outlines stays small
+RATIO_DIGITS = 6
+
+
+@lru_cache(maxsize=128)
+def _unit_outline(kind, ratio):
+    if kind == 'circle':
+        theta = np.linspace(0, 2 * np.pi, OUTLINE_SAMPLES)
+        outline = np.stack([np.cos(theta), np.sin(theta)])
+    elif kind in ('square', 'rectangle'):
+        outline = 0.5 * np.array([[-1, 1, 1, -1, -1], [-1, -1, 1, 1, -1]], dtype=float)
+    elif kind in ('flat', 'notch'):
+        # The arc is cut at the bottom, a flat joins its ends with a straight line and
+        # a notch with a 90 degrees V of depth `ratio` centered on the bottom
+        half_width = ratio / 2 if kind == 'flat' else ratio
+        cut = np.arcsin(min(half_width, 1.0))
+        theta = np.linspace(-np.pi / 2 + cut, 3 * np.pi / 2 - cut, OUTLINE_SAMPLES)
+        x, y = np.cos(theta), np.sin(theta)
+        if kind == 'notch':
+            x, y = np.append(x, 0.0), np.append(y, ratio - 1)
+        outline = np.stack([np.append(x, x[0]), np.append(y, y[0])])
+    else:
+        raise ValueError(f'Unknown outline {kind}, expected one of {OUTLINE_KINDS}')
+    outline.setflags(write=False)
+    return outline
+
+
+def unit_outline(kind, ratio=None):
+    """
+    Cached, read-only 2 x N array with the closed outline of a shape of unit size
+    centered in the origin: radius 1 for circles, side 1 for squares and rectangles.
+
+    `ratio` is the length of the flat, or the depth of the notch, over the radius.
+    """
+    if ratio is not None:
+        ratio = round(float(ratio), RATIO_DIGITS)
+    return _unit_outline(kind, ratio)
+
+
+def outline(kind, width, height=None, ratio=None):
+    """
+    Outline of a shape scaled to `width` (radius or side) and `height`, the same as the
+    width if not given, as two x, y arrays.
+    """
+    scale = np.array([[width], [width if height is None else height]], dtype=float)
+    x, y = unit_outline(kind, ratio) * scale
+    return x, y
@@ -0,0 +1,266 @@
+#######################################################################################
+#   Persistent index of the steps processing every item, for wafer travelers. Steps   #
+#    are appended to a log as their entries are normalized and compacted in a table   #
+#   sorted by item and start, memory mapped and searched by bisection, so the steps   #
+#             of an item are found without reading the whole lab history.             #
+#######################################################################################
+import json
+import os
+from typing import NamedTuple
+
+import numpy as np
+from schema_packages.lineage import entry_key, locked
+
+# If set, the steps of every normalized entry are indexed in this directory
+HISTORY_DIR_ENV = 'FABRICATION_UTILITIES_HISTORY_DIR'
+
+# Size in bytes of the log beyond which it is merged in the sorted table
+COMPACT_SIZE = 4_000_000
+
+TABLE_FILE = 'history.npy'
+LOG_FILE = 'history.jsonl'
+
+
+class HistoryRecord(NamedTuple):
+    """
+    A step processing an item: entry and section of the step, start in seconds since
+    the epoch (NaN if unknown) and equipment used.
+    """
+
+    item: str
+    entry: str
+    step_type: str
+    start: float
+    equipment: str
+
+
+def table_dtype(widths):
+    # Text is stored as utf-8 bytes as wide as the longest value of every field
+    return np.dtype(
+        [
+            (name, np.float64) if name == 'start' else (name, f'S{widths[name]}')
+            for name in HistoryRecord._fields
+        ]
+    )
+
+
+def records_table(records):
+    """
+    Structured array of `HistoryRecord`, text fields encoded as utf-8.
+    """
+    rows = [
+        tuple(value if name == 'start' else value.encode() for name, value in pairs)
+        for pairs in (zip(HistoryRecord._fields, record) for record in records)
+    ]
+    widths = {
+        name: max((len(row[index]) for row in rows), default=1) or 1
+        for index, name in enumerate(HistoryRecord._fields)
+        if name != 'start'
+    }
+    return np.array(rows, dtype=table_dtype(widths))
+
+
+def merge_tables(tables):
+    """
+    Rows of the tables in a single table sorted by item and start.
+    """
+    widths = {
+        name: max(table.dtype[name].itemsize for table in tables)
+        for name in HistoryRecord._fields
+        if name != 'start'
+    }
+    dtype = table_dtype(widths)
+    merged = np.concatenate([table.astype(dtype) for table in tables])
+    return merged[np.lexsort((merged['start'], merged['item']))]
+
+
+def table_records(rows):
+    return [
+        HistoryRecord(
+            item=row['item'].decode(),
+            entry=row['entry'].decode(),
+            step_type=row['step_type'].decode(),
+            start=float(row['start']),
+            equipment=row['equipment'].decode(),
+        )
+        for row in rows
+    ]
+
+
+class HistoryStore:
+    """
+    Steps by item stored in a directory as a sorted table and a log of the entries
+    normalized since the last compaction.
+
+    Indexing an entry again replaces its records: records of the log take precedence
+    over the ones of the table for the same entry. The log is merged in the table
+    once it grows beyond `compact_size` bytes. The log is kept in memory indexed by
+    item and only the lines appended since the last lookup are read.
+    """
+
+    def __init__(self, directory, compact_size=COMPACT_SIZE):
+        self.directory = directory
+        self.compact_size = compact_size
+        self.table_path = os.path.join(directory, TABLE_FILE)
+        self.log_path = os.path.join(directory, LOG_FILE)
+        # Log being merged by a compaction, still read by lookups
+        self.merging_path = f'{self.log_path}.merging'
+        # Held by writers, so that no record is appended to a log being merged, and
+        # shared by readers, so that no log disappears while it is read
+        self.lock_path = f'{self.log_path}.lock'
+        self._entries = {}
+        self._items = {}
+        self._files = None
+        self._offset = 0
+
+    def add(self, entry, records):
+        """
+        Replaces the records of an entry, given as (item, step_type, start,
+        equipment).
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        line = json.dumps({'entry': entry, 'records': [list(r) for r in records]})
+        with locked(self.lock_path), open(self.log_path, 'a') as file:
+            file.write(line + '\n')
+            size = file.tell()
+        if size > self.compact_size:
+            self.compact()
+
+    def logged(self):
+        """
+        Records of the entries in the log by entry, the last ones of every entry.
+        Updated with the lines appended since the last call, to be called with the
+        lock held.
+        """
+        # Inodes are reused, a compaction is recognized by the table it replaced
+        table = os.stat(self.table_path) if os.path.exists(self.table_path) else None
+        files = (
+            table and (table.st_ino, table.st_mtime_ns),
+            file_inode(self.merging_path),
+            file_inode(self.log_path),
+        )
+        size = os.path.getsize(self.log_path) if files[2] is not None else 0
+        # Logs replaced by a compaction are read again from the start
+        if files != self._files or size < self._offset:
+            self._entries, self._items = {}, {}
+            self._files, self._offset = files, 0
+            if files[1] is not None:
+                self._read(self.merging_path, 0)
+        if files[2] is not None:
+            self._offset = self._read(self.log_path, self._offset)
+        return self._entries
+
+    def _read(self, path, offset):
+        with open(path, 'rb') as file:
+            file.seek(offset)
+            for line in file:
+                if not line.endswith(b'\n'):
+                    break
+                offset += len(line)
+                self._apply(json.loads(line))
+        return offset
+
+    def _apply(self, logged):
+        entry = logged['entry']
+        for record in self._entries.get(entry, []):
+            by_entry = self._items[record.item]
+            by_entry.pop(entry, None)
+            if not by_entry:
+                del self._items[record.item]
+        records = [
+            HistoryRecord(item, entry, step_type, float(start), equipment)
+            for item, step_type, start, equipment in logged['records']
+        ]
+        self._entries[entry] = records
+        for record in records:
+            self._items.setdefault(record.item, {}).setdefault(entry, []).append(record)
+
+    def table(self):
+        if not os.path.exists(self.table_path):
+            return None
+        return np.load(self.table_path, mmap_mode='r')
+
+    def compact(self):
+        """
+        Merges the log in the sorted table. Compactions are serialized by the lock
+        of the log, entries normalized meanwhile wait for it.
+        """
+        with locked(self.lock_path):
+            # The log of an interrupted compaction is merged before the current one
+            if not os.path.exists(self.merging_path):
+                try:
+                    os.rename(self.log_path, self.merging_path)
+                except FileNotFoundError:
+                    return
+            self._merge()
+
+    def _merge(self):
+        logged = self.logged()
+        records = [record for values in logged.values() for record in values]
+        tables = [records_table(records)]
+        table = self.table()
+        if table is not None:
+            replaced = np.array([entry.encode() for entry in logged], dtype=bytes)
+            tables.append(table[~np.isin(table['entry'], replaced)])
+        temporary = f'{self.table_path}.{os.getpid()}.npy'
+        np.save(temporary, merge_tables(tables))
+        os.replace(temporary, self.table_path)
+        os.remove(self.merging_path)
+
+    def traveler(self, item):
+        """
+        `HistoryRecord` of the steps that processed an item, in chronological order
+        and the ones without start last.
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        with locked(self.lock_path, shared=True):
+            logged = self.logged()
+            records = [
+                record
+                for values in self._items.get(item, {}).values()
+                for record in values
+            ]
+            table = self.table()
+        key = item.encode()
+        if table is not None and len(key) <= table.dtype['item'].itemsize:
+            start = np.searchsorted(table['item'], key, side='left')
+            end = np.searchsorted(table['item'], key, side='right')
+            records += [
+                record
+                for record in table_records(table[start:end])
+                if record.entry not in logged
+            ]
+        records.sort(key=lambda record: (np.isnan(record.start), record.start))
+        return records
+
+
+def file_inode(path):
+    try:
+        return os.stat(path).st_ino
+    except FileNotFoundError:
+        return None
+
+
+# Stores opened by this process, by directory
+_STORES = {}
+
+
+def history_store(directory):
+    """
+    `HistoryStore` of a directory, shared by the lookups of this process.
+    """
+    if directory not in _STORES:
+        _STORES[directory] = HistoryStore(directory)
+    return _STORES[directory]
+
+
+def record_history(archive, section):
+    """
+    Stores the records returned by `history_records()` of `section`, if it is the
+    data section of the archive and a history directory is set.
+    """
+    directory = os.environ.get(HISTORY_DIR_ENV)
+    entry = entry_key(archive)
+    if directory and entry and getattr(archive, 'data', None) is section:
+        history_store(directory).add(entry, section.history_records())
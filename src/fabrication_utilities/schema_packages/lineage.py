@@ -0,0 +1,336 @@
+#######################################################################################
+#   Lineage graph of the items: which item was obtained from which (parenting, wafer  #
+#   parents, bonding, dicing) and which steps processed every item. The graph is an   #
+#   adjacency index updated entry by entry, so ancestors, descendants and histories   #
+#   are found in time proportional to the result and not to the whole lab. The index  #
+#        is persisted as a log shared by all the processes normalizing entries.       #
+#######################################################################################
+import fcntl
+import json
+import os
+import re
+from collections import deque
+from contextlib import contextmanager
+from typing import NamedTuple
+
+# Separators of the identifiers in free text fields listing more items
+ID_SEPARATORS = re.compile(r'[,;\n]')
+
+# If set, the lineage of every normalized entry is stored in this directory
+LINEAGE_DIR_ENV = 'FABRICATION_UTILITIES_LINEAGE_DIR'
+
+LINEAGE_FILE = 'lineage.jsonl'
+
+# The log is rewritten when it has this many times more lines than entries
+COMPACT_RATIO = 4
+
+# Smallest log that is compacted, in lines
+COMPACT_LINES = 1000
+
+
+class StepVisit(NamedTuple):
+    """
+    A step processing an item: the entry describing it, its section and its name.
+    """
+
+    entry: str
+    step_type: str
+    name: str
+
+
+def split_ids(values):
+    """
+    Identifiers in a free text field listing one or more items, or in a list, in
+    order and without repetitions.
+    """
+    if values is None:
+        return []
+    if isinstance(values, str):
+        values = ID_SEPARATORS.split(values)
+    ids = (str(value).strip() for value in values if value is not None)
+    return [value for value in dict.fromkeys(ids) if value]
+
+
+def count(index, key, value, step):
+    # Links and visits are counted by the entries declaring them
+    counts = index.setdefault(key, {})
+    counts[value] = counts.get(value, 0) + step
+    if counts[value] <= 0:
+        del counts[value]
+        if not counts:
+            del index[key]
+
+
+class LineageIndex:
+    """
+    Links between parent and child items and steps visiting every item, by entry.
+
+    Every entry contributes the links and visits declared by its data section;
+    updating an entry replaces its previous contribution, so entries can be indexed
+    again as they are normalized in any order.
+    """
+
+    def __init__(self):
+        self._children = {}
+        self._parents = {}
+        self._visits = {}
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def entries(self):
+        """
+        Links and visits of every entry, by entry.
+        """
+        return dict(self._entries)
+
+    def _apply(self, links, visits, step):
+        for parent, child in links:
+            count(self._children, parent, child, step)
+            count(self._parents, child, parent, step)
+        for item, visit in visits:
+            count(self._visits, item, visit, step)
+
+    def remove(self, entry):
+        links, visits = self._entries.pop(entry, ((), ()))
+        self._apply(links, visits, -1)
+
+    def update(self, entry, links=(), visits=()):
+        """
+        Replaces the links (parent, child) and visits (item, `StepVisit`) of an
+        entry, an entry without any is removed. Returns the links closing a cycle in
+        the lineage.
+        """
+        self.remove(entry)
+        links = [link for link in dict.fromkeys(links) if all(link)]
+        visits = [visit for visit in dict.fromkeys(visits) if visit[0]]
+        cycles = []
+        for parent, child in links:
+            if parent == child or parent in self.descendants(child):
+                cycles.append((parent, child))
+            self._apply([(parent, child)], (), 1)
+        self._apply((), visits, 1)
+        if links or visits:
+            self._entries[entry] = (links, visits)
+        return cycles
+
+    @staticmethod
+    def _reachable(item, adjacency):
+        # Breadth first, closest items first, cycles are walked once
+        seen = {item: None}
+        queue = deque([item])
+        while queue:
+            for neighbor in adjacency.get(queue.popleft(), ()):
+                if neighbor not in seen:
+                    seen[neighbor] = None
+                    queue.append(neighbor)
+        return [neighbor for neighbor in seen if neighbor != item]
+
+    def parents(self, item):
+        return list(self._parents.get(item, ()))
+
+    def children(self, item):
+        return list(self._children.get(item, ()))
+
+    def ancestors(self, item):
+        return self._reachable(item, self._parents)
+
+    def descendants(self, item):
+        return self._reachable(item, self._children)
+
+    def visits(self, item):
+        return list(self._visits.get(item, ()))
+
+    def history(self, item):
+        """
+        Steps that processed an item or any of its ancestors, the ones of the item
+        first and then by distance from it.
+        """
+        return [
+            visit
+            for node in [item, *self.ancestors(item)]
+            for visit in self._visits.get(node, ())
+        ]
+
+    def find_cycle(self):
+        """
+        Items forming a cycle of the lineage, the first one repeated at the end, or
+        None if the lineage is acyclic.
+        """
+        state = {}
+        for root in list(self._children):
+            if root in state:
+                continue
+            path = [root]
+            state[root] = 'open'
+            stack = [iter(self._children.get(root, ()))]
+            while stack:
+                child = next(stack[-1], None)
+                if child is None:
+                    stack.pop()
+                    state[path.pop()] = 'done'
+                elif state.get(child) == 'open':
+                    return path[path.index(child) :] + [child]
+                elif child not in state:
+                    state[child] = 'open'
+                    path.append(child)
+                    stack.append(iter(self._children.get(child, ())))
+        return None
+
+    def clear(self):
+        for index in (self._children, self._parents, self._visits, self._entries):
+            index.clear()
+
+
+@contextmanager
+def locked(path, shared=False):
+    """
+    Lock among all the processes of the host, held while in the context. A shared
+    lock is held by many readers at once, an exclusive one by a single writer.
+    """
+    with open(path, 'a') as file:
+        fcntl.flock(file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(file, fcntl.LOCK_UN)
+
+
+class LineageStore:
+    """
+    `LineageIndex` shared by the processes normalizing entries, persisted in a
+    directory as a log of the links and visits declared by every entry.
+
+    Every process keeps the index in memory and reads only the lines appended to the
+    log since its last read. Writes are serialized by a lock file; the log is
+    rewritten with the last lines of every entry when it holds more than
+    `compact_ratio` lines per entry. An entry whose last line has neither links nor
+    visits is removed, so re-parented or deleted entries leave no stale links.
+    """
+
+    def __init__(self, directory, compact_ratio=COMPACT_RATIO):
+        self.directory = directory
+        self.compact_ratio = compact_ratio
+        self.path = os.path.join(directory, LINEAGE_FILE)
+        self.lock_path = f'{self.path}.lock'
+        self.index = LineageIndex()
+        self._inode = None
+        self._offset = 0
+        self._lines = 0
+
+    def refresh(self):
+        """
+        The index, updated with the lines written by any process since the last read.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return self.index
+        # A compacted log is a new file and is read again from the start
+        if stat.st_ino != self._inode or stat.st_size < self._offset:
+            self.index.clear()
+            self._inode, self._offset, self._lines = stat.st_ino, 0, 0
+        with open(self.path, 'rb') as file:
+            file.seek(self._offset)
+            for line in file:
+                if not line.endswith(b'\n'):
+                    break
+                self._offset += len(line)
+                self._lines += 1
+                self._apply(json.loads(line))
+        return self.index
+
+    def _apply(self, logged):
+        links = [tuple(link) for link in logged['links']]
+        visits = [(item, StepVisit(*visit)) for item, visit in logged['visits']]
+        return self.index.update(logged['entry'], links, visits)
+
+    @staticmethod
+    def _line(entry, links, visits):
+        logged = {
+            'entry': entry,
+            'links': [list(link) for link in links],
+            'visits': [[item, list(visit)] for item, visit in visits],
+        }
+        return json.dumps(logged) + '\n'
+
+    def update(self, entry, links=(), visits=()):
+        """
+        Stores the links and visits of an entry, replacing its previous ones. Returns
+        the links closing a cycle in the lineage.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        with locked(self.lock_path):
+            self.refresh()
+            line = self._line(entry, links, visits)
+            with open(self.path, 'a') as file:
+                file.write(line)
+            self._inode = os.stat(self.path).st_ino
+            self._offset += len(line.encode())
+            self._lines += 1
+            cycles = self._apply(json.loads(line))
+            if self._lines > max(COMPACT_LINES, self.compact_ratio * len(self.index)):
+                self.compact()
+        return cycles
+
+    def remove(self, entry):
+        """
+        Forgets the links and visits of an entry, e.g. a deleted one. The line
+        written, without links nor visits, removes the entry in every process and is
+        dropped by the next compaction.
+        """
+        self.update(entry)
+
+    def compact(self):
+        # Called with the lock held, readers see either the old or the new log
+        lines = [
+            self._line(entry, links, visits)
+            for entry, (links, visits) in self.index.entries().items()
+        ]
+        temporary = f'{self.path}.{os.getpid()}'
+        with open(temporary, 'w') as file:
+            file.writelines(lines)
+        os.replace(temporary, self.path)
+        self._inode = os.stat(self.path).st_ino
+        self._offset = sum(len(line.encode()) for line in lines)
+        self._lines = len(lines)
+
+
+# Stores opened by this process, by directory
+_STORES = {}
+
+
+def lineage_store():
+    """
+    `LineageStore` of the directory set in the environment, None if not set.
+    """
+    directory = os.environ.get(LINEAGE_DIR_ENV)
+    if not directory:
+        return None
+    if directory not in _STORES:
+        _STORES[directory] = LineageStore(directory)
+    return _STORES[directory]
+
+
+def entry_key(archive):
+    """
+    Identifier of the entry of an archive: its entry id, or mainfile before upload.
+    None if the archive has neither.
+    """
+    metadata = getattr(archive, 'metadata', None)
+    return getattr(metadata, 'entry_id', None) or getattr(metadata, 'mainfile', None)
+
+
+def index_entry(archive, section, logger=None):
+    """
+    Stores in the `lineage_store()` the links and visits declared by `section`
+    through its `lineage(entry)` method, if it is the data section of the archive.
+    """
+    store = lineage_store()
+    entry = entry_key(archive)
+    if store is None or entry is None or getattr(archive, 'data', None) is not section:
+        return
+    cycles = store.update(entry, *section.lineage(entry))
+    if cycles and logger is not None:
+        logger.warning('The item lineage has a cycle', entry=entry, links=cycles)
@@ -0,0 +1,141 @@
+#######################################################################################
+#  Engine checking and generating the placement of many items on a chuck or in the   #
+#  slots of a carrier. Items are described as rounded rectangles, which covers both   #
+#  circles and axis aligned rectangles exactly, so every check is a NumPy expression  #
+#                          over all the items (or pairs) at once.                     #
+#######################################################################################
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+# Chuck outlines understood by `contained`, flats and notches are handled as circles
+# whose bottom is cut at `-cut` from the center
+CHUCK_KINDS = ('circle', 'square', 'rectangle', 'flat', 'notch')
+
+# Lengths closer than this are considered equal when checking contacts
+TOLERANCE = 1e-9
+
+
+class Chuck(NamedTuple):
+    """
+    Outline of a chuck: `width` and `height` are the radius of round chucks or the
+    sides of square and rectangular ones, `cut` the distance from the center of the
+    flat or of the notch vertex of wafer shaped chucks (None for full circles).
+    """
+
+    kind: str
+    width: float
+    height: float
+    cut: Optional[float] = None
+
+
+def as_extents(half_widths, half_heights, radii, count=None):
+    """
+    Half width, half height and rounding radius of every item as three arrays.
+
+    A circle has zero half sizes and its radius, a rectangle its half sizes and zero
+    radius. Scalars are broadcast to `count` items.
+    """
+    arrays = [
+        np.asarray(value, dtype=np.float64)
+        for value in (half_widths, half_heights, radii)
+    ]
+    shape = np.broadcast_shapes(*(array.shape for array in arrays))
+    if count is not None:
+        shape = np.broadcast_shapes(shape, (count,))
+    return tuple(np.broadcast_to(array, shape) for array in arrays)
+
+
+def contained(chuck, centers, extents):
+    """
+    Boolean array telling which items lie completely inside the chuck, a `Chuck` or
+    a tuple of its fields.
+    """
+    kind, width, height, cut = chuck
+    centers = np.asarray(centers, dtype=np.float64).reshape(-1, 2)
+    half_width, half_height, radius = as_extents(*extents, count=len(centers))
+    x, y = np.abs(centers[:, 0]), np.abs(centers[:, 1])
+    if kind in ('square', 'rectangle'):
+        return (x + half_width + radius <= width / 2 + TOLERANCE) & (
+            y + half_height + radius <= height / 2 + TOLERANCE
+        )
+    if kind not in CHUCK_KINDS:
+        raise ValueError(f'Unknown chuck {kind}, expected one of {CHUCK_KINDS}')
+    inside = np.hypot(x + half_width, y + half_height) + radius <= width + TOLERANCE
+    if cut is not None:
+        bottom = centers[:, 1] - half_height - radius
+        inside &= bottom >= -cut - TOLERANCE
+    return inside
+
+
+def overlaps(centers, extents):
+    """
+    Symmetric N x N boolean array telling which pairs of items overlap, touching
+    items do not overlap.
+    """
+    centers = np.asarray(centers, dtype=np.float64).reshape(-1, 2)
+    half_width, half_height, radius = as_extents(*extents, count=len(centers))
+    dx = np.abs(centers[:, None, 0] - centers[None, :, 0])
+    dy = np.abs(centers[:, None, 1] - centers[None, :, 1])
+    # The sum of two rounded rectangles is a rounded rectangle with the sums of sizes
+    reach_x = half_width[:, None] + half_width[None, :]
+    reach_y = half_height[:, None] + half_height[None, :]
+    reach = radius[:, None] + radius[None, :]
+    out_x, out_y = np.maximum(dx - reach_x, 0), np.maximum(dy - reach_y, 0)
+    overlapping = np.hypot(out_x, out_y) < reach - TOLERANCE
+    overlapping |= (dx < reach_x - TOLERANCE) & (dy < reach_y - TOLERANCE)
+    np.fill_diagonal(overlapping, False)
+    return overlapping
+
+
+def check_placement(chuck, centers, extents):
+    """
+    Indices of the items outside the chuck and pairs (i, j), i < j, of overlapping
+    items.
+    """
+    outside = np.flatnonzero(~contained(chuck, centers, extents))
+    pairs = np.argwhere(np.triu(overlaps(centers, extents)))
+    return outside, pairs
+
+
+def pack_items(chuck, extent, count=None, spacing=0.0):
+    """
+    Centers of up to `count` identical items packed on the chuck, as an M x 2 array.
+
+    Items are placed on a rectangular grid with pitch equal to their size plus the
+    spacing. The grid is tried with each of the four half pitch offsets and the one
+    holding more items is kept; when there is room for more than `count` items the
+    ones closest to the center of the chuck are chosen.
+    """
+    kind, width, height, _ = chuck
+    half_width, half_height, radius = (float(value) for value in extent)
+    pitch_x = 2 * (half_width + radius) + spacing
+    pitch_y = 2 * (half_height + radius) + spacing
+    if pitch_x <= 0 or pitch_y <= 0:
+        raise ValueError('Items must have a positive size')
+    span_x = width if kind in ('square', 'rectangle') else 2 * width
+    span_y = height if kind in ('square', 'rectangle') else 2 * width
+    steps_x = np.arange(-(span_x // (2 * pitch_x)) - 1, span_x // (2 * pitch_x) + 2)
+    steps_y = np.arange(-(span_y // (2 * pitch_y)) - 1, span_y // (2 * pitch_y) + 2)
+    grid_x, grid_y = np.meshgrid(steps_x * pitch_x, steps_y * pitch_y)
+    grid = np.stack([grid_x.ravel(), grid_y.ravel()], axis=1)
+
+    best = np.empty((0, 2))
+    for offset in ((0, 0), (0.5, 0), (0, 0.5), (0.5, 0.5)):
+        centers = grid + np.multiply(offset, (pitch_x, pitch_y))
+        centers = centers[contained(chuck, centers, extent)]
+        if len(centers) > len(best):
+            best = centers
+    order = np.lexsort((best[:, 0], best[:, 1], np.hypot(best[:, 0], best[:, 1])))
+    return best[order[:count]]
+
+
+def slot_conflicts(slots, positions):
+    """
+    Positions outside the 1..`slots` range of a carrier and positions occupied more
+    than once.
+    """
+    positions = np.asarray(positions, dtype=np.int64).ravel()
+    out_of_range = positions[(positions < 1) | (positions > slots)]
+    values, counts = np.unique(positions, return_counts=True)
+    return out_of_range, values[counts > 1]
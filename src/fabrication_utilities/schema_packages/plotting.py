@@ -0,0 +1,355 @@
+#######################################################################################
+# Helpers producing Plotly figures as plain JSON directly from NumPy arrays. Figures #
+#  in this plugin are simple line traces, so neither plotly.express (and pandas) nor #
+#                      plotly.graph_objects are needed to build them.                 #
+#######################################################################################
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+# Default color of the first trace in the plotly template
+LINE_COLOR = '#636efa'
+
+# Maximum number of points of a trace sent to the browser, archives keep every point
+DEFAULT_MAX_POINTS = 2000
+
+# Number of figures kept in memory by the figure cache
+FIGURE_CACHE_SIZE = 256
+
+# If set, generated figures are also stored as json files in this directory
+FIGURE_CACHE_DIR_ENV = 'FABRICATION_UTILITIES_FIGURE_CACHE_DIR'
+
+
+def as_array(values):
+    """
+    Magnitudes of a list, array or pint quantity as a float64 array.
+    """
+    return np.asarray(getattr(values, 'magnitude', values), dtype=np.float64)
+
+
+def json_values(values):
+    """
+    List of the values of an array with NaN replaced by None, which JSON supports.
+    """
+    values = as_array(values)
+    return np.where(np.isnan(values), None, values).tolist()
+
+
+def downsample_indices(values, max_points):
+    """
+    Sorted indices of at most `max_points` samples preserving the shape of a trace.
+
+    The trace is split in buckets of equal length and, beside the first and the last
+    sample, the minimum and the maximum of every bucket are kept, so that peaks are
+    never lost. Buckets are evaluated at once on a reshaped view of the array.
+    """
+    n = len(values)
+    if max_points is None or n <= max(max_points, 4):
+        return np.arange(n)
+    inner = values[1:-1]
+    buckets = max(1, (max_points - 2) // 2)
+    size = -(-len(inner) // buckets)
+    full = len(inner) // size
+    grid = inner[: full * size].reshape(full, size)
+    offsets = np.arange(full) * size + 1
+    kept = [[0, n - 1], offsets + grid.argmin(axis=1), offsets + grid.argmax(axis=1)]
+    rest = inner[full * size :]
+    if len(rest):
+        start = full * size + 1
+        kept.append([start + rest.argmin(), start + rest.argmax()])
+
+    return np.unique(np.concatenate(kept))
+
+
+def line_figure(
+    x, y, x_label, y_label, *, height=400, width=800, max_points=DEFAULT_MAX_POINTS
+):
+    """
+    JSON of a line figure with markers, equivalent to the one produced by `px.line`.
+
+    Traces longer than `max_points` are downsampled with `downsample_indices`, pass
+    None to plot every point.
+    """
+    y = as_array(y)
+    x = np.arange(len(y), dtype=np.float64) if x is None else as_array(x)
+    if x.shape != y.shape:
+        raise ValueError(f'Cannot plot {len(y)} values against {len(x)} points')
+    indices = downsample_indices(y, max_points)
+    if len(indices) < len(y):
+        x, y = x[indices], y[indices]
+
+    return {
+        'data': [
+            {
+                'type': 'scatter',
+                'mode': 'lines+markers',
+                'x': json_values(x),
+                'y': json_values(y),
+                'xaxis': 'x',
+                'yaxis': 'y',
+                'orientation': 'v',
+                'name': '',
+                'legendgroup': '',
+                'showlegend': False,
+                'line': {'color': LINE_COLOR, 'dash': 'solid'},
+                'marker': {'symbol': 'circle'},
+                'hovertemplate': f'{x_label}=%{{x}}<br>{y_label}=%{{y}}<extra></extra>',
+            }
+        ],
+        'layout': {
+            'xaxis': {'anchor': 'y', 'domain': [0.0, 1.0], 'title': {'text': x_label}},
+            'yaxis': {'anchor': 'x', 'domain': [0.0, 1.0], 'title': {'text': y_label}},
+            'legend': {'tracegroupgap': 0},
+            'margin': {'t': 60},
+            'height': height,
+            'width': width,
+        },
+    }
+
+
+def gapped(rows):
+    """
+    Rows of a 2D array joined in one list, separated by None to draw them as
+    disconnected lines of the same trace.
+    """
+    rows = np.asarray(rows, dtype=np.float64)
+    joined = np.hstack([rows, np.full((len(rows), 1), np.nan)]).ravel()
+    return json_values(joined)
+
+
+def outline_figure(
+    x, y, points, title, *, name='Chuck', items=None, height=800, width=800
+):
+    """
+    JSON of a static figure with a filled outline and markers on `points`, a list
+    of (x, y) pairs, equivalent to the one built before with plotly.graph_objects.
+
+    `items` are optional x and y M x K arrays with the outlines of M items, drawn
+    together as a single trace.
+    """
+    data = []
+    if x is not None:
+        data.append(
+            {
+                'type': 'scatter',
+                'mode': 'lines',
+                'x': json_values(x),
+                'y': json_values(y),
+                'fill': 'toself',
+                'name': name,
+            }
+        )
+    if items is not None:
+        data.append(
+            {
+                'type': 'scatter',
+                'mode': 'lines',
+                'x': gapped(items[0]),
+                'y': gapped(items[1]),
+                'line': {'color': LINE_COLOR},
+                'name': 'Items',
+            }
+        )
+    if len(points) == 1:
+        data.append(
+            {
+                'type': 'scatter',
+                'mode': 'markers',
+                'x': json_values([points[0][0]]),
+                'y': json_values([points[0][1]]),
+                'marker': {'size': 10, 'color': 'red'},
+                'name': 'Quadratino 1 centro',
+            }
+        )
+    elif len(points) > 1:
+        points = np.asarray(points, dtype=np.float64)
+        data.append(
+            {
+                'type': 'scatter',
+                'mode': 'markers',
+                'x': json_values(points[:, 0]),
+                'y': json_values(points[:, 1]),
+                'marker': {'size': 6, 'color': 'red'},
+                'name': 'Item centers',
+            }
+        )
+
+    return {
+        'data': data,
+        'layout': {'title': {'text': title}, 'height': height, 'width': width},
+        'config': {'staticPlot': True},
+    }
+
+
+def die_map_figure(outline, dies, title, *, height=800, width=800):
+    """
+    JSON of a static figure with the outline (x, y) of a wafer and the centers of its
+    full and partial dies, given as the `x`, `y` and `full` arrays of `dies`, as
+    square markers.
+    """
+    x, y = outline
+    die_x, die_y = as_array(dies.x), as_array(dies.y)
+    full = np.asarray(dies.full, dtype=bool)
+    data = [
+        {
+            'type': 'scatter',
+            'mode': 'lines',
+            'x': json_values(x),
+            'y': json_values(y),
+            'fill': 'toself',
+            'name': 'Wafer',
+        }
+    ]
+    for name, selected, color in (
+        ('Full dies', full, LINE_COLOR),
+        ('Partial dies', ~full, 'orange'),
+    ):
+        data.append(
+            {
+                'type': 'scattergl',
+                'mode': 'markers',
+                'x': json_values(die_x[selected]),
+                'y': json_values(die_y[selected]),
+                'marker': {'symbol': 'square', 'size': 4, 'color': color},
+                'name': name,
+            }
+        )
+
+    return {
+        'data': data,
+        'layout': {
+            'title': {'text': title},
+            'xaxis': {'title': {'text': 'x (mm)'}},
+            'yaxis': {'title': {'text': 'y (mm)'}, 'scaleanchor': 'x'},
+            'height': height,
+            'width': width,
+        },
+        'config': {'staticPlot': True},
+    }
+
+
+def gantt_figure(names, start, end, wait, title, *, height=600, width=1000):
+    """
+    JSON of a Gantt chart of steps running from `start` to `end`, in minutes, with
+    the wait before every step as a separate bar.
+    """
+    start, end, wait = as_array(start), as_array(end), as_array(wait)
+    names = [str(name) for name in names]
+    return {
+        'data': [
+            {
+                'type': 'bar',
+                'orientation': 'h',
+                'y': names,
+                'base': json_values(start - wait),
+                'x': json_values(wait),
+                'marker': {'color': 'lightgray'},
+                'name': 'Wait',
+            },
+            {
+                'type': 'bar',
+                'orientation': 'h',
+                'y': names,
+                'base': json_values(start),
+                'x': json_values(end - start),
+                'marker': {'color': LINE_COLOR},
+                'name': 'Step',
+            },
+        ],
+        'layout': {
+            'title': {'text': title},
+            'barmode': 'overlay',
+            'xaxis': {'title': {'text': 'Time (minute)'}},
+            'yaxis': {'autorange': 'reversed'},
+            'height': height,
+            'width': width,
+        },
+    }
+
+
+def figure_key(x, y, *labels):
+    """
+    Hash of the data (values and units) and of the labels used to build a figure.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for data in (x, y):
+        if data is not None:
+            digest.update(as_array(data).tobytes())
+        digest.update(str(getattr(data, 'units', '')).encode())
+        digest.update(b'\x00')
+    for label in labels:
+        digest.update(str(label).encode())
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+class FigureCache:
+    """
+    Figures by content key: a bounded in-memory LRU store, optionally backed by a
+    directory of json files shared by the reprocessing runs.
+    """
+
+    def __init__(self, max_size=FIGURE_CACHE_SIZE, directory=None):
+        self.max_size = max_size
+        self.directory = directory
+        self._figures = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.json')
+
+    def get(self, key):
+        figure = self._figures.get(key)
+        if figure is None and self.directory and os.path.exists(self._path(key)):
+            with open(self._path(key)) as file:
+                figure = json.load(file)
+            self._store(key, figure)
+        if figure is None:
+            self.misses += 1
+            return None
+        self._figures.move_to_end(key)
+        self.hits += 1
+        return figure
+
+    def put(self, key, figure):
+        self._store(key, figure)
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            temporary = f'{self._path(key)}.{os.getpid()}.tmp'
+            with open(temporary, 'w') as file:
+                json.dump(figure, file)
+            os.replace(temporary, self._path(key))
+
+    def _store(self, key, figure):
+        self._figures[key] = figure
+        self._figures.move_to_end(key)
+        while len(self._figures) > self.max_size:
+            self._figures.popitem(last=False)
+
+    def clear(self):
+        self._figures.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+FIGURE_CACHE = FigureCache(directory=os.environ.get(FIGURE_CACHE_DIR_ENV))
+
+
+def cached_line_figure(
+    x, y, x_label, y_label, *, max_points=DEFAULT_MAX_POINTS, key=None
+):
+    """
+    Same as `line_figure` but reusing the figure of identical data from the cache.
+    Returns the key of the figure together with the figure.
+    """
+    if key is None:
+        key = figure_key(x, y, x_label, y_label, max_points)
+    figure = FIGURE_CACHE.get(key)
+    if figure is None:
+        figure = line_figure(x, y, x_label, y_label, max_points=max_points)
+        FIGURE_CACHE.put(key, figure)
+    return key, figure
@@ -0,0 +1,172 @@
+#######################################################################################
+#   Opt-in profiler of the normalization of the sections of this plugin. When the     #
+#  environment variable below is set, the normalize of every section is wrapped to   #
+#  record calls, wall time and allocated memory by section class; the report is       #
+#   logged at the end of every entry and optionally dumped as json to a directory.    #
+#######################################################################################
+import json
+import os
+import time
+import tracemalloc
+from functools import wraps
+from importlib.metadata import PackageNotFoundError, version
+
+# Set to 1, true, yes or on to profile the normalization
+PROFILE_ENV = 'FABRICATION_UTILITIES_PROFILE'
+
+# If set, the report of every entry is also stored as a json file in this directory
+PROFILE_DIR_ENV = 'FABRICATION_UTILITIES_PROFILE_DIR'
+
+# Distribution whose version is written in the json reports
+DISTRIBUTION = 'Fabrication-utilities'
+
+
+def profiling_enabled():
+    return os.environ.get(PROFILE_ENV, '').lower() in ('1', 'true', 'yes', 'on')
+
+
+class NormalizationProfile:
+    """
+    Calls, wall time and memory allocated by the normalize of every section class.
+
+    Time and memory of a normalize exclude the ones of the normalize of other
+    sections called within it, so that nested sections are not counted twice.
+    """
+
+    def __init__(self):
+        self.sections = {}
+        self._stack = []
+
+    def start(self, section):
+        memory = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+        # Time and memory spent in nested sections, subtracted at the end
+        self._stack.append([section, time.perf_counter(), memory, 0.0, 0])
+
+    def stop(self):
+        section, started, memory, nested_time, nested_memory = self._stack.pop()
+        elapsed = time.perf_counter() - started
+        if tracemalloc.is_tracing():
+            allocated = tracemalloc.get_traced_memory()[0] - memory
+        else:
+            allocated = 0
+        if self._stack:
+            self._stack[-1][3] += elapsed
+            self._stack[-1][4] += allocated
+        stats = self.sections.setdefault(
+            type(section).__qualname__, {'calls': 0, 'time': 0.0, 'memory': 0}
+        )
+        stats['calls'] += 1
+        stats['time'] += elapsed - nested_time
+        stats['memory'] += allocated - nested_memory
+
+    def active(self, section):
+        return any(frame[0] is section for frame in self._stack)
+
+    def report(self):
+        """
+        Statistics by section class, sorted by decreasing time.
+        """
+        return [
+            {'section': name, **stats}
+            for name, stats in sorted(
+                self.sections.items(), key=lambda item: -item[1]['time']
+            )
+        ]
+
+    def reset(self):
+        self.sections.clear()
+
+
+PROFILE = NormalizationProfile()
+
+
+def plugin_version():
+    try:
+        return version(DISTRIBUTION)
+    except PackageNotFoundError:
+        return None
+
+
+def emit_report(archive, logger):
+    """
+    Logs the report of the entry and, if requested, dumps it as json.
+    """
+    report = PROFILE.report()
+    metadata = getattr(archive, 'metadata', None)
+    entry_id = getattr(metadata, 'entry_id', None)
+    logger.info(
+        'normalization profile',
+        entry_id=entry_id,
+        total_time=sum(stats['time'] for stats in report),
+        sections=report,
+    )
+    directory = os.environ.get(PROFILE_DIR_ENV)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        name = entry_id or f'entry-{os.getpid()}-{time.time_ns()}'
+        with open(os.path.join(directory, f'{name}.json'), 'w') as file:
+            json.dump(
+                {
+                    'entry_id': entry_id,
+                    'mainfile': getattr(metadata, 'mainfile', None),
+                    'version': plugin_version(),
+                    'sections': report,
+                },
+                file,
+                indent=2,
+            )
+    PROFILE.reset()
+
+
+def profiled_normalize(normalize):
+    """
+    Wraps a normalize to record it in `PROFILE`, the report is emitted when the
+    data section of the entry, normalized last, is done.
+    """
+
+    @wraps(normalize)
+    def wrapper(self, archive, logger):
+        # Calls through super() are part of the normalize already recorded
+        if not profiling_enabled() or PROFILE.active(self):
+            return normalize(self, archive, logger)
+        PROFILE.start(self)
+        try:
+            return normalize(self, archive, logger)
+        finally:
+            PROFILE.stop()
+            if getattr(archive, 'data', None) is self:
+                emit_report(archive, logger)
+
+    wrapper.__profiled__ = True
+    return wrapper
+
+
+def instrument(section_def, seen):
+    if section_def in seen:
+        return
+    seen.add(section_def)
+    section_cls = section_def.section_cls
+    if not section_cls.__module__.startswith('schema_packages'):
+        return
+    normalize = section_cls.__dict__.get('normalize')
+    if normalize is not None and not getattr(normalize, '__profiled__', False):
+        section_cls.normalize = profiled_normalize(normalize)
+    for base in section_def.base_sections:
+        instrument(base, seen)
+    for sub_section in section_def.all_sub_sections.values():
+        instrument(sub_section.section_def, seen)
+
+
+def profiled(m_package):
+    """
+    Instruments the sections of a package, and the ones of this plugin they inherit
+    from or contain, if profiling is enabled. Returns the package.
+    """
+    if not profiling_enabled():
+        return m_package
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    seen = set()
+    for section_def in m_package.section_definitions:
+        instrument(section_def, seen)
+    return m_package
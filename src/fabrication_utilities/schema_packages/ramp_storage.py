@@ -0,0 +1,104 @@
+#######################################################################################
+#  Compact representations of long ramps: uniform sampling stored as start and step, #
+#   values stored as integer differences at float32 resolution, or both arrays in a   #
+#          sidecar .npy file of the upload that is memory mapped when read.           #
+#######################################################################################
+import hashlib
+
+import numpy as np
+
+RAMP_STORAGE_MODES = ('full', 'uniform', 'delta', 'sidecar')
+
+# Samples between two anchors of the delta encoding, slices are decoded starting
+# from the anchor before them
+DELTA_BLOCK_SIZE = 4096
+
+# Resolution of the delta encoding relative to the largest value, as float32
+DELTA_RESOLUTION = 2.0**-24
+
+# Maximum deviation from a uniform sampling, relative to the step
+UNIFORM_TOLERANCE = 1e-6
+
+
+def uniform_sampling(time, tolerance=UNIFORM_TOLERANCE):
+    """
+    Start and step of a uniformly sampled time array, None if it is not uniform.
+    """
+    time = np.asarray(time, dtype=np.float64)
+    if len(time) < 2:  # noqa: PLR2004
+        return None
+    start, step = time[0], (time[-1] - time[0]) / (len(time) - 1)
+    if step <= 0:
+        return None
+    deviation = np.abs(time - (start + step * np.arange(len(time)))).max()
+    return (start, step) if deviation <= tolerance * step else None
+
+
+def uniform_time(start, step, length, first=0, last=None):
+    """
+    Samples `first:last` of a uniform time array of `length` samples.
+    """
+    first, last, _ = slice(first, last).indices(length)
+    return start + step * np.arange(first, last, dtype=np.float64)
+
+
+def delta_encode(values, block_size=DELTA_BLOCK_SIZE):
+    """
+    Quantum, anchors and differences of the values rounded to float32 resolution.
+
+    Values are stored as integer multiples of the quantum: the anchors are the first
+    value of every block and the differences between consecutive values, zero at the
+    beginning of every block, are small integers that take few bytes in the archive.
+    Differences are exact, so rounding errors never accumulate. Values must be
+    finite, a single NaN or infinity would make every decoded value NaN.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if not np.isfinite(values).all():
+        raise ValueError('Only finite values can be delta encoded')
+    largest = np.abs(values).max() if len(values) else 0.0
+    quantum = float(largest * DELTA_RESOLUTION) or 1.0
+    steps = np.rint(values / quantum).astype(np.int64)
+    deltas = np.diff(steps, prepend=steps[:1])
+    deltas[::block_size] = 0
+    return quantum, steps[::block_size].copy(), deltas
+
+
+def delta_decode(
+    quantum, anchors, deltas, first=0, last=None, *, block_size=DELTA_BLOCK_SIZE
+):
+    """
+    Values `first:last` of a delta encoded array, only the blocks containing the
+    requested samples are decoded.
+    """
+    first, last, _ = slice(first, last).indices(len(deltas))
+    if last <= first:
+        return np.empty(0)
+    block_first = first // block_size * block_size
+    sums = np.cumsum(deltas[block_first:last])
+    block = np.arange(block_first, last) // block_size
+    steps = anchors[block] + sums - sums[block * block_size - block_first]
+    return steps[first - block_first :] * quantum
+
+
+def sidecar_name(time, values):
+    """
+    Name, unique for the content, of the sidecar file of a ramp in the upload.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(time, dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    return f'ramp_{digest.hexdigest()}.npy'
+
+
+def write_sidecar(file, time, values):
+    """
+    Writes time and values as the two rows of a float64 array in npy format.
+    """
+    np.save(file, np.stack([time, values]).astype(np.float64, copy=False))
+
+
+def read_sidecar(path):
+    """
+    Memory mapped 2 x N array of a sidecar file, rows are read only when sliced.
+    """
+    return np.load(path, mmap_mode='r')
@@ -0,0 +1,76 @@
+#######################################################################################
+#  Engine generating the profiles of process parameters (temperature, pressure, gas   #
+# flows, rotation) from the start value, end value, duration, rate and behavior of a  #
+#   ramp. Many ramps are evaluated at once as rows of the same NumPy arrays.          #
+#######################################################################################
+import numpy as np
+
+RAMP_BEHAVIORS = ('linear', 'sigmoidal', 'exponential', 'step')
+
+# Number of points generated for a ramp when not specified
+DEFAULT_RAMP_SAMPLES = 101
+
+# Steepness of the sigmoidal and exponential profiles over the normalized duration
+SIGMOID_STEEPNESS = 10.0
+EXPONENTIAL_STEEPNESS = 5.0
+
+
+def behavior_code(behavior):
+    """
+    Index in `RAMP_BEHAVIORS` of a free text behavior, linear if not recognized.
+    """
+    text = (behavior or '').lower()
+    for code, keyword in ((1, 'sigm'), (2, 'exp'), (3, 'step')):
+        if keyword in text:
+            return code
+    return 0
+
+
+def ramp_shapes(samples):
+    """
+    Normalized profiles, from 0 to 1, of every behavior on `samples` points.
+    """
+    fraction = np.linspace(0.0, 1.0, samples)
+    sigmoid = 1 / (1 + np.exp(-SIGMOID_STEEPNESS * (fraction - 0.5)))
+    sigmoid = (sigmoid - sigmoid[0]) / (sigmoid[-1] - sigmoid[0])
+    exponential = (1 - np.exp(-EXPONENTIAL_STEEPNESS * fraction)) / (
+        1 - np.exp(-EXPONENTIAL_STEEPNESS)
+    )
+    # The set point is kept until the end of the duration and then changed at once
+    step = (fraction >= 1).astype(np.float64)
+    return fraction, np.stack([fraction, sigmoid, exponential, step])
+
+
+def complete_ramps(start, end, duration, rate):
+    """
+    Infers the missing (NaN) one of end value, duration and rate of every ramp.
+
+    With non linear behaviors the rate is intended as the average one.
+    """
+    start, end, duration, rate = np.broadcast_arrays(
+        *(np.asarray(array, dtype=np.float64) for array in (start, end, duration, rate))
+    )
+    with np.errstate(divide='ignore', invalid='ignore'):
+        end = np.where(np.isnan(end), start + rate * duration, end)
+        duration = np.where(np.isnan(duration), (end - start) / rate, duration)
+        rate = np.where(np.isnan(rate), (end - start) / duration, rate)
+    return end, duration, rate
+
+
+def synthesize_ramps(start, end, duration, behaviors, samples=DEFAULT_RAMP_SAMPLES):
+    """
+    Time and values of M ramps as two M x `samples` arrays.
+
+    `behaviors` are codes of `RAMP_BEHAVIORS` or free text behaviors.
+    """
+    start = np.asarray(start, dtype=np.float64).reshape(-1, 1)
+    end = np.asarray(end, dtype=np.float64).reshape(-1, 1)
+    duration = np.asarray(duration, dtype=np.float64).reshape(-1, 1)
+    codes = np.asarray(
+        [code if isinstance(code, int) else behavior_code(code) for code in behaviors],
+        dtype=np.intp,
+    )
+    fraction, shapes = ramp_shapes(samples)
+    time = duration * fraction
+    values = start + (end - start) * shapes[codes]
+    return time, values
@@ -0,0 +1,82 @@
+#######################################################################################
+#  Batch resolution of references to sections of other entries. The archives behind   #
+#    the references are collected first and every one of them is loaded once, in a    #
+#  single pass, instead of one lazy read per reference; sections resolved are cached  #
+#                          for the archive being normalized.                          #
+#######################################################################################
+from weakref import WeakKeyDictionary
+
+# Sections resolved by reference value, for every archive being normalized
+_RESOLVED = WeakKeyDictionary()
+
+
+def split_reference(value):
+    """
+    Archive url and fragment of a reference, the url is empty for references within
+    the same archive.
+    """
+    archive_url, _, fragment = str(value).partition('#')
+    return archive_url, fragment or '/'
+
+
+def load_archives(context, urls):
+    """
+    Root sections of the archives at `urls` by url, the ones that can not be loaded
+    are mapped to the exception raised.
+
+    Archives are loaded one after the other: the context and its archive cache are
+    shared by the whole normalization and are not known to be thread safe.
+    """
+    archives = {}
+    for url in dict.fromkeys(urls):
+        try:
+            archives[url] = context.resolve_archive_url(url)
+        except Exception as error:
+            archives[url] = error
+    return archives
+
+
+def resolve_references(archive, references, logger=None):
+    """
+    Sections referenced by `references` in order, None for the unresolved ones.
+
+    References already resolved are returned as they are. The others are resolved
+    against the context of `archive`, loading every archive they point to once, and
+    cached until `archive` is discarded.
+    """
+    cache = _RESOLVED.setdefault(archive, {})
+    values = [getattr(reference, 'm_proxy_value', None) for reference in references]
+    pending = {
+        value for value in values if value is not None and str(value) not in cache
+    }
+    urls = {split_reference(value)[0] for value in pending} - {''}
+    context = getattr(archive, 'm_context', None)
+    roots = {'': archive}
+    if urls and context is not None:
+        roots.update(load_archives(context, urls))
+
+    for value in pending:
+        url, fragment = split_reference(value)
+        root = roots.get(url)
+        try:
+            if isinstance(root, Exception):
+                raise root
+            if root is None:
+                raise ValueError(f'No context to load {url}')
+            cache[str(value)] = root.m_resolve(fragment)
+        except Exception as error:
+            cache[str(value)] = None
+            if logger is not None:
+                logger.warning(f'Could not resolve {value}', exc_info=error)
+
+    sections = []
+    for reference, value in zip(references, values):
+        if value is None:
+            sections.append(reference)
+            continue
+        section = cache[str(value)]
+        # Later lazy accesses through the reference do not load the archive again
+        if section is not None and vars(reference).get('m_proxy_resolved', 0) is None:
+            reference.m_proxy_resolved = section
+        sections.append(section)
+    return sections
@@ -0,0 +1,98 @@
+#######################################################################################
+#   Engine of the statistics of values measured on the sites of wafer maps, such as   #
+#   ellipsometer or profilometer maps of 49 or 121 points. Maps are the rows of NaN   #
+#   padded arrays, so statistics and radial fits of hundreds of wafers are evaluated  #
+#                          at once without Python loops.                              #
+#######################################################################################
+from typing import NamedTuple
+
+import numpy as np
+
+# Terms of the radial fits: value = c0 + c1 r^2 + c2 r^4
+RADIAL_TERMS = 3
+
+# Points of the radial profiles evaluated from the fits
+PROFILE_POINTS = 50
+
+
+class MapStatistics(NamedTuple):
+    """
+    Statistics of the sites of every map, NaN sites excluded. The non uniformity is
+    the half range over the mean, in percent.
+    """
+
+    mean: np.ndarray
+    std: np.ndarray
+    minimum: np.ndarray
+    maximum: np.ndarray
+    non_uniformity: np.ndarray
+
+
+def map_statistics(values):
+    """
+    `MapStatistics` of maps of shape (sites,) or (maps, sites).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    count = valid.sum(axis=-1)
+    filled = np.where(valid, values, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = filled.sum(axis=-1) / count
+        deviation = np.where(valid, values - mean[..., None], 0.0)
+        std = np.sqrt((deviation**2).sum(axis=-1) / count)
+        minimum = np.fmin.reduce(values, axis=-1)
+        maximum = np.fmax.reduce(values, axis=-1)
+        non_uniformity = (maximum - minimum) / (2 * mean) * 100
+    return MapStatistics(mean, std, minimum, maximum, non_uniformity)
+
+
+class RadialFit(NamedTuple):
+    """
+    Coefficients of value = sum(c_k (r / scale)^(2k)) fitted on every map, with the
+    radius of the outermost site as scale to keep the fit well conditioned.
+    """
+
+    coefficients: np.ndarray
+    scale: np.ndarray
+
+    def evaluate(self, radius):
+        """
+        Values of the fits at the radii, of shape (points,) or (maps, points).
+        """
+        scaled = np.asarray(radius, dtype=np.float64) / self.scale[..., None]
+        basis = radial_basis(scaled, self.coefficients.shape[-1])
+        return np.einsum('...pt,...t->...p', basis, self.coefficients)
+
+    def profile(self, points=PROFILE_POINTS):
+        """
+        Radii from the center to the outermost site and values of the fits there.
+        """
+        radius = self.scale[..., None] * np.linspace(0, 1, points)
+        return radius, self.evaluate(radius)
+
+
+def radial_basis(radius, terms):
+    return np.stack([radius ** (2 * term) for term in range(terms)], axis=-1)
+
+
+def radial_fit(x, y, values, terms=RADIAL_TERMS):
+    """
+    Least squares `RadialFit` of maps of values at sites of coordinates x and y.
+
+    Coordinates are broadcast against the values, so maps measured with the same
+    recipe share them. NaN sites are given no weight, the normal equations of all
+    the maps are solved together.
+    """
+    x, y, values = np.broadcast_arrays(
+        *(np.asarray(array, dtype=np.float64) for array in (x, y, values))
+    )
+    radius = np.hypot(x, y)
+    valid = ~np.isnan(values) & ~np.isnan(radius)
+    scale = np.fmax.reduce(np.where(valid, radius, np.nan), axis=-1)
+    scale = np.where(scale > 0, scale, 1.0)
+    basis = radial_basis(np.where(valid, radius, 0.0) / scale[..., None], terms)
+    basis = np.where(valid[..., None], basis, 0.0)
+    normal = np.einsum('...st,...su->...tu', basis, basis)
+    right = np.einsum('...st,...s->...t', basis, np.where(valid, values, 0.0))
+    coefficients = np.einsum('...tu,...u->...t', np.linalg.pinv(normal), right)
+    return RadialFit(coefficients, scale)
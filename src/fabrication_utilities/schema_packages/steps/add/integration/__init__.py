@@ -3,9 +3,10 @@ from nomad.config.models.plugins import SchemaPackageEntryPoint
 
 class BondingEntryPoint(SchemaPackageEntryPoint):
     def load(self):
+        from schema_packages.profiling import profiled
         from schema_packages.steps.add.integration.bonding import m_package
 
-        return m_package
+        return profiled(m_package)
 
 
 Bonding_entry_point = BondingEntryPoint(
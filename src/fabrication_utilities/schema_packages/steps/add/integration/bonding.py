@@ -8,6 +8,7 @@ from schema_packages.fabrication_utilities import (
     FabricationProcessStep,
     FabricationProcessStepBase,
 )
+from schema_packages.lineage import split_ids
 from schema_packages.steps.utils import BondingOutputs
 
 if TYPE_CHECKING:
@@ -116,5 +117,14 @@ class Bonding(FabricationProcessStep):
 
     outputs = SubSection(section_def=BondingOutputs, repeats=False)
 
+    def lineage(self, entry):
+        """
+        The bonded item is a child of every item processed.
+        """
+        links, visits = super().lineage(entry)
+        bonded = split_ids(self.outputs.wafer_bonded_id if self.outputs else None)
+        links += [(item, child) for item, _ in visits for child in bonded]
+        return links, visits
+
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         super().normalize(archive, logger)
@@ -3,9 +3,10 @@ from nomad.config.models.plugins import SchemaPackageEntryPoint
 
 class CVDsEntryPoint(SchemaPackageEntryPoint):
     def load(self):
+        from schema_packages.profiling import profiled
         from schema_packages.steps.add.synthesis.CVD import m_package
 
-        return m_package
+        return profiled(m_package)
 
 
 CVDs_entry_point = CVDsEntryPoint(
@@ -16,9 +17,10 @@ CVDs_entry_point = CVDsEntryPoint(
 
 class CoatingEntryPoint(SchemaPackageEntryPoint):
     def load(self):
+        from schema_packages.profiling import profiled
         from schema_packages.steps.add.synthesis.coating import m_package
 
-        return m_package
+        return profiled(m_package)
 
 
 Coating_entry_point = CoatingEntryPoint(
@@ -29,9 +31,10 @@ Coating_entry_point = CoatingEntryPoint(
 
 class ElectronGunEntryPoint(SchemaPackageEntryPoint):
     def load(self):
+        from schema_packages.profiling import profiled
         from schema_packages.steps.add.synthesis.electron_gun import m_package
 
-        return m_package
+        return profiled(m_package)
 
 
 ElectronGun_entry_point = ElectronGunEntryPoint(
@@ -42,9 +45,10 @@ ElectronGun_entry_point = ElectronGunEntryPoint(
 
 class SputteringEntryPoint(SchemaPackageEntryPoint):
     def load(self):
+        from schema_packages.profiling import profiled
         from schema_packages.steps.add.synthesis.sputtering import m_package
 
-        return m_package
+        return profiled(m_package)
 
 
 Sputtering_entry_point = SputteringEntryPoint(
@@ -55,9 +59,10 @@ Sputtering_entry_point = SputteringEntryPoint(
 
 class SOGEntryPoint(SchemaPackageEntryPoint):
     def load(self):
+        from schema_packages.profiling import profiled
         from schema_packages.steps.add.synthesis.sog import m_package
 
-        return m_package
+        return profiled(m_package)
 
 
 SOG_entry_point = SOGEntryPoint(
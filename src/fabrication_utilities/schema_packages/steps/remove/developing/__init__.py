@@ -3,9 +3,10 @@ from nomad.config.models.plugins import SchemaPackageEntryPoint
 
 class DevelopEntryPoint(SchemaPackageEntryPoint):
     def load(self):
+        from schema_packages.profiling import profiled
         from schema_packages.steps.remove.developing.development import m_package
 
-        return m_package
+        return profiled(m_package)
 
 
 develop_entry_point = DevelopEntryPoint(
@@ -3,9 +3,10 @@ from nomad.config.models.plugins import SchemaPackageEntryPoint
 
 class DryingEntryPoint(SchemaPackageEntryPoint):
     def load(self):
+        from schema_packages.profiling import profiled
         from schema_packages.steps.remove.drying.drying import m_package
 
-        return m_package
+        return profiled(m_package)
 
 
 drying_entry_point = DryingEntryPoint(
@@ -3,9 +3,10 @@ from nomad.config.models.plugins import SchemaPackageEntryPoint
 
 class DryEtchEntryPoint(SchemaPackageEntryPoint):
     def load(self):
+        from schema_packages.profiling import profiled
         from schema_packages.steps.remove.etching.dry_etching import m_package
 
-        return m_package
+        return profiled(m_package)
 
 
 dryetch_entry_point = DryEtchEntryPoint(
@@ -16,9 +17,10 @@ dryetch_entry_point = DryEtchEntryPoint(
 
 class WetEtchEntryPoint(SchemaPackageEntryPoint):
     def load(self):
+        from schema_packages.profiling import profiled
         from schema_packages.steps.remove.etching.wet_etching import m_package
 
-        return m_package
+        return profiled(m_package)
 
 
 wetetch_entry_point = WetEtchEntryPoint(
@@ -29,9 +31,10 @@ wetetch_entry_point = WetEtchEntryPoint(
 
 class StripEntryPoint(SchemaPackageEntryPoint):
     def load(self):
+        from schema_packages.profiling import profiled
         from schema_packages.steps.remove.etching.stripping import m_package
 
-        return m_package
+        return profiled(m_package)
 
 
 strip_entry_point = StripEntryPoint(
@@ -19,7 +19,7 @@ from schema_packages.fabrication_utilities import (
     FabricationProcessStep,
 )
 from schema_packages.utils import (
-    parse_chemical_formula,
+    CompositionSection,
 )
 
 if TYPE_CHECKING:
@@ -41,7 +41,7 @@ m_package = Package(name='Transform processes schema')
 #######################################################################################
 
 
-class LTODensification(Chemical, FabricationProcessStep, ArchiveSection):
+class LTODensification(Chemical, FabricationProcessStep, CompositionSection):
     m_def = Section(
         a_eln={
             'hide': [
@@ -122,24 +122,9 @@ class LTODensification(Chemical, FabricationProcessStep, ArchiveSection):
 
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         super().normalize(archive, logger)
-        if self.chemical_formula:
-            elements, counts = parse_chemical_formula(self.chemical_formula)
-            total = 0
-            for token in counts:
-                total += int(token)
-            if total != 0:
-                elemental_fraction = np.array(counts) / total
-                elementality = []
-                i = 0
-                for entry in elements:
-                    elemental_try = ElementalComposition()
-                    elemental_try.element = entry
-                    elemental_try.atomic_fraction = elemental_fraction[i]
-                    i += 1
-                    elementality.append(elemental_try)
-            else:
-                print('No elements provided')
-            self.gas_elemental_composition = elementality
+        self.update_elemental_composition(
+            self.chemical_formula, 'gas_elemental_composition', logger
+        )
 
 
 class Doping(FabricationProcessStep, ArchiveSection):
@@ -206,7 +191,7 @@ class Doping(FabricationProcessStep, ArchiveSection):
     )
 
 
-class SOD(Chemical, FabricationProcessStep, ArchiveSection):
+class SOD(Chemical, FabricationProcessStep, CompositionSection):
     m_def = Section(
         a_eln={
             'hide': [
@@ -339,27 +324,12 @@ class SOD(Chemical, FabricationProcessStep, ArchiveSection):
 
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         super().normalize(archive, logger)
-        if self.chemical_formula:
-            elements, counts = parse_chemical_formula(self.chemical_formula)
-            total = 0
-            for token in counts:
-                total += int(token)
-            if total != 0:
-                elemental_fraction = np.array(counts) / total
-                elementality = []
-                i = 0
-                for entry in elements:
-                    elemental_try = ElementalComposition()
-                    elemental_try.element = entry
-                    elemental_try.atomic_fraction = elemental_fraction[i]
-                    i += 1
-                    elementality.append(elemental_try)
-            else:
-                print('No elements provided')
-            self.doping_material_elemental_composition = elementality
+        self.update_elemental_composition(
+            self.chemical_formula, 'doping_material_elemental_composition', logger
+        )
 
 
-class Track(Chemical, FabricationProcessStep, ArchiveSection):
+class Track(Chemical, FabricationProcessStep, CompositionSection):
     m_def = Section(
         a_eln={
             'hide': [
@@ -608,24 +578,9 @@ class Track(Chemical, FabricationProcessStep, ArchiveSection):
         #         },
         #         unit='minute',
         #     )
-        if self.chemical_formula:
-            elements, counts = parse_chemical_formula(self.chemical_formula)
-            total = 0
-            for token in counts:
-                total += int(token)
-            if total != 0:
-                elemental_fraction = np.array(counts) / total
-                elementality = []
-                i = 0
-                for entry in elements:
-                    elemental_try = ElementalComposition()
-                    elemental_try.element = entry
-                    elemental_try.atomic_fraction = elemental_fraction[i]
-                    i += 1
-                    elementality.append(elemental_try)
-            else:
-                print('No elements provided')
-            self.resist_elemental_composition = elementality
+        self.update_elemental_composition(
+            self.chemical_formula, 'resist_elemental_composition', logger
+        )
 
 
 m_package.__init_metainfo__()
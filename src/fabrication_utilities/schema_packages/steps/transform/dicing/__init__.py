@@ -3,9 +3,10 @@ from nomad.config.models.plugins import SchemaPackageEntryPoint
 
 class DicingEntryPoint(SchemaPackageEntryPoint):
     def load(self):
+        from schema_packages.profiling import profiled
         from schema_packages.steps.transform.dicing.dicing import m_package
 
-        return m_package
+        return profiled(m_package)
 
 
 Dicing_entry_point = DicingEntryPoint(
@@ -8,7 +8,11 @@ from schema_packages.fabrication_utilities import (
     FabricationProcessStep,
     FabricationProcessStepBase,
 )
+from schema_packages.Items import WaferMap
+from schema_packages.lineage import split_ids
 from schema_packages.steps.utils import DicingOutputs
+from schema_packages.utils import FingerprintSection
+from schema_packages.wafer_map import passes_per_step, saw_times
 
 if TYPE_CHECKING:
     from nomad.datamodel.datamodel import (
@@ -74,9 +78,19 @@ class Dicingbase(FabricationProcessStepBase):
         },
         unit='um',
     )
+    number_of_passes = Quantity(
+        type=int,
+        description='Passes of the step on every cut line to reach the depth target',
+    )
+    estimated_saw_time = Quantity(
+        type=np.float64,
+        description='Time to cut every line of the wafer map at the feed rate',
+        a_eln={'defaultDisplayUnit': 'minute'},
+        unit='sec',
+    )
 
 
-class Dicing(FabricationProcessStep):
+class Dicing(FabricationProcessStep, FingerprintSection):
     m_def = Section(
         description="""
         Process step by which items are cut with diamond blade systems, with movement
@@ -131,10 +145,107 @@ class Dicing(FabricationProcessStep):
 
     dicing_steps = SubSection(section_def=Dicingbase, repeats=True)
 
+    wafer_map = SubSection(
+        section_def=WaferMap,
+        description='Map of the dies obtained from the wafer',
+        repeats=False,
+    )
+
+    number_of_cut_lines_channel_1 = Quantity(
+        type=int,
+        description='Cut lines along x, between the rows of the wafer map',
+    )
+
+    number_of_cut_lines_channel_2 = Quantity(
+        type=int,
+        description='Cut lines along y, between the columns of the wafer map',
+    )
+
+    total_cut_length = Quantity(
+        type=np.float64,
+        description='Length of all the cut lines of a pass',
+        a_eln={'defaultDisplayUnit': 'mm'},
+        unit='mm',
+    )
+
+    estimated_saw_time = Quantity(
+        type=np.float64,
+        description='Time to cut the wafer map with every dicing step',
+        a_eln={'defaultDisplayUnit': 'minute'},
+        unit='sec',
+    )
+
     outputs = SubSection(section_def=DicingOutputs, repeats=False)
 
+    def list_diced_items(self):
+        """
+        Lists the full dies of the wafer map as the diced items. The list is built
+        again from the current map every time, so it follows the map and the wafer.
+        """
+        if self.wafer_map is None or self.wafer_map.die_id is None:
+            return
+        if self.outputs is None:
+            self.outputs = DicingOutputs()
+        prefix = f'{self.id_item_processed}_' if self.id_item_processed else ''
+        full = np.asarray(self.wafer_map.die_full, dtype=bool)
+        self.outputs.wafer_diced_id = [
+            f'{prefix}{die}' for die in np.asarray(self.wafer_map.die_id)[full]
+        ]
+
+    def plan_cuts(self, logger: 'BoundLogger') -> None:
+        """
+        Cut lines of the wafer map, passes of every dicing step to reach the depth
+        target and estimated saw time at the feed rates of the steps.
+        """
+        plan = self.wafer_map.cut_plan() if self.wafer_map is not None else None
+        if plan is None:
+            return
+        self.number_of_cut_lines_channel_1 = plan.count(1)
+        self.number_of_cut_lines_channel_2 = plan.count(2)
+        self.total_cut_length = plan.total_length
+        if not self.dicing_steps:
+            return
+        if any(step.depth_step is None for step in self.dicing_steps):
+            logger.warning('Cannot plan the passes without the depth of every step')
+            return
+        depth_steps = [step.depth_step.to('um').magnitude for step in self.dicing_steps]
+        depth_target = None
+        if self.depth_target is not None:
+            depth_target = self.depth_target.to('um').magnitude
+        if min(depth_steps) <= 0 or (depth_target is not None and depth_target <= 0):
+            logger.warning('Cannot plan the passes with depths that are not positive')
+            return
+        passes = passes_per_step(depth_steps, depth_target)
+        feed_rates = [
+            step.dicing_feed_rate.to('mm/s').magnitude
+            if step.dicing_feed_rate is not None
+            else np.nan
+            for step in self.dicing_steps
+        ]
+        times = saw_times(plan.total_length, passes, feed_rates)
+        for step, step_passes, time in zip(self.dicing_steps, passes, times):
+            step.number_of_passes = int(step_passes)
+            if np.isfinite(time):
+                step.estimated_saw_time = time
+        if np.isfinite(times).all():
+            self.estimated_saw_time = times.sum()
+
+    def lineage(self, entry):
+        """
+        The diced items are children of the items processed.
+        """
+        links, visits = super().lineage(entry)
+        diced = split_ids(self.outputs.wafer_diced_id if self.outputs else None)
+        links += [(item, child) for item, _ in visits for child in diced]
+        return links, visits
+
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
+        # Diced items are listed before the step indexes its lineage, once
+        if not self.fingerprint_matches():
+            self.list_diced_items()
+            self.plan_cuts(logger)
         super().normalize(archive, logger)
+        self.update_fingerprint()
 
 
 m_package.__init_metainfo__()
@@ -3,9 +3,10 @@ from nomad.config.models.plugins import SchemaPackageEntryPoint
 
 class EBLEntryPoint(SchemaPackageEntryPoint):
     def load(self):
+        from schema_packages.profiling import profiled
         from schema_packages.steps.transform.lithography.ebl import m_package
 
-        return m_package
+        return profiled(m_package)
 
 
 EBL_entry_point = EBLEntryPoint(
@@ -16,9 +17,10 @@ EBL_entry_point = EBLEntryPoint(
 
 class FIBEntryPoint(SchemaPackageEntryPoint):
     def load(self):
+        from schema_packages.profiling import profiled
         from schema_packages.steps.transform.lithography.fib import m_package
 
-        return m_package
+        return profiled(m_package)
 
 
 FIB_entry_point = FIBEntryPoint(
@@ -29,9 +31,10 @@ FIB_entry_point = FIBEntryPoint(
 
 class LabelingEntryPoint(SchemaPackageEntryPoint):
     def load(self):
+        from schema_packages.profiling import profiled
         from schema_packages.steps.transform.lithography.labeling import m_package
 
-        return m_package
+        return profiled(m_package)
 
 
 Labeling_entry_point = LabelingEntryPoint(
@@ -3,9 +3,10 @@ from nomad.config.models.plugins import SchemaPackageEntryPoint
 
 class BakingEntryPoint(SchemaPackageEntryPoint):
     def load(self):
+        from schema_packages.profiling import profiled
         from schema_packages.steps.transform.thermal_process.baking import m_package
 
-        return m_package
+        return profiled(m_package)
 
 
 Baking_entry_point = BakingEntryPoint(
@@ -16,11 +17,12 @@ Baking_entry_point = BakingEntryPoint(
 
 class OxidationEntryPoint(SchemaPackageEntryPoint):
     def load(self):
+        from schema_packages.profiling import profiled
         from schema_packages.steps.transform.thermal_process.oxidation import (
             m_package,
         )
 
-        return m_package
+        return profiled(m_package)
 
 
 ThermalOxidation_entry_point = OxidationEntryPoint(
@@ -31,11 +33,12 @@ ThermalOxidation_entry_point = OxidationEntryPoint(
 
 class AnnealingEntryPoint(SchemaPackageEntryPoint):
     def load(self):
+        from schema_packages.profiling import profiled
         from schema_packages.steps.transform.thermal_process.annealing import (
             m_package,
         )
 
-        return m_package
+        return profiled(m_package)
 
 
 Annealing_entry_point = AnnealingEntryPoint(
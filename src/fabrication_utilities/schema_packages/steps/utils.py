@@ -13,6 +13,7 @@ import numpy as np
 from nomad.datamodel.data import ArchiveSection
 from nomad.metainfo import MEnum, Quantity, Section, SubSection
 from schema_packages.Items import ItemPlacement
+from schema_packages.placement import slot_conflicts
 from schema_packages.utils import (
     BeamSource,
     FabricationChemical,
@@ -68,6 +69,21 @@ class Carrier(ArchiveSection):
         """,
     )
 
+    def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
+        super().normalize(archive, logger)
+        if self.slots is None:
+            return
+        positions = list(self.position_of_dummy_wafers or [])
+        if self.position_of_item is not None:
+            positions.append(self.position_of_item)
+        out_of_range, occupied = slot_conflicts(self.slots, positions)
+        if len(out_of_range):
+            logger.warning(
+                f'Slots {out_of_range.tolist()} are not among the {self.slots} slots'
+            )
+        if len(occupied):
+            logger.warning(f'Slots {occupied.tolist()} are occupied more than once')
+
 
 #######################################################################################
 ## Classes used to describe components, mostrly electrical related in add and remove ##
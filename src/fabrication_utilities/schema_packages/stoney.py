@@ -0,0 +1,80 @@
+#######################################################################################
+#    Engine of the stress of thin films from the bow of their substrate: the local    #
+#    curvature of height scans is obtained by sliding polynomial fits, evaluated as   #
+#   a product of the windows of the scans with the fit coefficients, and the change   #
+#    of curvature after the deposition gives the stress profile by Stoney formula.    #
+#######################################################################################
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Points of the windows of the local fits of the scans
+CURVATURE_WINDOW = 31
+
+# Degree of the polynomials of the local fits
+FIT_ORDER = 2
+
+# Lowest degree of the fits having a curvature, the one of a parabola
+MIN_FIT_ORDER = 2
+
+
+def resample_uniform(position, values):
+    """
+    Positions sorted and evenly spaced, and values linearly interpolated there.
+    Positions are shared by every scan, values have shape (points,) or
+    (scans, points).
+    """
+    position = np.asarray(position, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    if len(position) < 2:  # noqa: PLR2004
+        raise ValueError(f'Cannot resample scans of {len(position)} points')
+    order = np.argsort(position)
+    position, values = position[order], values[..., order]
+    grid = np.linspace(position[0], position[-1], len(position))
+    if np.allclose(grid, position):
+        return grid, values
+    index = np.clip(np.searchsorted(position, grid, side='right') - 1, 0, len(grid) - 2)
+    weight = (grid - position[index]) / (position[index + 1] - position[index])
+    return grid, values[..., index] * (1 - weight) + values[..., index + 1] * weight
+
+
+def fit_coefficients(window, order=FIT_ORDER):
+    """
+    Matrix giving the coefficients of the least squares polynomial of a window of
+    evenly spaced points, in units of the spacing from its center point.
+    """
+    offsets = np.arange(window) - window // 2
+    return np.linalg.pinv(offsets[:, None] ** np.arange(order + 1))
+
+
+def local_curvature(position, height, window=CURVATURE_WINDOW, order=FIT_ORDER):
+    """
+    Centers of the windows and curvature there of height scans, in the inverse of
+    the unit of positions and heights.
+
+    The scans are resampled evenly, every window of `window` points (odd) is fitted
+    with a polynomial of degree `order` (at least 2) and the curvature is the one of
+    the fit at the center of the window. Windows longer than the scans are shortened.
+    """
+    grid, height = resample_uniform(position, height)
+    window = min(window, len(grid))
+    window -= 1 - window % 2
+    if order < MIN_FIT_ORDER or window <= order:
+        raise ValueError(f'Fits of degree {order} need windows of {order + 1} points')
+    step = grid[1] - grid[0]
+    coefficients = fit_coefficients(window, order)
+    windows = sliding_window_view(height, window, axis=-1)
+    first = windows @ coefficients[1] / step
+    second = 2 * (windows @ coefficients[2]) / step**2
+    half = window // 2
+    return grid[half : len(grid) - half], second / (1 + first**2) ** 1.5
+
+
+def stoney_stress(curvature_change, young, poisson, substrate_thickness, thickness):
+    """
+    Stress of a film by Stoney formula from the change of curvature of its substrate,
+    broadcast over profiles and batches. Units are consistent, e.g. Pa, m and 1/m.
+    """
+    factor = np.multiply(young, np.square(substrate_thickness)) / (
+        6 * np.subtract(1, poisson) * np.asarray(thickness)
+    )
+    return factor * np.asarray(curvature_change, dtype=np.float64)
@@ -0,0 +1,109 @@
+#######################################################################################
+#   Engine deriving the timeline of processes from the dates and measured durations   #
+#    of their steps: wait before every step, cycle, touch and idle times. Processes   #
+#    are rows of NaN padded arrays, so thousands of them are evaluated in a single    #
+#                        vectorized pass without Python loops.                        #
+#######################################################################################
+from typing import NamedTuple
+
+import numpy as np
+
+
+class Timeline(NamedTuple):
+    """
+    Timeline of the steps of one process, or of every row of a batch of processes.
+
+    `start` and `end` are in seconds from the start of the first step, `touch` is the
+    time spent in every step and `wait` the time every step waited after the end of
+    all the steps started before it. Steps are in the given order, waits are
+    evaluated in chronological order; unknown times are NaN.
+    """
+
+    origin: np.ndarray
+    start: np.ndarray
+    end: np.ndarray
+    touch: np.ndarray
+    wait: np.ndarray
+
+    @property
+    def cycle_time(self):
+        return np.fmax.reduce(self.end, axis=-1)
+
+    @property
+    def touch_time(self):
+        return np.nansum(self.touch, axis=-1)
+
+    @property
+    def idle_time(self):
+        return np.nansum(self.wait, axis=-1)
+
+
+def as_seconds(value):
+    """
+    Seconds of a datetime since the epoch, or of a pint duration, NaN for None.
+    """
+    if value is None:
+        return np.nan
+    if hasattr(value, 'timestamp'):
+        return value.timestamp()
+    if hasattr(value, 'units'):
+        return float(value.to('s').magnitude)
+    return float(value)
+
+
+def step_times(steps):
+    """
+    Start and end in seconds since the epoch and measured duration in seconds of
+    every step, as three arrays. Missing steps and times are NaN.
+    """
+    times = np.full((3, len(steps)), np.nan)
+    for index, step in enumerate(steps):
+        if step is None:
+            continue
+        outputs = getattr(step, 'outputs', None)
+        times[:, index] = [
+            as_seconds(getattr(step, 'starting_date', None)),
+            as_seconds(getattr(step, 'ending_date', None)),
+            as_seconds(getattr(outputs, 'duration_measured', None)),
+        ]
+    return times
+
+
+def step_timeline(starts, ends, durations):
+    """
+    `Timeline` of steps with the given start and end in seconds since the epoch and
+    measured durations in seconds, arrays of shape (steps,) or (processes, steps).
+
+    A missing start or end is derived from the other one and the duration, the touch
+    time of a step is its measured duration if any and the time from start to end
+    otherwise.
+    """
+    arrays = (starts, ends, durations)
+    starts, ends, durations = np.broadcast_arrays(
+        *(np.asarray(array, dtype=np.float64) for array in arrays)
+    )
+    starts = np.where(np.isnan(starts), ends - durations, starts)
+    ends = np.where(np.isnan(ends), starts + durations, ends)
+    touch = np.where(np.isnan(durations), ends - starts, durations)
+    origin = np.fmin.reduce(starts, axis=-1, keepdims=True)
+
+    # Steps without a start are sorted last
+    order = np.argsort(starts, axis=-1, kind='stable')
+    sorted_starts = np.take_along_axis(starts, order, axis=-1)
+    sorted_ends = np.take_along_axis(ends, order, axis=-1)
+    latest_end = np.fmax.accumulate(sorted_ends, axis=-1)
+    previous = np.concatenate(
+        [np.full_like(latest_end[..., :1], np.nan), latest_end[..., :-1]], axis=-1
+    )
+    sorted_wait = np.maximum(sorted_starts - previous, 0)
+    sorted_wait[np.isnan(previous) & ~np.isnan(sorted_starts)] = 0
+    wait = np.empty_like(sorted_wait)
+    np.put_along_axis(wait, order, sorted_wait, axis=-1)
+
+    return Timeline(
+        origin=origin[..., 0],
+        start=starts - origin,
+        end=ends - origin,
+        touch=touch,
+        wait=wait,
+    )
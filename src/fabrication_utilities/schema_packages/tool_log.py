@@ -0,0 +1,89 @@
+from typing import (
+    TYPE_CHECKING,
+)
+
+from nomad.datamodel.data import EntryData
+from nomad.metainfo import (
+    Package,
+    Quantity,
+    Section,
+    SubSection,
+)
+from schema_packages.utils import (
+    TimeRampMassflow,
+    TimeRampPressure,
+    TimeRampRotation,
+    TimeRampTemperature,
+)
+
+if TYPE_CHECKING:
+    from nomad.datamodel.datamodel import (
+        EntryArchive,
+    )
+    from structlog.stdlib import (
+        BoundLogger,
+    )
+
+m_package = Package(name='Tool logs plugin')
+
+
+class ToolLog(EntryData):
+    m_def = Section(
+        a_eln={
+            'properties': {
+                'order': [
+                    'name',
+                    'equipment_name',
+                    'log_file',
+                    'number_of_rows',
+                ],
+            },
+        },
+        description="""
+        Datalog written by the controller of an equipment (furnaces, PECVD, ICP-RIE,
+        ...) during a process. Every column of the log is stored as a ramp of the
+        corresponding process parameter.
+        """,
+    )
+
+    name = Quantity(
+        type=str,
+        a_eln={'component': 'StringEditQuantity'},
+    )
+
+    equipment_name = Quantity(
+        type=str,
+        description='Name of the equipment that wrote the log',
+        a_eln={'component': 'StringEditQuantity'},
+    )
+
+    log_file = Quantity(
+        type=str,
+        description='File from which the ramps have been read',
+        a_eln={'component': 'FileEditQuantity'},
+    )
+
+    number_of_rows = Quantity(
+        type=int,
+        description='Number of records of the log',
+    )
+
+    unmapped_columns = Quantity(
+        type=str,
+        shape=['*'],
+        description='Columns of the log that do not correspond to any ramp',
+    )
+
+    temperature_ramps = SubSection(section_def=TimeRampTemperature, repeats=True)
+
+    pressure_ramps = SubSection(section_def=TimeRampPressure, repeats=True)
+
+    massflow_ramps = SubSection(section_def=TimeRampMassflow, repeats=True)
+
+    rotation_ramps = SubSection(section_def=TimeRampRotation, repeats=True)
+
+    def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
+        super().normalize(archive, logger)
+
+
+m_package.__init_metainfo__()
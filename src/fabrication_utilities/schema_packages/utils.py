@@ -1,18 +1,45 @@
-import re
-from collections import defaultdict
+import hashlib
+import os
+from functools import lru_cache
 from typing import (
     TYPE_CHECKING,
 )
 
 import numpy as np
-import plotly.express as px
-from ase.data import atomic_masses as am
-from ase.data import atomic_numbers as an
 from nomad.datamodel.data import ArchiveSection
 from nomad.datamodel.metainfo.basesections import ElementalComposition
 from nomad.datamodel.metainfo.eln import Chemical
 from nomad.datamodel.metainfo.plot import PlotlyFigure, PlotSection
-from nomad.metainfo import Quantity, Section, SubSection
+from nomad.metainfo import MEnum, Quantity, Reference, Section, SubSection
+from schema_packages.composition import (
+    composition_cache_info,
+    composition_of,
+    normalize_formula,
+    parse_chemical_formula,  # noqa: F401
+    resolve_chemical_name,
+)
+from schema_packages.plotting import (
+    DEFAULT_MAX_POINTS,
+    cached_line_figure,
+    figure_key,
+    line_figure,
+)
+from schema_packages.profiling import plugin_version
+from schema_packages.ramp_storage import (
+    RAMP_STORAGE_MODES,
+    delta_decode,
+    delta_encode,
+    read_sidecar,
+    sidecar_name,
+    uniform_sampling,
+    uniform_time,
+    write_sidecar,
+)
+from schema_packages.ramps import (
+    DEFAULT_RAMP_SAMPLES,
+    complete_ramps,
+    synthesize_ramps,
+)
 
 if TYPE_CHECKING:
     from nomad.datamodel.datamodel import (
@@ -23,82 +50,170 @@ if TYPE_CHECKING:
     )
 
 
-def parse_chemical_formula(formula):
-    formula = formula.replace('·', '.')
-    if '.' in formula:
-        main_part, hydrate_part = formula.split('.')
-    else:
-        main_part, hydrate_part = formula, None
+def generate_elementality(formula, logger=None):
+    # Common names such as water or IPA share the record of their formula in the
+    # composition cache, which lives as long as the worker and so across the upload
+    record = composition_of(resolve_chemical_name(formula))
+    if logger is not None:
+        if not record.elements:
+            logger.warning('No elements in the chemical formula', formula=formula)
+        info = composition_cache_info()
+        logger.debug(
+            'elemental composition generated',
+            formula=formula,
+            cache_hits=info.hits,
+            cache_misses=info.misses,
+            unique_chemicals=info.currsize,
+        )
 
-    def extract_elements(compound):
-        # Espressione per trovare elementi chimici seguiti da un numero opzionale
-        matches = re.findall(r'([A-Z][a-z]*)(\d*)', compound)
-        elements = defaultdict(int)
+    return [
+        ElementalComposition(
+            element=element, atomic_fraction=atomic_frac, mass_fraction=mass_frac
+        )
+        for element, atomic_frac, mass_frac in zip(
+            record.elements, record.atomic_fractions, record.mass_fractions
+        )
+    ]
 
-        for element, count in matches:
-            elements[element] += int(count) if count else 1
 
-        return elements
+class CompositionSection(ArchiveSection):
+    m_def = Section(
+        description="""
+        Base section for sections deriving an elemental composition from a chemical
+        formula. The formula used for the last composition is kept as fingerprint, so
+        the composition is rebuilt only when the formula changes.
+        """
+    )
 
-    element_main = defaultdict(int)
+    composition_fingerprint = Quantity(
+        type=str,
+        description='Formula from which the elemental composition was generated',
+    )
+
+    def update_elemental_composition(
+        self, formula, target='elemental_composition', logger=None
+    ):
+        if not formula:
+            return
+        fingerprint = normalize_formula(formula)
+        if fingerprint == self.composition_fingerprint and getattr(self, target):
+            return
+        try:
+            composition = generate_elementality(formula, logger)
+        except (ValueError, KeyError) as error:
+            # Unbalanced brackets, ambiguous dots or unknown element symbols
+            if logger is not None:
+                logger.warning(
+                    f'Cannot parse the chemical formula: {error}', formula=formula
+                )
+            setattr(self, target, [])
+            self.composition_fingerprint = None
+            return
+        setattr(self, target, composition)
+        self.composition_fingerprint = fingerprint
+
+
+# If set, sections are normalized again even if their fingerprint did not change
+FULL_NORMALIZATION_ENV = 'FABRICATION_UTILITIES_FULL_NORMALIZATION'
+
+# Metadata not used by any normalize, changing them does not change the fingerprint
+FINGERPRINT_IGNORED = frozenset(
+    ['notes', 'keywords', 'description', 'normalization_fingerprint']
+)
 
-    # Espandiamo le parentesi prima di estrarre gli elementi
-    while '(' in main_part:
-        main_part = re.sub(
-            r'\(([^()]*)\)(\d+)', lambda m: m.group(1) * int(m.group(2)), main_part
-        )
 
-    # Trova elementi e numeri
-    matches = re.findall(r'([A-Z][a-z]*)(\d*)', main_part)
+def _fingerprint_value(quantity, value):
+    if isinstance(quantity.type, Reference):
+        proxy = getattr(value, 'm_proxy_value', None)
+        return str(proxy if proxy is not None else value.m_path()).encode()
+    magnitude = getattr(value, 'magnitude', value)
+    units = str(getattr(value, 'units', '')).encode()
+    if isinstance(magnitude, np.ndarray):
+        array = np.ascontiguousarray(magnitude)
+        return str(array.dtype).encode() + array.tobytes() + units
+    return repr(magnitude).encode() + units
+
+
+def _update_fingerprint(digest, section, ignored):
+    digest.update(section.m_def.name.encode())
+    for name, quantity in sorted(section.m_def.all_quantities.items()):
+        if name in ignored or not section.m_is_set(quantity):
+            continue
+        digest.update(name.encode())
+        digest.update(_fingerprint_value(quantity, section.m_get(quantity)))
+    for name, sub_section in sorted(section.m_def.all_sub_sections.items()):
+        if name in ignored:
+            continue
+        for child in section.m_get_sub_sections(sub_section):
+            digest.update(name.encode())
+            _update_fingerprint(digest, child, ignored)
+
+
+@lru_cache(maxsize=1)
+def fingerprint_salt():
+    # Outputs of a previous version of the plugin are normalized again
+    return f'{plugin_version()}'
+
+
+def section_fingerprint(section, ignored=FINGERPRINT_IGNORED, inputs=()):
+    """
+    Hash of the quantities and subsections of a section, recursively, but the
+    ignored ones, and of the given inputs. Arrays are hashed through their bytes,
+    references through their proxy value and not through the referenced section.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    _update_fingerprint(digest, section, ignored)
+    digest.update(repr(tuple(inputs)).encode())
+    return digest.hexdigest()
+
+
+class FingerprintSection(ArchiveSection):
+    m_def = Section(
+        description="""
+        Base section for sections whose normalize can be skipped when nothing it
+        depends on changed. The hash of the section, outputs included, is stored at the
+        end of normalize: if it is the same at the next normalization the section is
+        left as it is. Metadata such as notes or keywords are not part of the hash,
+        the version of the plugin and the fingerprint_version of the class are.
+        References are hashed as their target address only: sections whose normalize
+        reads through references must not skip it on the fingerprint.
+        """
+    )
 
-    for element, count in matches:
-        element_main[element] += (
-            int(count) if count else 1
-        )  # Se il numero manca, assume 1
+    # Increase when the normalize of the section changes, to invalidate the outputs
+    # stored by the previous code
+    fingerprint_version = 1
 
-    if hydrate_part:
-        hydrate_match = re.match(r'(\d*)H2O', hydrate_part)
-        if hydrate_match:
-            water_molecules = (
-                int(hydrate_match.group(1)) if hydrate_match.group(1) else 1
-            )
-            elements_hydrate = extract_elements('H2O')
-
-            for element, count in elements_hydrate.items():
-                element_main[element] += count * water_molecules
-
-    # Convertiamo il dizionario in due liste ordinate
-    elements = list(element_main.keys())
-    counts = list(element_main.values())
-
-    return elements, counts
-
-
-def generate_elementality(formula):
-    elements, counts = parse_chemical_formula(formula)
-    total = 0
-    for token in counts:
-        total += int(token)
-    mass = sum(am[an[el]] * cou for el, cou in zip(elements, counts))
-    if total != 0:
-        elemental_fraction = np.array(counts) / total
-        elementality = []
-        i = 0
-        for entry in elements:
-            elemental_try = ElementalComposition()
-            elemental_try.element = entry
-            elemental_try.atomic_fraction = elemental_fraction[i]
-            mass_frac = (am[an[entry]] * counts[i]) / mass
-            elemental_try.mass_fraction = mass_frac
-            i += 1
-            elementality.append(elemental_try)
-    else:
-        print('No elements provided')
-
-    return elementality
-
-
-class FabricationChemical(Chemical, ArchiveSection):
+    normalization_fingerprint = Quantity(
+        type=str,
+        description='Hash of the section at the end of its last normalization',
+    )
+
+    def fingerprint_matches(self):
+        """
+        True if the section did not change since its last normalization.
+        """
+        if os.environ.get(FULL_NORMALIZATION_ENV):
+            return False
+        fingerprint = self.normalization_fingerprint
+        return fingerprint is not None and fingerprint == self._fingerprint()
+
+    def fingerprint_inputs(self):
+        """
+        Values read by normalize from outside the section, e.g. from its parent, that
+        are part of the hash.
+        """
+        return ()
+
+    def _fingerprint(self):
+        salt = (fingerprint_salt(), self.fingerprint_version)
+        return section_fingerprint(self, inputs=(*salt, *self.fingerprint_inputs()))
+
+    def update_fingerprint(self):
+        self.normalization_fingerprint = self._fingerprint()
+
+
+class FabricationChemical(Chemical, CompositionSection):
     m_def = Section(
         definition='Chemicals for fabrication products',
         a_eln={
@@ -116,8 +231,7 @@ class FabricationChemical(Chemical, ArchiveSection):
 
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         super().normalize(archive, logger)
-        if self.chemical_formula:
-            self.elemental_composition = generate_elementality(self.chemical_formula)
+        self.update_elemental_composition(self.chemical_formula, logger=logger)
 
 
 class BeamSource(ArchiveSection):
@@ -134,20 +248,20 @@ class BeamSource(ArchiveSection):
     )
 
 
-def make_line_express(list1, list2, labelx, labely, finalist, labelfigure):
-    figure1 = px.line(
-        x=list1,
-        y=list2,
-        height=400,
-        width=800,
-        labels={'x': labelx, 'y': labely},
-        markers=True,
-    )
-
+def make_line_express(
+    list1,
+    list2,
+    labelx,
+    labely,
+    finalist,
+    labelfigure,
+    *,
+    max_points=DEFAULT_MAX_POINTS,
+):
     finalist.append(
         PlotlyFigure(
             label=labelfigure,
-            figure=figure1.to_plotly_json(),
+            figure=line_figure(list1, list2, labelx, labely, max_points=max_points),
             index=0,
         )
     )
@@ -156,7 +270,320 @@ def make_line_express(list1, list2, labelx, labely, finalist, labelfigure):
 # Capire se se può ingegnerizzare meglio la funzione per ridurre variabili
 
 
-class TimeRampTemperature(PlotSection):
+# Parameters of a ramp that can be inferred from the others
+RAMP_PARAMETERS = ('end_value', 'duration', 'rate')
+
+
+def synthesize_ramp_profiles(ramps):
+    """
+    Generates time and values of the ramps described only by their parameters. All
+    the ramps are evaluated together, grouped by number of samples.
+    """
+    pending = [ramp for ramp in ramps if ramp.needs_synthesis()]
+    if not pending:
+        return
+    # The parameter inferred by a previous generation is inferred again
+    parameters = np.array(
+        [ramp.ramp_parameters(ignore_inferred=True) for ramp in pending]
+    )
+    start = parameters[:, 0]
+    missing = np.isnan(parameters[:, 1:])
+    end, duration, rate = complete_ramps(*parameters.T)
+    valid = np.isfinite(end) & np.isfinite(duration) & (duration > 0)
+    samples = np.array(
+        [ramp.number_of_samples or DEFAULT_RAMP_SAMPLES for ramp in pending]
+    )
+    for count in np.unique(samples[valid]):
+        rows = np.flatnonzero(valid & (samples == count))
+        time, values = synthesize_ramps(
+            start[rows],
+            end[rows],
+            duration[rows],
+            [pending[row].ramp_behavior for row in rows],
+            samples=int(count),
+        )
+        for ramp, row, ramp_time, ramp_values in zip(
+            [pending[row] for row in rows], rows, time, values
+        ):
+            ramp.end_value = end[row]
+            setattr(ramp, ramp.duration_quantity, duration[row])
+            ramp.rate = rate[row]
+            ramp.time = ramp_time
+            ramp.values = ramp_values
+            inferred = np.flatnonzero(missing[row])
+            ramp.inferred_parameter = (
+                RAMP_PARAMETERS[inferred[0]] if len(inferred) else None
+            )
+            ramp.synthesis_key = ramp.parameters_key()
+
+
+class TimeRamp(PlotSection, FingerprintSection):
+    m_def = Section(
+        description="""
+        Base section for the profiles of a process parameter over time. If time and
+        values are not given they are generated from start value, end value, duration,
+        rate and behavior, the missing one of end value, duration and rate is inferred.
+        The figure is generated again only when the data or the labels change.
+        Long ramps can be stored in a compact form, to be read through `read_time`
+        and `read_values`.
+        """
+    )
+
+    # Quantities describing the ramp and labels of the figure in specialized ramps
+    duration_quantity = 'duration'
+    behavior_quantity = 'behavior'
+    plot_labels = ('Time (s)', 'Values', 'Ramp')
+
+    number_of_samples = Quantity(
+        type=int,
+        description=f"""
+        Number of points generated when time and values are computed from the ramp
+        parameters, by default {DEFAULT_RAMP_SAMPLES}
+        """,
+        a_eln={'component': 'NumberEditQuantity'},
+    )
+
+    synthesis_key = Quantity(
+        type=str,
+        description='Parameters used to generate time and values, if generated',
+    )
+
+    inferred_parameter = Quantity(
+        type=str,
+        description='Which one of end value, duration and rate was inferred',
+    )
+
+    figure_key = Quantity(
+        type=str,
+        description='Hash of the data and of the labels used to generate the figure',
+    )
+
+    storage = Quantity(
+        type=MEnum(*RAMP_STORAGE_MODES),
+        description="""
+        How time and values are stored: full arrays, time as start and step when
+        uniformly sampled (uniform), values also as integer differences at float32
+        resolution (delta) or both in a memory mapped .npy file of the upload
+        (sidecar)
+        """,
+        a_eln={'component': 'EnumEditQuantity'},
+    )
+
+    number_of_points = Quantity(
+        type=int,
+        description='Length of the stored time and values',
+    )
+
+    time_start = Quantity(
+        type=np.float64,
+        description='Time of the first point of a uniformly sampled ramp',
+        unit='sec',
+    )
+
+    time_step = Quantity(
+        type=np.float64,
+        description='Time between two points of a uniformly sampled ramp',
+        unit='sec',
+    )
+
+    values_quantum = Quantity(
+        type=np.float64,
+        description='Resolution of the delta encoded values, in the unit of values',
+    )
+
+    values_anchors = Quantity(
+        type=np.int64,
+        shape=['*'],
+        description='Values at the beginning of every block, in quanta',
+    )
+
+    values_deltas = Quantity(
+        type=np.int64,
+        shape=['*'],
+        description='Differences between consecutive values, in quanta',
+    )
+
+    data_file = Quantity(
+        type=str,
+        description='Sidecar .npy file of the upload with time and values',
+    )
+
+    @property
+    def ramp_behavior(self):
+        return getattr(self, self.behavior_quantity)
+
+    def ramp_parameters(self, ignore_inferred=False):
+        """
+        Start value, end value, duration and rate magnitudes, NaN if not given.
+        """
+        parameters = [
+            self.start_value,
+            self.end_value,
+            getattr(self, self.duration_quantity),
+            self.rate,
+        ]
+        if ignore_inferred and self.inferred_parameter in RAMP_PARAMETERS:
+            parameters[RAMP_PARAMETERS.index(self.inferred_parameter) + 1] = None
+        return [
+            np.nan if value is None else float(getattr(value, 'magnitude', value))
+            for value in parameters
+        ]
+
+    def parameters_key(self):
+        parameters = [*self.ramp_parameters(), self.ramp_behavior]
+        return '|'.join(repr(value) for value in parameters + [self.number_of_samples])
+
+    def needs_synthesis(self):
+        parameters = np.array(self.ramp_parameters(), dtype=np.float64)
+        if np.isnan(parameters[0]) or np.isnan(parameters[1:]).sum() > 1:
+            return False
+        if self.ramp_length() == 0:
+            return True
+        return self.synthesis_key not in (None, self.parameters_key())
+
+    def sibling_ramps(self):
+        parent, sub_section = self.m_parent, self.m_parent_sub_section
+        if parent is None or sub_section is None or not sub_section.repeats:
+            return [self]
+        return [
+            ramp
+            for ramp in parent.m_get_sub_sections(sub_section)
+            if isinstance(ramp, TimeRamp)
+        ]
+
+    def ramp_length(self):
+        if self.values is not None:
+            return len(self.values)
+        return self.number_of_points or 0
+
+    def _sidecar(self):
+        context = getattr(self.m_root(), 'm_context', None)
+        if context is None:
+            raise ValueError(f'Cannot read {self.data_file} outside of an upload')
+        with context.raw_file(self.data_file, 'rb') as file:
+            return read_sidecar(file.name)
+
+    def read_time(self, first=0, last=None):
+        """
+        Time of the points `first:last` of the ramp, whatever the storage.
+        """
+        if self.time is not None:
+            return self.time[first:last]
+        unit = self.m_def.all_quantities['time'].unit
+        if self.data_file:
+            return self._sidecar()[0, first:last] * unit
+        if self.time_step is not None:
+            time = uniform_time(
+                self.time_start.to(unit).magnitude,
+                self.time_step.to(unit).magnitude,
+                self.ramp_length(),
+                first,
+                last,
+            )
+            return time * unit
+        return None
+
+    def read_values(self, first=0, last=None):
+        """
+        Values of the points `first:last` of the ramp, whatever the storage.
+        """
+        if self.values is not None:
+            return self.values[first:last]
+        unit = self.m_def.all_quantities['values'].unit
+        if self.data_file:
+            return self._sidecar()[1, first:last] * unit
+        if self.values_deltas is not None:
+            values = delta_decode(
+                self.values_quantum,
+                self.values_anchors,
+                self.values_deltas,
+                first,
+                last,
+            )
+            return values * unit
+        return None
+
+    def _clear_compact(self):
+        for name in (
+            'number_of_points',
+            'time_start',
+            'time_step',
+            'values_quantum',
+            'values_anchors',
+            'values_deltas',
+            'data_file',
+        ):
+            setattr(self, name, None)
+
+    def store_ramp(self, archive, logger):
+        """
+        Moves time and values to the representation selected by `storage`.
+        """
+        if self.storage in (None, 'full'):
+            if self.number_of_points is not None:
+                time, values = self.read_time(), self.read_values()
+                self._clear_compact()
+                self.time, self.values = time, values
+            return
+        if self.values is None or self.time is None:
+            return
+        time = np.asarray(self.time.magnitude, dtype=np.float64)
+        values = np.asarray(self.values.magnitude, dtype=np.float64)
+        if len(time) != len(values):
+            logger.warning('time and values of the ramp have different lengths')
+            return
+        context = getattr(archive, 'm_context', None)
+        if self.storage == 'sidecar' and context is None:
+            logger.warning('sidecar files can be written only inside an upload')
+            return
+
+        self._clear_compact()
+        self.number_of_points = len(values)
+        sampling = uniform_sampling(time)
+        if self.storage == 'sidecar':
+            self.data_file = sidecar_name(time, values)
+            if not context.raw_path_exists(self.data_file):
+                with context.raw_file(self.data_file, 'wb') as file:
+                    write_sidecar(file, time, values)
+            self.time, self.values = None, None
+            return
+        if sampling is not None:
+            self.time_start, self.time_step = sampling
+            self.time = None
+        if self.storage == 'delta':
+            # Missing readings of the logs are NaN, such values are kept in full
+            if not np.isfinite(values).all():
+                logger.warning('values of the ramp are not finite, stored in full')
+                return
+            self.values_quantum, self.values_anchors, self.values_deltas = delta_encode(
+                values
+            )
+            self.values = None
+
+    def plot_ramp(self, labelx, labely, labelfigure, max_points=DEFAULT_MAX_POINTS):
+        time, values = self.read_time(), self.read_values()
+        key = figure_key(time, values, labelx, labely, max_points)
+        if self.figures and self.figure_key == key:
+            return
+        _, figure = cached_line_figure(
+            time, values, labelx, labely, max_points=max_points, key=key
+        )
+        self.figures = [PlotlyFigure(label=labelfigure, figure=figure, index=0)]
+        self.figure_key = key
+
+    def normalize(self, archive, logger):
+        if self.fingerprint_matches():
+            return
+        # Ramps of the same subsection are generated together by the first one
+        synthesize_ramp_profiles(self.sibling_ramps())
+        if self.ramp_length() > 0:
+            super().normalize(archive, logger)
+            self.plot_ramp(*self.plot_labels)
+            self.store_ramp(archive, logger)
+        self.update_fingerprint()
+
+
+class TimeRampTemperature(TimeRamp):
     m_def = Section(
         description="""
         Section useful if a temperature parameter can be set with an initial rump up
@@ -166,6 +593,8 @@ class TimeRampTemperature(PlotSection):
         """
     )
 
+    plot_labels = ('Time (s)', 'Temperature (°C)', 'Ramp of temperature')
+
     name = Quantity(
         type=str,
         description='What temperature are you tracing?',
@@ -232,22 +661,8 @@ class TimeRampTemperature(PlotSection):
         unit='celsius',
     )
 
-    def normalize(self, archive, logger):
-        if self.values is not None and len(self.values) > 0:
-            super().normalize(archive, logger)
-            if hasattr(self, 'figures') and self.figures:
-                self.figures.clear()
-            make_line_express(
-                self.time,
-                self.values,
-                'Time (s)',
-                'Temperature (°C)',
-                self.figures,
-                'Ramp of temperature',
-            )
-
 
-class TimeRampPressure(PlotSection):
+class TimeRampPressure(TimeRamp):
     m_def = Section(
         description="""
         Section useful if a pressure parameter can be setted with an initial rump up
@@ -257,6 +672,10 @@ class TimeRampPressure(PlotSection):
         """
     )
 
+    duration_quantity = 'increment_duration'
+    behavior_quantity = 'increment_behavior'
+    plot_labels = ('Time (s)', 'Pressure (mbar)', 'Ramp of pressure')
+
     name = Quantity(
         type=str,
         description='What pressure are you tracing?',
@@ -296,6 +715,16 @@ class TimeRampPressure(PlotSection):
         a_eln={'component': 'StringEditQuantity'},
     )
 
+    rate = Quantity(
+        type=np.float64,
+        description='Average rate of the increment',
+        a_eln={
+            'component': 'NumberEditQuantity',
+            'defaultDisplayUnit': 'mbar/sec',
+        },
+        unit='mbar/sec',
+    )
+
     time = Quantity(
         type=np.float64,
         shape=['*'],
@@ -313,22 +742,8 @@ class TimeRampPressure(PlotSection):
         unit='mbar',
     )
 
-    def normalize(self, archive, logger):
-        if self.values is not None and len(self.values) > 0:
-            super().normalize(archive, logger)
-            if hasattr(self, 'figures') and self.figures:
-                self.figures.clear()
-            make_line_express(
-                self.time,
-                self.values,
-                'Time (s)',
-                'Pressure (mbar)',
-                self.figures,
-                'Ramp of pressure',
-            )
 
-
-class TimeRampMassflow(PlotSection):
+class TimeRampMassflow(TimeRamp):
     m_def = Section(
         description="""
         Section useful if a gaseous flow parameter can be setted with an initial rump up
@@ -338,6 +753,10 @@ class TimeRampMassflow(PlotSection):
         """
     )
 
+    duration_quantity = 'increment_duration'
+    behavior_quantity = 'increment_behavior'
+    plot_labels = ('Time (s)', 'Massflow (sccm)', 'Ramp of massflow')
+
     name = Quantity(
         type=str,
         description='What massflow are you tracing? (Chemical formulas are accepted)',
@@ -377,6 +796,16 @@ class TimeRampMassflow(PlotSection):
         a_eln={'component': 'StringEditQuantity'},
     )
 
+    rate = Quantity(
+        type=np.float64,
+        description='Average rate of the increment',
+        a_eln={
+            'component': 'NumberEditQuantity',
+            'defaultDisplayUnit': 'centimeter^3/minute/sec',
+        },
+        unit='centimeter^3/minute/sec',
+    )
+
     time = Quantity(
         type=np.float64,
         shape=['*'],
@@ -397,22 +826,8 @@ class TimeRampMassflow(PlotSection):
         unit='centimeter^3/minute',
     )
 
-    def normalize(self, archive, logger):
-        if self.values is not None and len(self.values) > 0:
-            super().normalize(archive, logger)
-            if hasattr(self, 'figures') and self.figures:
-                self.figures.clear()
-            make_line_express(
-                self.time,
-                self.values,
-                'Time (s)',
-                'Massflow (sccm)',
-                self.figures,
-                'Ramp of massflow',
-            )
-
 
-class TimeRampRotation(PlotSection):
+class TimeRampRotation(TimeRamp):
     m_def = Section(
         description="""
         Section useful if a angular valocity parameter can be setted with an initial
@@ -422,6 +837,10 @@ class TimeRampRotation(PlotSection):
         """
     )
 
+    duration_quantity = 'increment_duration'
+    behavior_quantity = 'increment_behavior'
+    plot_labels = ('Time (s)', 'Spin frequency (rpm)', 'Ramp of spin frequency')
+
     name = Quantity(
         type=str,
         description='What rotation are you tracing?',
@@ -455,6 +874,16 @@ class TimeRampRotation(PlotSection):
         a_eln={'component': 'StringEditQuantity'},
     )
 
+    rate = Quantity(
+        type=np.float64,
+        description='Average rate of the increment',
+        a_eln={
+            'component': 'NumberEditQuantity',
+            'defaultDisplayUnit': 'rpm/sec',
+        },
+        unit='rpm/sec',
+    )
+
     time = Quantity(
         type=np.float64,
         shape=['*'],
@@ -472,20 +901,6 @@ class TimeRampRotation(PlotSection):
         unit='rpm',
     )
 
-    def normalize(self, archive, logger):
-        if self.values is not None and len(self.values) > 0:
-            super().normalize(archive, logger)
-            if hasattr(self, 'figures') and self.figures:
-                self.figures.clear()
-            make_line_express(
-                self.time,
-                self.values,
-                'Time (s)',
-                'Spin frequency (rpm)',
-                self.figures,
-                'Ramp of spin frequency',
-            )
-
 
 def double_list_reading(list1, list2, archive, logger):
     if list1 and list2:
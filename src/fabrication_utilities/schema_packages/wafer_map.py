@@ -0,0 +1,272 @@
+#######################################################################################
+#  Engine generating die maps of wafers: the grid of dies of a given pitch and street #
+#   is evaluated at once against the usable area of the wafer (edge exclusion, flat   #
+#   or notch), maps and the cut lines along their streets are cached by their        #
+#           parameters since the same layout is diced on many lots.                   #
+#######################################################################################
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+from schema_packages.placement import Chuck, contained
+
+# SEMI standard and JEIDA primary flat lengths in mm by wafer diameter in mm
+FLAT_LENGTHS = {
+    'standard': ((50.8, 76.2, 100.0, 125.0, 150.0), (15.88, 22.22, 32.5, 42.5, 57.5)),
+    'jeida': ((50.8, 76.2, 100.0, 125.0, 150.0), (15.88, 22.0, 30.0, 40.0, 47.0)),
+}
+
+# Depth in mm of the notch of SEMI standard wafers
+NOTCH_DEPTH = 1.0
+
+# Number of die maps kept in memory
+DIE_MAP_CACHE_SIZE = 64
+
+# Lengths are rounded to this number of digits (in mm) in the keys of the cache
+KEY_DIGITS = 9
+
+
+class DieMap(NamedTuple):
+    """
+    Dies touching the usable area of a wafer in row-major order, from the top left.
+    Coordinates of the centers are in mm from the center of the wafer.
+    """
+
+    x: np.ndarray
+    y: np.ndarray
+    row: np.ndarray
+    column: np.ndarray
+    full: np.ndarray
+
+    @property
+    def full_count(self):
+        return int(self.full.sum())
+
+    @property
+    def partial_count(self):
+        return len(self.full) - self.full_count
+
+
+def wafer_cut(diameter, shape=None):
+    """
+    Distance in mm from the center of the flat, or of the notch vertex, at the bottom
+    of a wafer. None for round wafers or shapes without a flat or a notch.
+    """
+    text = (shape or '').lower()
+    radius = diameter / 2
+    if 'notch' in text:
+        return radius - NOTCH_DEPTH
+    if 'flat' in text:
+        sizes, lengths = FLAT_LENGTHS['jeida' if 'jeida' in text else 'standard']
+        # Out of the table the flat is scaled with the diameter
+        ratio = np.interp(diameter, sizes, np.divide(lengths, sizes))
+        half_flat = min(ratio * diameter / 2, radius)
+        return float(np.sqrt(radius**2 - half_flat**2))
+    return None
+
+
+@lru_cache(maxsize=DIE_MAP_CACHE_SIZE)
+def _die_map(key):
+    diameter, pitch_x, pitch_y, street, edge_exclusion, cut, offset = key
+    usable = diameter / 2 - edge_exclusion
+    half_x, half_y = (pitch_x - street) / 2, (pitch_y - street) / 2
+    if usable <= 0 or half_x <= 0 or half_y <= 0:
+        raise ValueError('The wafer has no usable area or the dies have no size')
+    usable_cut = None if cut is None else cut - edge_exclusion
+    count_x = int(np.ceil((usable + abs(offset[0])) / pitch_x)) + 1
+    count_y = int(np.ceil((usable + abs(offset[1])) / pitch_y)) + 1
+    steps_x = np.arange(-count_x, count_x + 1)
+    steps_y = np.arange(count_y, -count_y - 1, -1)
+    grid_x, grid_y = (grid.ravel() for grid in np.meshgrid(steps_x, steps_y))
+    x = offset[0] + grid_x * pitch_x
+    y = offset[1] + grid_y * pitch_y
+
+    # A die touches the usable area when its closest point to the center does
+    out_x = np.maximum(np.abs(x) - half_x, 0)
+    out_y = np.maximum(np.abs(y) - half_y, 0)
+    touching = np.hypot(out_x, out_y) < usable
+    if usable_cut is not None:
+        touching &= y + half_y > -usable_cut
+    x, y, grid_x, grid_y = x[touching], y[touching], grid_x[touching], grid_y[touching]
+    centers = np.stack([x, y], axis=1)
+    chuck = Chuck('circle', usable, usable, usable_cut)
+    full = contained(chuck, centers, (half_x, half_y, 0.0))
+
+    die_map = DieMap(
+        x=x,
+        y=y,
+        row=grid_y.max(initial=0) - grid_y,
+        column=grid_x - grid_x.min(initial=0),
+        full=full,
+    )
+    for array in die_map:
+        array.setflags(write=False)
+    return die_map
+
+
+def map_key(diameter, pitch_x, pitch_y, *, street, edge_exclusion, shape, offset):
+    # Hashable, rounded parameters of the cached maps and cut plans
+    pitch_y = pitch_x if pitch_y is None else pitch_y
+    cut = wafer_cut(diameter, shape)
+    key = [
+        round(float(value), KEY_DIGITS)
+        for value in (diameter, pitch_x, pitch_y, street, edge_exclusion)
+    ]
+    cut = None if cut is None else round(cut, KEY_DIGITS)
+    offset = tuple(round(float(value), KEY_DIGITS) for value in offset)
+    return (*key, cut, offset)
+
+
+def die_map(
+    diameter,
+    pitch_x,
+    pitch_y=None,
+    *,
+    street=0.0,
+    edge_exclusion=0.0,
+    shape=None,
+    offset=(0.0, 0.0),
+):
+    """
+    Cached `DieMap` of a wafer, every length in mm.
+
+    `pitch_x` and `pitch_y` are the distances between the centers of adjacent dies,
+    streets included, `shape` one of the shape types of items (flat or notch wafers).
+    The grid has a die centered on `offset` from the center of the wafer.
+    """
+    return _die_map(
+        map_key(
+            diameter,
+            pitch_x,
+            pitch_y,
+            street=street,
+            edge_exclusion=edge_exclusion,
+            shape=shape,
+            offset=offset,
+        )
+    )
+
+
+class CutPlan(NamedTuple):
+    """
+    Cut lines along the streets of a die map: channel 1 lines run along x at height
+    `position`, channel 2 lines along y at abscissa `position`, from `start` to `end`
+    where they cross the wafer. Lengths are in mm.
+    """
+
+    channel: np.ndarray
+    position: np.ndarray
+    start: np.ndarray
+    end: np.ndarray
+
+    @property
+    def length(self):
+        return self.end - self.start
+
+    @property
+    def total_length(self):
+        return float(self.length.sum())
+
+    def count(self, channel):
+        return int((self.channel == channel).sum())
+
+
+def street_positions(centers, pitch):
+    # Streets on both sides of every row or column of dies
+    if len(centers) == 0:
+        return np.empty(0)
+    count = int(round((centers.max() - centers.min()) / pitch)) + 2
+    return centers.min() - pitch / 2 + pitch * np.arange(count)
+
+
+@lru_cache(maxsize=DIE_MAP_CACHE_SIZE)
+def _cut_plan(key):
+    diameter, pitch_x, pitch_y, street, edge_exclusion, cut, offset = key
+    dies = _die_map(key)
+    radius = diameter / 2
+    bottom = -radius if cut is None else -cut
+    rows = street_positions(dies.y, pitch_y)
+    columns = street_positions(dies.x, pitch_x)
+    rows = rows[(np.abs(rows) < radius) & (rows > bottom)]
+    columns = columns[np.abs(columns) < radius]
+    # Every line is cut on the whole chord of the wafer, flat or notch excluded
+    half_rows = np.sqrt(radius**2 - rows**2)
+    half_columns = np.sqrt(radius**2 - columns**2)
+    plan = CutPlan(
+        channel=np.repeat(np.array([1, 2]), [len(rows), len(columns)]),
+        position=np.concatenate([rows, columns]),
+        start=np.concatenate([-half_rows, np.maximum(-half_columns, bottom)]),
+        end=np.concatenate([half_rows, half_columns]),
+    )
+    for array in plan:
+        array.setflags(write=False)
+    return plan
+
+
+def cut_plan(
+    diameter,
+    pitch_x,
+    pitch_y=None,
+    *,
+    street=0.0,
+    edge_exclusion=0.0,
+    shape=None,
+    offset=(0.0, 0.0),
+):
+    """
+    Cached `CutPlan` along the streets of the `die_map` of the same parameters.
+    """
+    return _cut_plan(
+        map_key(
+            diameter,
+            pitch_x,
+            pitch_y,
+            street=street,
+            edge_exclusion=edge_exclusion,
+            shape=shape,
+            offset=offset,
+        )
+    )
+
+
+def passes_per_step(depth_steps, depth_target=None):
+    """
+    Passes of every step of a multistep cut reaching `depth_target`.
+
+    Steps are performed in order with one pass each and the last one is repeated
+    until the target depth is reached, steps after the target are skipped. Without
+    a target every step makes one pass.
+    """
+    depth_steps = np.asarray(depth_steps, dtype=np.float64)
+    passes = np.ones(len(depth_steps), dtype=np.int64)
+    if depth_target is None or len(depth_steps) == 0:
+        return passes
+    before = np.concatenate([[0.0], np.cumsum(depth_steps)[:-1]])
+    passes[before >= depth_target] = 0
+    if before[-1] < depth_target:
+        passes[-1] = max(int(np.ceil((depth_target - before[-1]) / depth_steps[-1])), 1)
+    return passes
+
+
+def saw_times(cut_lengths, passes, feed_rates):
+    """
+    Time in seconds to cut lines of total `cut_lengths` in mm `passes` times at
+    `feed_rates` in mm/s. Arguments are broadcast, so many steps or many wafers of a
+    lot are evaluated at once.
+    """
+    arrays = (cut_lengths, passes, feed_rates)
+    cut_lengths, passes, feed_rates = np.broadcast_arrays(
+        *(np.asarray(array, dtype=np.float64) for array in arrays)
+    )
+    with np.errstate(divide='ignore'):
+        return cut_lengths * passes / feed_rates
+
+
+def die_ids(die_map, prefix=''):
+    """
+    Identifiers of the dies as `<prefix>R<row>C<column>`, zero padded.
+    """
+    width = len(str(max(die_map.row.max(initial=0), die_map.column.max(initial=0))))
+    rows = np.char.zfill(die_map.row.astype(str), width)
+    columns = np.char.zfill(die_map.column.astype(str), width)
+    return np.char.add(np.char.add(f'{prefix}R', rows), np.char.add('C', columns))
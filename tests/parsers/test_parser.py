@@ -0,0 +1,47 @@
+import logging
+import os.path
+import re
+
+import numpy as np
+from nomad.datamodel import EntryArchive
+from parsers import TOOL_LOG_HEADER_RE
+from parsers.tool_log import ToolLogParser, read_log_columns, sniff_header
+
+LOG_FILE = os.path.join('tests', 'data', 'example.out')
+
+
+def test_parse_file():
+    parser = ToolLogParser()
+    archive = EntryArchive()
+    parser.parse(LOG_FILE, archive, logging.getLogger())
+    log = archive.data
+
+    assert log.number_of_rows == len(log.temperature_ramps[0].time)
+    assert log.temperature_ramps[0].name == 'Zone 1 Temp'
+    assert log.temperature_ramps[0].values[-1].to('degC').magnitude == 300.0  # noqa: PLR2004
+    assert log.pressure_ramps[0].name == 'Chamber Pressure'
+    assert [ramp.name for ramp in log.massflow_ramps] == ['N2 Flow', 'O2 MFC']
+    assert list(log.unmapped_columns) == ['Heater Power [W]']
+
+
+def test_chunks_are_joined(tmp_path):
+    path = tmp_path / 'furnace.tsv'
+    stamps = np.arange('2025-01-01T00:00', '2025-01-01T01:00', dtype='datetime64[s]')
+    lines = [f'{stamp}\t{index}' for index, stamp in enumerate(stamps)]
+    path.write_text('Timestamp\tTC1 [C]\n' + '\n'.join(lines) + '\n')
+
+    delimiter, header = sniff_header(path)
+    time, values = read_log_columns(path, ['TC1 [C]'], chunk_rows=7)
+
+    assert delimiter == '\t'
+    assert header == ['Timestamp', 'TC1 [C]']
+    assert np.array_equal(time, np.arange(len(stamps)))
+    assert np.array_equal(values['TC1 [C]'], np.arange(len(stamps)))
+
+
+def test_header_signature():
+    with open(LOG_FILE, encoding='utf-8') as file:
+        assert re.search(TOOL_LOG_HEADER_RE, file.read())
+    assert re.search(TOOL_LOG_HEADER_RE, 'Timestamp\tTC1 [C]\n')
+    assert not re.search(TOOL_LOG_HEADER_RE, 'id,time,price\n1,10:00,3\n')
+    assert not re.search(TOOL_LOG_HEADER_RE, 'Time [s],Voltage [V]\n0,1.5\n')
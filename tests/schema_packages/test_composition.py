@@ -0,0 +1,122 @@
+import pytest
+import structlog
+from schema_packages import utils
+from schema_packages.composition import (
+    batch_elementality,
+    clear_composition_cache,
+    composition_cache_info,
+    composition_of,
+    parse_chemical_formula,
+)
+from structlog.testing import capture_logs
+
+
+@pytest.mark.parametrize(
+    'formula, expected',
+    [
+        ('(C5H8O2)1000', {'C': 5000, 'H': 8000, 'O': 2000}),
+        ('K4[Fe(CN)6].3H2O', {'K': 4, 'Fe': 1, 'C': 6, 'N': 6, 'H': 6, 'O': 3}),
+        ('CuSO4·5H2O', {'Cu': 1, 'S': 1, 'O': 9, 'H': 10}),
+        ('NaCl.2H2O.NH3', {'Na': 1, 'Cl': 1, 'H': 7, 'O': 2, 'N': 1}),
+        ('(CH3SiO1.5)10', {'C': 10, 'H': 30, 'Si': 10, 'O': 15}),
+        ('Al0.3Ga0.7As', {'Al': 0.3, 'Ga': 0.7, 'As': 1}),
+        ('Si1.5N2', {'Si': 1.5, 'N': 2}),
+        ('CaSO4·0.5H2O', {'Ca': 1, 'S': 1, 'O': 4.5, 'H': 1}),
+        ('CaSO4*0.5H2O', {'Ca': 1, 'S': 1, 'O': 4.5, 'H': 1}),
+        ('CuSO4.H2O', {'Cu': 1, 'S': 1, 'O': 5, 'H': 2}),
+        ('YBa2Cu3O6.5', {'Y': 1, 'Ba': 2, 'Cu': 3, 'O': 6.5}),
+    ],
+)
+def test_parse_chemical_formula(formula, expected):
+    elements, counts = parse_chemical_formula(formula)
+
+    assert dict(zip(elements, counts)) == pytest.approx(expected)
+
+
+def test_parse_unbalanced_formula():
+    with pytest.raises(ValueError):
+        parse_chemical_formula('(C5H8O2')
+
+
+@pytest.mark.parametrize('formula', ['CaSO4.0.5H2O', 'CuSO4.5H2O', 'CuSO4.5(H2O)'])
+def test_parse_ambiguous_dot(formula):
+    with pytest.raises(ValueError):
+        parse_chemical_formula(formula)
+
+
+def test_composition_record():
+    record = composition_of('SF6')
+
+    assert record.elements == ('S', 'F')
+    assert record.counts == (1, 6)
+    assert record.atomic_fractions == pytest.approx((1 / 7, 6 / 7))
+    assert sum(record.mass_fractions) == pytest.approx(1)
+
+
+def test_composition_cache():
+    formulas = ['SF6', 'SF6', ' SF6 ', 'C4F8', 'SF6']
+    unique = {formula.strip() for formula in formulas}
+    clear_composition_cache()
+    for formula in formulas:
+        composition_of(formula)
+
+    info = composition_cache_info()
+    assert info.misses == len(unique)
+    assert info.hits == len(formulas) - len(unique)
+    assert composition_of('SF6') is composition_of('SF6')
+
+
+def test_batch_elementality():
+    formulas = ['SF6', 'H2O', 'SF6', 'C4F8']
+    batch = batch_elementality(formulas)
+
+    assert batch.counts.shape == (len(formulas), 118)
+    for row, formula in enumerate(formulas):
+        record = composition_of(formula)
+        nonzero = batch.atomic_fractions[row][batch.counts[row] > 0]
+        assert sorted(nonzero) == pytest.approx(sorted(record.atomic_fractions))
+        assert batch.mass_fractions[row].sum() == pytest.approx(1)
+    assert batch.molar_masses[0] == pytest.approx(146.05, abs=0.01)
+
+
+def test_composition_fingerprint(monkeypatch):
+    chemical = utils.FabricationChemical(chemical_formula='SF6')
+    chemical.update_elemental_composition(chemical.chemical_formula)
+    reloaded = utils.FabricationChemical.m_from_dict(chemical.m_to_dict())
+    generated = []
+    generate = utils.generate_elementality
+    monkeypatch.setattr(
+        utils,
+        'generate_elementality',
+        lambda formula, logger: generated.append(formula) or generate(formula),
+    )
+
+    reloaded.update_elemental_composition(reloaded.chemical_formula)
+    assert generated == []
+    reloaded.chemical_formula = 'O2'
+    reloaded.update_elemental_composition(reloaded.chemical_formula)
+    assert generated == ['O2']
+    assert reloaded.elemental_composition[0].element == 'O'
+
+
+@pytest.mark.parametrize('formula', ['(C5H8O2', 'CuSO4.5H2O', 'Xy2O'])
+def test_invalid_formula_warns(formula):
+    chemical = utils.FabricationChemical(chemical_formula='SF6')
+    chemical.update_elemental_composition('SF6')
+
+    with capture_logs() as logs:
+        chemical.update_elemental_composition(formula, logger=structlog.get_logger())
+
+    assert not chemical.elemental_composition
+    assert [log['formula'] for log in logs] == [formula]
+
+
+def test_chemical_names():
+    clear_composition_cache()
+    compositions = [
+        utils.generate_elementality(name) for name in ['H2O', 'water', 'DI water']
+    ]
+
+    for composition in compositions:
+        assert [section.element for section in composition] == ['H', 'O']
+    assert composition_cache_info().currsize == 1
@@ -0,0 +1,60 @@
+import structlog
+from nomad.datamodel import EntryArchive
+from schema_packages import utils
+from schema_packages.calculus.calculus import (
+    EtchingRate,
+    EtchingRateInputs,
+    EtchingRateOutput,
+)
+from schema_packages.utils import FULL_NORMALIZATION_ENV, section_fingerprint
+
+
+def etching_rate(depth=100.0):
+    return EtchingRate(inputs=EtchingRateInputs(depth=depth, etching_time=50.0))
+
+
+def test_fingerprint_ignores_metadata():
+    sheet = etching_rate()
+    fingerprint = section_fingerprint(sheet)
+    sheet.notes = 'Checked twice'
+
+    assert section_fingerprint(sheet) == fingerprint
+    assert section_fingerprint(etching_rate(200.0)) != fingerprint
+
+
+def test_unchanged_sections_are_skipped(monkeypatch):
+    archive = EntryArchive()
+    logger = structlog.get_logger()
+    sheet = etching_rate()
+    sheet.normalize(archive, logger)
+    output = sheet.output
+
+    sheet.normalize(archive, logger)
+    assert sheet.output is output
+
+    sheet.inputs.etching_time = 25.0
+    sheet.normalize(archive, logger)
+    assert sheet.output is not output
+    assert sheet.output.etching_rate_value == 2 * output.etching_rate_value
+
+    output = sheet.output
+    monkeypatch.setenv(FULL_NORMALIZATION_ENV, '1')
+    sheet.normalize(archive, logger)
+    assert sheet.output is not output
+    assert isinstance(sheet.output, EtchingRateOutput)
+
+
+def test_new_versions_normalize_again(monkeypatch):
+    archive = EntryArchive()
+    logger = structlog.get_logger()
+    sheet = etching_rate()
+    sheet.normalize(archive, logger)
+    assert sheet.fingerprint_matches()
+
+    monkeypatch.setattr(EtchingRate, 'fingerprint_version', 2)
+    assert not sheet.fingerprint_matches()
+    sheet.normalize(archive, logger)
+    assert sheet.fingerprint_matches()
+
+    monkeypatch.setattr(utils, 'fingerprint_salt', lambda: 'next release')
+    assert not sheet.fingerprint_matches()
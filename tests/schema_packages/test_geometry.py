@@ -0,0 +1,48 @@
+import numpy as np
+import structlog
+from nomad.datamodel import EntryArchive
+from schema_packages.geometry import outline, unit_outline
+from schema_packages.Items import Circle, ItemPlacement, Rectangle, WaferWithFlat
+
+RADIUS = 5.0
+BASE = 4.0
+
+
+def test_outlines_are_cached_and_scaled():
+    x, y = outline('circle', 5.0)
+    x_flat, y_flat = outline('flat', 5.0, ratio=3.25 / 5)
+
+    assert unit_outline('circle') is unit_outline('circle')
+    assert np.allclose(np.hypot(x, y), 5.0)
+    # The flat is a chord of the requested length at the bottom of the wafer
+    assert np.isclose(y_flat.min(), -np.sqrt(5.0**2 - (3.25 / 2) ** 2))
+    assert np.isclose(np.ptp(x_flat[np.isclose(y_flat, y_flat.min())]), 3.25)
+    assert np.allclose(outline('rectangle', 4.0, 2.0)[1], [-1, -1, 1, 1, -1])
+
+
+def test_placement_figure():
+    archive = EntryArchive()
+    logger = structlog.get_logger()
+    placement = ItemPlacement(
+        item_center_x=1.0,
+        item_center_y=-2.0,
+        chuck_geometry=Circle(radius=10.0),
+    )
+    placement.normalize(archive, logger)
+    placement.normalize(archive, logger)
+    figure = placement.figures[0].figure
+
+    assert len(placement.figures) == 1
+    assert figure['config'] == {'staticPlot': True}
+    assert figure['data'][0]['fill'] == 'toself'
+    assert np.allclose(np.hypot(figure['data'][0]['x'], figure['data'][0]['y']), 10)
+    assert figure['data'][1]['x'] == [1.0]
+    assert figure['data'][1]['y'] == [-2.0]
+
+    placement.chuck_geometry = Rectangle(base=BASE, height=2.0)
+    placement.normalize(archive, logger)
+    assert max(placement.figures[0].figure['data'][0]['x']) == BASE / 2
+
+    placement.chuck_geometry = WaferWithFlat(radius=RADIUS, flat_length=32.5)
+    placement.normalize(archive, logger)
+    assert min(placement.figures[0].figure['data'][0]['y']) > -RADIUS
@@ -0,0 +1,78 @@
+import numpy as np
+from nomad.datamodel import EntryArchive, EntryMetadata
+from schema_packages.fabrication_utilities import (
+    Equipment,
+    FabricationProcessStep,
+    Jobdone,
+)
+from schema_packages.history import HISTORY_DIR_ENV, HistoryStore, record_history
+
+COATING_START = 50.5
+
+
+def test_traveler(tmp_path):
+    store = HistoryStore(str(tmp_path), compact_size=200)
+    for index in range(20):
+        store.add(f'step{index}', [(f'W{index % 4}', 'Step', 100.0 - index, 'EQ1')])
+    store.add('step1', [('W2', 'Coating', COATING_START, 'EQ2')])
+    store.add('undated', [('W1', 'Step', np.nan, '')])
+
+    traveler = store.traveler('W1')
+
+    assert len(store.table()) > 0
+    assert [record.entry for record in traveler] == [
+        'step17',
+        'step13',
+        'step9',
+        'step5',
+        'undated',
+    ]
+    assert [record.start for record in store.traveler('W2')][0] == COATING_START
+    assert store.traveler('missing item') == []
+
+
+def test_interrupted_compaction(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    store.add('first', [('W1', 'Step', 1.0, '')])
+    # A compaction stopped after claiming the log
+    (tmp_path / 'history.jsonl').rename(tmp_path / 'history.jsonl.merging')
+    store.add('second', [('W1', 'Step', 2.0, '')])
+
+    store.compact()
+    store.compact()
+
+    assert [record.entry for record in store.traveler('W1')] == ['first', 'second']
+    assert not (tmp_path / 'history.jsonl.merging').exists()
+
+
+def test_traveler_follows_other_writers(tmp_path):
+    reader = HistoryStore(str(tmp_path))
+    writer = HistoryStore(str(tmp_path))
+    writer.add('first', [('W1', 'Step', 1.0, '')])
+
+    assert [record.entry for record in reader.traveler('W1')] == ['first']
+    writer.add('second', [('W1', 'Step', 2.0, '')])
+    writer.add('first', [('W2', 'Step', 1.0, '')])
+    assert [record.entry for record in reader.traveler('W1')] == ['second']
+    writer.compact()
+    writer.add('third', [('W1', 'Step', 3.0, '')])
+    assert [record.entry for record in reader.traveler('W1')] == ['second', 'third']
+    assert [record.entry for record in reader.traveler('W2')] == ['first']
+
+
+def test_section_records(monkeypatch, tmp_path):
+    monkeypatch.setenv(HISTORY_DIR_ENV, str(tmp_path))
+    step = FabricationProcessStep(name='Cleaning', id_item_processed='W1, W2')
+    equipment = Equipment(
+        lab_id='EQ1',
+        equipmentLogBook=[Jobdone(name='Job 1', id_items_processed=[7, 8])],
+    )
+    archive = EntryArchive(metadata=EntryMetadata(entry_id='equipment'))
+    archive.data = equipment
+
+    record_history(archive, equipment)
+    (record,) = HistoryStore(str(tmp_path)).traveler('8')
+
+    assert [item for item, *_ in step.history_records()] == ['W1', 'W2']
+    assert record.step_type == 'Job 1'
+    assert record.equipment == 'EQ1'
@@ -0,0 +1,63 @@
+import json
+import subprocess
+import sys
+from importlib.metadata import entry_points
+
+import pytest
+
+# Generous budget in seconds for a cold load() of one entry point, where NOMAD is
+# already imported. It only catches gross regressions, timings are machine dependent
+ENTRY_POINT_BUDGET = 20.0
+
+# Modules that must be imported only when a figure is produced
+DEFERRED_MODULES = ['plotly.express', 'plotly.graph_objects']
+
+LOAD_ENTRY_POINT = """
+import json
+import sys
+import time
+from importlib.metadata import entry_points
+
+import nomad.datamodel.metainfo.basesections
+import nomad.datamodel.metainfo.eln
+import nomad.datamodel.metainfo.plot
+import nomad.datamodel.metainfo.workflow
+
+try:
+    plugins = entry_points(group='nomad.plugin')
+except TypeError:
+    plugins = entry_points()['nomad.plugin']
+
+plugin = next(plugin for plugin in plugins if plugin.value == sys.argv[1])
+start = time.perf_counter()
+plugin.load().load()
+seconds = time.perf_counter() - start
+
+print(json.dumps({'seconds': seconds, 'modules': sorted(sys.modules)}))
+"""
+
+
+def schema_entry_points():
+    try:
+        plugins = entry_points(group='nomad.plugin')
+    except TypeError:
+        plugins = entry_points()['nomad.plugin']
+    return sorted(
+        plugin.value for plugin in plugins if plugin.value.startswith('schema_packages')
+    )
+
+
+@pytest.mark.parametrize('entry_point', schema_entry_points())
+def test_entry_point_load_time(entry_point):
+    # One fresh interpreter per entry point, so that every load() is cold
+    process = subprocess.run(
+        [sys.executable, '-c', LOAD_ENTRY_POINT, entry_point],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    report = json.loads(process.stdout.splitlines()[-1])
+    print(f'{entry_point}: {report["seconds"]:.3f} s')
+
+    assert not set(DEFERRED_MODULES) & set(report['modules'])
+    assert report['seconds'] < ENTRY_POINT_BUDGET
@@ -0,0 +1,106 @@
+import structlog
+from nomad.datamodel import EntryArchive, EntryMetadata
+from schema_packages.Items import Item, WaferMap
+from schema_packages.lineage import (
+    LINEAGE_DIR_ENV,
+    LineageIndex,
+    LineageStore,
+    StepVisit,
+    entry_key,
+    index_entry,
+    lineage_store,
+    split_ids,
+)
+from schema_packages.steps.transform.dicing.dicing import Dicing
+from schema_packages.steps.utils import DicingOutputs
+
+
+def visit(entry, item):
+    return item, StepVisit(entry, 'Step', entry)
+
+
+def test_lineage_queries():
+    index = LineageIndex()
+    index.update('cut', [('W1', 'H1'), ('W1', 'H2')], [visit('cut', 'W1')])
+    index.update('dice', [('H1', 'D1'), ('H1', 'D2')], [visit('dice', 'H1')])
+    index.update('clean', [], [visit('clean', 'W0'), visit('clean', 'D1')])
+    index.update('oxide', [('W0', 'W1')], [])
+
+    assert index.ancestors('D1') == ['H1', 'W1', 'W0']
+    assert index.descendants('W1') == ['H1', 'H2', 'D1', 'D2']
+    history = [step.entry for step in index.history('D1')]
+    assert history == ['clean', 'dice', 'cut', 'clean']
+    assert index.find_cycle() is None
+
+    # Indexing an entry again replaces its links
+    index.update('dice', [('H2', 'D1')], [])
+    assert index.parents('D1') == ['H2']
+    assert index.descendants('H1') == []
+
+    assert index.update('wrong', [('D1', 'W0')]) == [('D1', 'W0')]
+    assert index.find_cycle() == ['W1', 'H2', 'D1', 'W0', 'W1']
+    index.remove('wrong')
+    assert index.find_cycle() is None
+
+
+def test_shared_store(tmp_path):
+    # Two processes normalizing entries of the same lab
+    first, second = LineageStore(str(tmp_path)), LineageStore(str(tmp_path))
+    first.update('cut', [('W1', 'H1')], [visit('cut', 'W1')])
+    second.update('dice', [('H1', 'D1')], [])
+    first.update('cut', [('W1', 'H2')], [visit('cut', 'W1')])
+
+    assert second.refresh().ancestors('D1') == ['H1']
+    assert second.index.parents('H2') == ['W1']
+    assert first.refresh().history('H2') == [visit('cut', 'W1')[1]]
+
+    # Re-parented and deleted entries leave no links
+    second.update('dice', [], [])
+    first.remove('cut')
+    assert second.refresh().ancestors('D1') == []
+    assert second.index.children('W1') == []
+    first.update('cut', [('W1', 'H3')], [visit('cut', 'W1')])
+
+    # The log keeps the last lines of every entry only
+    first.compact()
+    reloaded = LineageStore(str(tmp_path)).refresh()
+    assert reloaded.entries() == second.refresh().entries()
+    assert list(reloaded.entries()) == ['cut']
+    assert len((tmp_path / 'lineage.jsonl').read_text().splitlines()) == len(reloaded)
+
+
+def test_sections_lineage(monkeypatch, tmp_path):
+    monkeypatch.setenv(LINEAGE_DIR_ENV, str(tmp_path))
+    dicing = Dicing(
+        name='Dicing',
+        id_item_processed='W1',
+        outputs=DicingOutputs(wafer_diced_id=['W1_R00C00', 'W1_R00C01']),
+    )
+    links, visits = dicing.lineage('dicing')
+    archive = EntryArchive(metadata=EntryMetadata(entry_id='item'))
+    archive.data = Item(lab_id='H1', id_wafer_parent='W1')
+    index_entry(archive, archive.data)
+    parents = lineage_store().refresh().parents('H1')
+
+    assert split_ids('W1, W2;W1\n') == ['W1', 'W2']
+    assert links == [('W1', 'W1_R00C00'), ('W1', 'W1_R00C01')]
+    assert visits == [('W1', StepVisit('dicing', 'Dicing', 'Dicing'))]
+    assert parents == ['W1']
+    assert entry_key(EntryArchive()) is None
+
+
+def test_dicing_indexed_once(monkeypatch, tmp_path):
+    monkeypatch.setenv(LINEAGE_DIR_ENV, str(tmp_path))
+    archive = EntryArchive(metadata=EntryMetadata(entry_id='dicing'))
+    archive.data = Dicing(
+        name='Dicing',
+        id_item_processed='W1',
+        wafer_map=WaferMap(wafer_diameter=100.0, die_pitch_x=10.0),
+    )
+    archive.data.wafer_map.normalize(archive, structlog.get_logger())
+
+    archive.data.normalize(archive, structlog.get_logger())
+
+    assert len((tmp_path / 'lineage.jsonl').read_text().splitlines()) == 1
+    children = lineage_store().refresh().children('W1')
+    assert len(children) == archive.data.wafer_map.number_of_full_dies
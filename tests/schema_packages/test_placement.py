@@ -0,0 +1,77 @@
+import numpy as np
+import structlog
+from nomad.datamodel import EntryArchive
+from schema_packages.Items import Circle, ItemPlacement, Square
+from schema_packages.placement import (
+    Chuck,
+    check_placement,
+    contained,
+    overlaps,
+    pack_items,
+    slot_conflicts,
+)
+
+# 6 inch chuck, radius in cm
+CHUCK = Chuck('circle', 7.62, 7.62)
+DIE = (0.5, 0.5, 0.0)
+# Dies of 1 cm fitting the chuck, at least
+CHUCK_CAPACITY = 100
+ITEMS = 16
+FEW_ITEMS = 9
+FLAT_CUT = 6.0
+
+
+def test_containment_and_overlaps():
+    centers = [[0, 0], [1.0, 0], [0.5, 0.5], [7.5, 0], [-3, -3]]
+    extents = ([0.5, 0.5, 0.0, 0.5, 0.0], [0.5, 0.5, 0.0, 0.5, 0.0], [0, 0, 1, 0, 1])
+
+    inside = contained(CHUCK, centers, extents)
+    overlapping = overlaps(centers, extents)
+    outside, pairs = check_placement(CHUCK, centers, extents)
+
+    assert inside.tolist() == [True, True, True, False, True]
+    # Squares sharing a side touch but do not overlap
+    assert not overlapping[0, 1]
+    assert overlapping[0, 2] and overlapping[2, 0]
+    assert outside.tolist() == [3]
+    assert pairs.tolist() == [[0, 2], [1, 2]]
+
+
+def test_packing():
+    centers = pack_items(CHUCK, DIE, spacing=0.1)
+    some = pack_items(CHUCK, DIE, count=ITEMS, spacing=0.1)
+    flat = pack_items(Chuck('circle', 7.62, 7.62, FLAT_CUT), DIE)
+
+    outside, pairs = check_placement(CHUCK, centers, DIE)
+    assert len(centers) > CHUCK_CAPACITY
+    assert len(outside) == 0
+    assert len(pairs) == 0
+    assert len(some) == ITEMS
+    assert np.hypot(*some.T).max() <= np.hypot(*centers.T).max()
+    assert (flat[:, 1] - 0.5).min() >= -FLAT_CUT
+
+
+def test_placement_section():
+    archive = EntryArchive()
+    logger = structlog.get_logger()
+    placement = ItemPlacement(
+        chuck_geometry=Circle(radius=7.62),
+        item_geometry=Square(side=1.0),
+        number_of_items=ITEMS,
+    )
+    placement.normalize(archive, logger)
+
+    assert placement.items_auto_placed
+    assert len(placement.items_center_x) == ITEMS
+    assert len(placement.figures[0].figure['data'][2]['x']) == ITEMS
+
+    # Generated centers follow the number of items, edited ones are kept
+    placement.number_of_items = FEW_ITEMS
+    placement.normalize(archive, logger)
+    assert len(placement.items_center_x) == FEW_ITEMS
+    placement.items_auto_placed = False
+    placement.number_of_items = ITEMS
+    placement.normalize(archive, logger)
+    assert len(placement.items_center_x) == FEW_ITEMS
+    assert slot_conflicts(25, [1, 3, 3, 26])[0].tolist() == [26]
+    assert slot_conflicts(25, [1, 3, 3, 26])[1].tolist() == [3]
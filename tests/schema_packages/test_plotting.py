@@ -0,0 +1,59 @@
+import json
+
+import numpy as np
+import structlog
+from nomad.datamodel import EntryArchive
+from schema_packages import plotting
+from schema_packages.plotting import downsample_indices, line_figure
+from schema_packages.utils import TimeRampPressure
+
+MAX_POINTS = 200
+
+
+def test_downsampling_keeps_peaks():
+    time = np.arange(36_000, dtype=np.float64)
+    values = np.sin(time / 1000)
+    values[[1234, 20_000]] = [50, -50]
+
+    figure = line_figure(time, values, 'Time (s)', 'T', max_points=MAX_POINTS)
+    x, y = figure['data'][0]['x'], figure['data'][0]['y']
+
+    assert len(y) <= MAX_POINTS
+    assert max(y) == values.max()
+    assert min(y) == values.min()
+    assert x[0] == time[0]
+    assert x[-1] == time[-1]
+    assert np.all(np.diff(downsample_indices(values, MAX_POINTS)) > 0)
+
+
+def test_figures_are_valid_json():
+    values = np.array([1.0, np.nan, 3.0])
+    outline = (values, values)
+    figures = [
+        line_figure(values, values, 'Time (s)', 'T'),
+        plotting.outline_figure(*outline, [(np.nan, 0.0)], 'Chuck'),
+    ]
+
+    for figure in figures:
+        assert json.loads(json.dumps(figure, allow_nan=False)) == figure
+    assert figures[0]['data'][0]['y'] == [1.0, None, 3.0]
+
+
+def test_ramp_figure_cache(monkeypatch):
+    archive = EntryArchive()
+    logger = structlog.get_logger()
+    ramp = TimeRampPressure(time=[0.0, 1.0, 2.0], values=[1.0, 0.5, 0.1])
+    ramp.normalize(archive, logger)
+    built = []
+    monkeypatch.setattr(
+        plotting, 'line_figure', lambda *args, **kwargs: built.append(args)
+    )
+
+    ramp.normalize(archive, logger)
+    copy = TimeRampPressure.m_from_dict(ramp.m_to_dict())
+    copy.figures = []
+    copy.normalize(archive, logger)
+
+    assert built == []
+    assert copy.figure_key == ramp.figure_key
+    assert copy.figures[0].figure == ramp.figures[0].figure
@@ -0,0 +1,50 @@
+import json
+import tracemalloc
+
+import structlog
+from nomad.datamodel import EntryArchive
+from schema_packages import profiling
+from schema_packages.Items import Circle, ItemPlacement, m_package
+from structlog.testing import capture_logs
+
+
+def section_classes(section_def, seen):
+    # Classes of the sections reached by the instrumentation of a package
+    if section_def in seen:
+        return
+    seen.add(section_def)
+    yield section_def.section_cls
+    for base in section_def.base_sections:
+        yield from section_classes(base, seen)
+    for sub_section in section_def.all_sub_sections.values():
+        yield from section_classes(sub_section.section_def, seen)
+
+
+def test_normalization_profile(monkeypatch, tmp_path):
+    monkeypatch.setenv(profiling.PROFILE_ENV, '1')
+    monkeypatch.setenv(profiling.PROFILE_DIR_ENV, str(tmp_path))
+    # The instrumented normalize methods are restored after the test
+    seen = set()
+    for section_def in m_package.section_definitions:
+        for section_cls in section_classes(section_def, seen):
+            if 'normalize' in vars(section_cls):
+                monkeypatch.setattr(section_cls, 'normalize', section_cls.normalize)
+    profiling.profiled(m_package)
+    archive = EntryArchive()
+    archive.data = ItemPlacement(
+        item_center_x=1.0, item_center_y=1.0, chuck_geometry=Circle(radius=10.0)
+    )
+
+    with capture_logs() as logs:
+        archive.data.chuck_geometry.normalize(archive, structlog.get_logger())
+        archive.data.normalize(archive, structlog.get_logger())
+    tracemalloc.stop()
+    (dump,) = tmp_path.glob('*.json')
+    report = json.loads(dump.read_text())
+
+    assert getattr(ItemPlacement.normalize, '__profiled__', False)
+    assert [log['event'] for log in logs] == ['normalization profile']
+    assert logs[0]['sections'][0]['section'] == 'ItemPlacement'
+    assert logs[0]['sections'][0]['calls'] == 1
+    assert report['sections'] == logs[0]['sections']
+    assert profiling.PROFILE.sections == {}
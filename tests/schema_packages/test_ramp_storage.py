@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+import structlog
+from nomad.datamodel import EntryArchive
+from nomad.datamodel.context import ClientContext
+from schema_packages.ramp_storage import delta_decode, delta_encode
+from schema_packages.tool_log import ToolLog
+from schema_packages.utils import TimeRampPressure
+
+POINTS = 10_000
+SLICE = slice(5_000, 5_100)
+
+
+def test_delta_encoding_slices():
+    values = 1000 + np.cumsum(np.random.default_rng(0).normal(size=POINTS))
+    quantum, anchors, deltas = delta_encode(values, block_size=64)
+
+    decoded = delta_decode(quantum, anchors, deltas, block_size=64)
+    part = delta_decode(
+        quantum, anchors, deltas, SLICE.start, SLICE.stop, block_size=64
+    )
+
+    assert deltas.dtype == np.int64
+    assert np.abs(decoded - values).max() <= quantum
+    assert np.array_equal(part, decoded[SLICE])
+
+
+def test_delta_encoding_rejects_nan():
+    values = np.linspace(0, 1, POINTS)
+    values[SLICE.start] = np.nan
+
+    with pytest.raises(ValueError):
+        delta_encode(values)
+
+
+def test_delta_storage_keeps_nan():
+    archive = EntryArchive()
+    values = np.linspace(1000, 1, POINTS)
+    values[SLICE.start] = np.nan
+    ramp = TimeRampPressure(time=np.arange(POINTS), values=values, storage='delta')
+    archive.data = ToolLog(pressure_ramps=[ramp])
+    ramp.normalize(archive, structlog.get_logger())
+
+    assert ramp.values_deltas is None
+    stored = ramp.read_values().magnitude
+    assert np.isnan(stored[SLICE.start])
+    assert np.array_equal(np.isnan(stored), np.isnan(values))
+    assert np.allclose(stored[SLICE.stop :], values[SLICE.stop :])
+
+
+@pytest.mark.parametrize('storage', ['uniform', 'delta', 'sidecar'])
+def test_compact_storage(storage, tmp_path):
+    archive = EntryArchive(m_context=ClientContext(local_dir=str(tmp_path)))
+    logger = structlog.get_logger()
+    time = np.arange(POINTS) * 0.5
+    values = np.linspace(1000, 1, POINTS)
+    ramp = TimeRampPressure(time=time, values=values, storage=storage)
+    archive.data = ToolLog(pressure_ramps=[ramp])
+    ramp.normalize(archive, logger)
+    stored = ramp.m_to_dict()
+
+    assert 'time' not in stored
+    assert ramp.number_of_points == POINTS
+    assert np.allclose(ramp.read_time(SLICE.start, SLICE.stop).magnitude, time[SLICE])
+    # Delta encoded values are exact within one quantum
+    error = np.abs(ramp.read_values().magnitude - values).max()
+    assert error <= (ramp.values_quantum or 0)
+
+    ramp.storage = 'full'
+    ramp.normalize(archive, logger)
+
+    assert len(ramp.values) == POINTS
+    assert ramp.number_of_points is None
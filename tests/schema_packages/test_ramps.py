@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+import structlog
+from nomad.datamodel import EntryArchive
+from schema_packages import utils
+from schema_packages.ramps import RAMP_BEHAVIORS, synthesize_ramps
+from schema_packages.steps.transform.thermal_process.oxidation import (
+    ThermalOxidationbase,
+)
+from schema_packages.utils import TimeRampPressure, TimeRampTemperature
+
+SAMPLES = 11
+
+
+@pytest.mark.parametrize('behavior', RAMP_BEHAVIORS)
+def test_profiles_reach_end_values(behavior):
+    start, end = np.array([20.0, 100.0]), np.array([120.0, 0.0])
+    time, values = synthesize_ramps(
+        start, end, [10.0, 5.0], [behavior, behavior], SAMPLES
+    )
+
+    assert time.shape == values.shape == (len(start), SAMPLES)
+    assert np.allclose(values[:, 0], start)
+    assert np.allclose(values[:, -1], end)
+    assert np.allclose(time[:, -1], [10.0, 5.0])
+
+
+def test_missing_parameter_is_inferred():
+    archive = EntryArchive()
+    logger = structlog.get_logger()
+    ramp = TimeRampTemperature(start_value=25, end_value=125, rate=2)
+    ramp.normalize(archive, logger)
+
+    assert ramp.duration.magnitude == ramp.time[-1].magnitude
+    assert ramp.inferred_parameter == 'duration'
+
+    ramp.end_value = 225
+    ramp.normalize(archive, logger)
+
+    assert ramp.values[-1].magnitude == ramp.end_value.magnitude
+    assert ramp.duration.magnitude == ramp.time[-1].magnitude
+
+    given = TimeRampPressure(time=[0, 1], values=[1, 2], start_value=1, rate=1)
+    given.increment_duration = 5
+    given.normalize(archive, logger)
+
+    assert list(given.values.magnitude) == [1, 2]
+
+
+def test_sibling_ramps_are_generated_together(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        utils,
+        'synthesize_ramps',
+        lambda *args, **kwargs: calls.append(args) or synthesize_ramps(*args, **kwargs),
+    )
+    step = ThermalOxidationbase(
+        temperature_ramps=[
+            TimeRampTemperature(start_value=25, end_value=900, duration=600),
+            TimeRampTemperature(start_value=900, end_value=900, duration=3600),
+            TimeRampTemperature(start_value=900, end_value=25, rate=-1),
+        ]
+    )
+    for ramp in step.temperature_ramps:
+        ramp.normalize(EntryArchive(), structlog.get_logger())
+
+    assert len(calls) == 1
+    assert all(len(ramp.values) > 0 for ramp in step.temperature_ramps)
+    assert step.temperature_ramps[2].duration.magnitude == 875  # noqa: PLR2004
@@ -0,0 +1,44 @@
+import structlog
+from nomad.datamodel import EntryArchive
+from schema_packages.fabrication_utilities import (
+    FabricationProcess,
+    FabricationProcessStep,
+)
+
+STEPS = 200
+
+
+class CountingContext:
+    """
+    Context serving step archives from memory, counting the archives loaded.
+    """
+
+    def __init__(self):
+        self.loaded = []
+
+    def resolve_archive_url(self, url):
+        self.loaded.append(url)
+        if 'missing' in url:
+            raise FileNotFoundError(url)
+        name = url.rsplit('/', 1)[1].split('.')[0]
+        return EntryArchive(data=FabricationProcessStep(name=name))
+
+
+def test_steps_resolved_in_batch():
+    context = CountingContext()
+    archive = EntryArchive(m_context=context)
+    urls = [f'../upload/archive/mainfile/step_{i}.archive.json' for i in range(STEPS)]
+    missing = '../upload/archive/mainfile/missing.archive.json'
+    process = FabricationProcess(
+        steps=[f'{url}#data' for url in urls] + [f'{urls[0]}#/data', f'{missing}#data']
+    )
+    archive.data = process
+
+    process.normalize(archive, structlog.get_logger())
+    steps = process.resolved_steps(archive)
+
+    # Every archive is loaded once, for both normalize and later aggregates
+    assert sorted(context.loaded) == sorted([*urls, missing])
+    assert [step.name for step in steps[:3]] == ['step_0', 'step_1', 'step_2']
+    assert steps[STEPS] is steps[0]
+    assert steps[-1] is None
@@ -0,0 +1,67 @@
+import numpy as np
+import structlog
+from nomad.datamodel import EntryArchive
+from schema_packages.calculus.calculus import EtchingRate, EtchingRateInputs
+from schema_packages.site_maps import map_statistics, radial_fit
+from structlog.testing import capture_logs
+
+# 49 sites on rings of a 200 mm wafer
+RADII = np.repeat([0, 30, 60, 90], [1, 8, 16, 24])
+ANGLES = np.concatenate(
+    [np.linspace(0, 2 * np.pi, count, endpoint=False) for count in [1, 8, 16, 24]]
+)
+X, Y = RADII * np.cos(ANGLES), RADII * np.sin(ANGLES)
+
+
+def test_batch_of_maps():
+    centers = np.linspace(10, 20, 300)[:, None]
+    values = centers * (1 + 0.05 * (RADII / 90) ** 2)
+    values[0, -1] = np.nan
+
+    statistics = map_statistics(values)
+    fit = radial_fit(X, Y, values)
+    radius, profile = fit.profile()
+
+    assert statistics.mean.shape == (300,)
+    assert np.allclose(statistics.minimum, centers[:, 0])
+    # Half range over the mean, the mean of (r / 90)^2 on the sites is 32 / 49
+    assert np.allclose(statistics.non_uniformity[1:], 2.5 / (1 + 0.05 * 32 / 49))
+    assert np.allclose(fit.coefficients[:, :2], np.hstack([centers, 0.05 * centers]))
+    assert np.allclose(profile[:, -1], 1.05 * centers[:, 0])
+    assert radius.shape == (300, 50)
+
+
+def test_etching_rate_map():
+    archive = EntryArchive()
+    sheet = EtchingRate(
+        inputs=EtchingRateInputs(
+            etching_time=10.0,
+            site_depth=100 + 10 * (RADII / 90) ** 2,
+            site_x=X,
+            site_y=Y,
+        )
+    )
+
+    sheet.normalize(archive, structlog.get_logger())
+    output = sheet.output
+
+    assert output.site_rate.shape == (49,)
+    assert np.isclose(output.rate_minimum.magnitude, 10)
+    assert np.isclose(output.rate_maximum.magnitude, 11)
+    assert np.isclose(output.radial_profile_rate.magnitude[-1], 11)
+    assert np.isclose(output.etching_rate_value, np.mean(output.site_rate))
+
+
+def test_mismatched_sites():
+    sheet = EtchingRate(
+        inputs=EtchingRateInputs(
+            etching_time=10.0, site_depth=100 + 0 * RADII, site_x=X, site_y=Y[:-1]
+        )
+    )
+
+    with capture_logs() as logs:
+        sheet.normalize(EntryArchive(), structlog.get_logger())
+
+    assert sheet.output.radial_profile_rate is None
+    assert np.isclose(sheet.output.etching_rate_value.magnitude, 10)
+    assert [log['log_level'] for log in logs] == ['error']
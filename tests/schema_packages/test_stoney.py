@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+import structlog
+from nomad.datamodel import EntryArchive
+from schema_packages.calculus.calculus import (
+    StressParametersAdopted,
+    StressProperties,
+    StressPropertiesInputs,
+)
+from schema_packages.stoney import local_curvature, stoney_stress
+from structlog.testing import capture_logs
+
+# Scans of 100 mm with 2001 points, in m
+POSITION = np.linspace(-0.05, 0.05, 2001)
+RADII = np.array([5.0, 20.0, 100.0])
+
+# Silicon substrate of 525 um with a film of 1 um
+YOUNG, POISSON, SUBSTRATE, FILM = 130e9, 0.28, 525e-6, 1e-6
+
+
+def exact_curvature(position, radius):
+    # Curvature of the parabola of the scans
+    return 1 / radius / (1 + (position / radius) ** 2) ** 1.5
+
+
+def test_batch_of_scans():
+    heights = POSITION**2 / (2 * RADII[:, None])
+    shuffled = np.random.default_rng(0).permutation(len(POSITION))
+
+    centers, curvature = local_curvature(POSITION, heights)
+    _, unsorted = local_curvature(POSITION[shuffled], heights[:, shuffled])
+    stress = stoney_stress(curvature, YOUNG, POISSON, SUBSTRATE, FILM)
+
+    assert curvature.shape == (3, 2001 - 30)
+    assert np.allclose(curvature, exact_curvature(centers, RADII[:, None]))
+    assert np.allclose(unsorted, curvature)
+    assert np.allclose(
+        stress[:, 1000 - 15],
+        YOUNG * SUBSTRATE**2 / (6 * (1 - POISSON) * FILM * RADII),
+    )
+
+
+def test_stress_map_section():
+    sheet = StressProperties(
+        inputs=StressPropertiesInputs(
+            substrate_thickness=SUBSTRATE * 1e9,
+            layer_thickness=FILM * 1e9,
+            scan_position=POSITION * 1e3,
+            height_before=POSITION**2 / (2 * 100.0) * 1e6,
+            height_after=POSITION**2 / (2 * 20.0) * 1e6,
+        ),
+        parameters=StressParametersAdopted(
+            assumed_Young_module_of_the_substrate=YOUNG / 1e9,
+            assumed_Poisson_coefficient=POISSON,
+            curvature_fit_points=51,
+        ),
+    )
+
+    sheet.normalize(EntryArchive(), structlog.get_logger())
+    expected = stoney_stress(1 / 20.0 - 1 / 100.0, YOUNG, POISSON, SUBSTRATE, FILM)
+
+    assert sheet.output.stress_profile.shape == (2001 - 50,)
+    assert np.isclose(sheet.output.stress_value.to('Pa').magnitude, expected, rtol=1e-3)
+
+
+def test_scans_of_other_lengths():
+    sheet = StressProperties(
+        inputs=StressPropertiesInputs(
+            substrate_thickness=SUBSTRATE * 1e9,
+            layer_thickness=FILM * 1e9,
+            scan_position=POSITION * 1e3,
+            curvature_after=np.full(len(POSITION) - 1, 0.05),
+        ),
+        parameters=StressParametersAdopted(
+            assumed_Young_module_of_the_substrate=YOUNG / 1e9,
+            assumed_Poisson_coefficient=POISSON,
+        ),
+    )
+
+    with capture_logs() as logs:
+        sheet.normalize(EntryArchive(), structlog.get_logger())
+
+    assert sheet.output is None
+    assert [log['log_level'] for log in logs] == ['error']
+
+
+@pytest.mark.parametrize('points', [0, 21])
+def test_scans_shorter_than_the_window(points):
+    sheet = StressProperties(
+        inputs=StressPropertiesInputs(
+            substrate_thickness=SUBSTRATE * 1e9,
+            layer_thickness=FILM * 1e9,
+            scan_position=POSITION[:points] * 1e3,
+            height_after=POSITION[:points] ** 2 / (2 * 20.0) * 1e6,
+        ),
+        parameters=StressParametersAdopted(
+            assumed_Young_module_of_the_substrate=YOUNG / 1e9,
+            assumed_Poisson_coefficient=POISSON,
+        ),
+    )
+
+    with capture_logs() as logs:
+        sheet.normalize(EntryArchive(), structlog.get_logger())
+
+    assert sheet.output is None
+    assert [log['log_level'] for log in logs] == ['warning']
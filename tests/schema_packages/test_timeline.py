@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from schema_packages.fabrication_utilities import (
+    FabricationProcess,
+    FabricationProcessStep,
+)
+from schema_packages.timeline import step_timeline
+
+START = datetime(2026, 3, 2, 8, tzinfo=timezone.utc)
+# Three steps of one hour starting every two hours
+CYCLE_HOURS = 5
+IDLE_HOURS = 2
+
+
+def test_batch_timeline():
+    # Second process has a step without dates and one without end
+    starts = [[0, 15, 12], [100, np.nan, 160]]
+    ends = [[10, 20, 30], [130, np.nan, np.nan]]
+    durations = [[np.nan, np.nan, 5], [np.nan, np.nan, 20]]
+
+    timeline = step_timeline(starts, ends, durations)
+
+    assert timeline.origin.tolist() == [0, 100]
+    assert np.array_equal(timeline.wait, [[0, 0, 2], [0, np.nan, 30]], equal_nan=True)
+    assert timeline.cycle_time.tolist() == [30, 80]
+    assert timeline.touch_time.tolist() == [20, 50]
+    assert timeline.idle_time.tolist() == [2, 30]
+
+
+def test_process_timeline():
+    steps = [
+        FabricationProcessStep(
+            name=f'step {i}',
+            starting_date=START + timedelta(hours=2 * i),
+            ending_date=START + timedelta(hours=2 * i + 1),
+        )
+        for i in range(3)
+    ]
+    process = FabricationProcess()
+
+    process.compute_timeline([*steps, None])
+
+    assert process.cycle_time.to('hour').magnitude == CYCLE_HOURS
+    assert process.idle_time.to('hour').magnitude == IDLE_HOURS
+    assert process.step_wait_time.to('hour').magnitude[:3].tolist() == [0, 1, 1]
+    assert process.starting_date == START
+    assert process.ending_date == START + timedelta(hours=CYCLE_HOURS)
+    assert process.figures[0].figure['data'][1]['y'][-1] == '4. Unresolved'
+
+
+def test_derived_dates_follow_steps():
+    step = FabricationProcessStep(
+        starting_date=START, ending_date=START + timedelta(hours=1)
+    )
+    given = START - timedelta(days=1)
+    process = FabricationProcess(starting_date=given)
+
+    process.compute_timeline([step])
+    assert process.starting_date == given
+    assert process.derived_starting_date is None
+    assert process.derived_ending_date == step.ending_date
+
+    step.ending_date = START + timedelta(hours=3)
+    process.compute_timeline([step])
+    assert process.ending_date == step.ending_date
+
+    edited = START + timedelta(days=1)
+    process.ending_date = edited
+    process.compute_timeline([step])
+    assert process.ending_date == edited
+
+    process.compute_timeline([])
+    assert process.ending_date == edited
+    assert process.starting_date == given
+
+
+def test_derived_dates_are_cleared():
+    step = FabricationProcessStep(
+        starting_date=START, ending_date=START + timedelta(hours=1)
+    )
+    process = FabricationProcess()
+    process.compute_timeline([step])
+    reloaded = FabricationProcess.m_from_dict(process.m_to_dict())
+
+    reloaded.compute_timeline([])
+
+    assert reloaded.starting_date is None
+    assert reloaded.ending_date is None
@@ -0,0 +1,136 @@
+import numpy as np
+import pytest
+import structlog
+from nomad.datamodel import EntryArchive
+from schema_packages.Items import Circle, Item, WaferMap
+from schema_packages.steps.transform.dicing.dicing import Dicing, Dicingbase
+from schema_packages.wafer_map import (
+    cut_plan,
+    die_ids,
+    die_map,
+    passes_per_step,
+    saw_times,
+    wafer_cut,
+)
+from structlog.testing import capture_logs
+
+# Usable radius in mm of a 100 mm wafer with 3 mm of edge exclusion
+USABLE_RADIUS = 47.0
+WAFER_DIAMETER = 100.0
+LARGE_MAP_DIES = 100_000
+# Streets between the 11 rows and columns of a 100 mm map and on their sides
+STREETS = 10
+
+
+def test_die_map():
+    dies = die_map(100.0, 10.0, street=0.1, edge_exclusion=3.0)
+    flat = die_map(100.0, 10.0, street=0.1, edge_exclusion=3.0, shape='flat standard')
+    large = die_map(300.0, 0.8, street=0.05, edge_exclusion=3.0)
+
+    assert die_map(100.0, 10.0, street=0.1, edge_exclusion=3.0) is dies
+    # Corners of full dies are inside the usable radius
+    corners = np.hypot(np.abs(dies.x) + 4.95, np.abs(dies.y) + 4.95)
+    assert corners[dies.full].max() <= USABLE_RADIUS
+    assert corners[~dies.full].min() > USABLE_RADIUS
+    assert flat.full_count < dies.full_count
+    assert (flat.y[flat.full] - 4.95).min() >= -wafer_cut(100.0, 'flat standard') + 3
+    assert large.full_count > LARGE_MAP_DIES
+    assert die_ids(dies)[0] == 'R00C04'
+    assert len(set(die_ids(large))) == len(large.x)
+
+
+def test_wafer_map_feeds_dicing():
+    archive = EntryArchive()
+    logger = structlog.get_logger()
+    item = Item(
+        geometric_properties=Circle(radius=5.0),
+        shapeType='Wafer with flat standard',
+        wafer_map=WaferMap(die_pitch_x=10.0, edge_exclusion=3.0),
+    )
+    item.wafer_map.normalize(archive, logger)
+    dicing = Dicing(
+        id_item_processed='W01',
+        wafer_map=WaferMap(wafer_diameter=100.0, die_pitch_x=10.0),
+    )
+    dicing.wafer_map.normalize(archive, logger)
+    dicing.list_diced_items()
+
+    # Diameter and shape of the item are read, not copied in the map
+    assert item.wafer_map.wafer_diameter is None
+    assert item.wafer_map.wafer() == (WAFER_DIAMETER, 'Wafer with flat standard')
+    assert item.wafer_map.number_of_full_dies > 0
+    assert len(item.wafer_map.die_id) == len(item.wafer_map.die_center_x)
+    assert len(dicing.outputs.wafer_diced_id) == dicing.wafer_map.number_of_full_dies
+    assert dicing.outputs.wafer_diced_id[0].startswith('W01_R')
+
+    # Diced items follow the map when it changes
+    dicing.wafer_map.die_pitch_x = 5.0
+    dicing.wafer_map.normalize(archive, logger)
+    dicing.list_diced_items()
+    assert len(dicing.outputs.wafer_diced_id) == dicing.wafer_map.number_of_full_dies
+
+
+def test_cut_plan():
+    plan = cut_plan(100.0, 10.0, street=0.1, edge_exclusion=3.0)
+    flat = cut_plan(100.0, 10.0, street=0.1, edge_exclusion=3.0, shape='flat')
+    lot = saw_times([plan.total_length, flat.total_length] * 100, 3, 2.0)
+
+    assert plan.count(1) == plan.count(2) == STREETS
+    assert np.allclose(np.hypot(plan.position, plan.end), 50.0)
+    assert flat.total_length < plan.total_length
+    assert passes_per_step([100.0], 350.0).tolist() == [4]
+    assert passes_per_step([50.0, 100.0, 100.0], 120.0).tolist() == [1, 1, 0]
+    assert lot.shape == (200,)
+    assert np.isclose(lot[0], plan.total_length * 3 / 2.0)
+
+
+def test_dicing_plan():
+    logger = structlog.get_logger()
+    dicing = Dicing(
+        depth_target=500.0,
+        wafer_map=WaferMap(wafer_diameter=100.0, die_pitch_x=10.0),
+        dicing_steps=[
+            Dicingbase(depth_step=100.0, dicing_feed_rate=5.0),
+            Dicingbase(depth_step=150.0, dicing_feed_rate=2.0),
+        ],
+    )
+    dicing.plan_cuts(logger)
+    length = dicing.total_cut_length.to('mm').magnitude
+
+    assert dicing.number_of_cut_lines_channel_1 > 0
+    assert [step.number_of_passes for step in dicing.dicing_steps] == [1, 3]
+    assert np.isclose(
+        dicing.estimated_saw_time.to('s').magnitude, length / 5.0 + 3 * length / 2.0
+    )
+
+
+@pytest.mark.parametrize('depth_step, depth_target', [(0.0, 500.0), (100.0, -1.0)])
+def test_dicing_plan_rejects_depths(depth_step, depth_target):
+    dicing = Dicing(
+        depth_target=depth_target,
+        wafer_map=WaferMap(wafer_diameter=100.0, die_pitch_x=10.0),
+        dicing_steps=[Dicingbase(depth_step=depth_step, dicing_feed_rate=5.0)],
+    )
+
+    with capture_logs() as logs:
+        dicing.plan_cuts(structlog.get_logger())
+
+    assert dicing.number_of_cut_lines_channel_1 > 0
+    assert dicing.dicing_steps[0].number_of_passes is None
+    assert [log['log_level'] for log in logs] == ['warning']
+
+
+def test_wafer_map_follows_item():
+    archive = EntryArchive()
+    logger = structlog.get_logger()
+    item = Item(
+        geometric_properties=Circle(radius=5.0),
+        wafer_map=WaferMap(die_pitch_x=10.0, edge_exclusion=3.0),
+    )
+    item.wafer_map.normalize(archive, logger)
+    dies = item.wafer_map.number_of_full_dies
+
+    item.geometric_properties.radius = 7.5
+    item.wafer_map.normalize(archive, logger)
+
+    assert item.wafer_map.number_of_full_dies > dies